@@ -21,10 +21,13 @@ from google.adk.agents import Agent
 
 # Import all sub-agents
 from .world_designer.agent import design_world_from_prompt, generate_world, get_status as world_status
+from .world_designer.core.world_store import save_world_spec
+from .seeding import derive_seed, new_seed
 
 # Import the AI Creative Asset Generator
 try:
     from .asset_generator.agent import AICreativeAssetGenerator
+    from .asset_generator.prop_generator import DEFAULT_ARCHETYPE_VARIANTS
     ASSET_GENERATOR_AVAILABLE = True
 except ImportError:
     print("⚠️ AI Creative Asset Generator not available - using fallback")
@@ -86,6 +89,9 @@ if not GODOT_EXPORTER_AVAILABLE:
             'message': 'Manual Godot integration required'
         }
 
+# Worlds with at least this many props design them as archetypes unless told otherwise
+ARCHETYPE_MIN_PROPS = 50
+
 @dataclass
 class CompletePipelineResult:
     """Result of the complete 6-agent pipeline execution"""
@@ -115,15 +121,19 @@ class CompleteGameContentOrchestrator:
     6. Godot Exporter - Exports complete Godot-ready packages (NEW!)
     """
     
-    def __init__(self, base_output_dir: str = "complete_game_content"):
+    def __init__(self, base_output_dir: str = "complete_game_content", export_world_json: bool = False):
         self.base_output_dir = Path(base_output_dir)
         self.base_output_dir.mkdir(exist_ok=True)
+        # The compact .wspec file is always written; the JSON copy is optional
+        self.export_world_json = export_world_json
         
         # Setup logging
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)
         
         # Pipeline state
+        self.seed = None
+        self.archetype_variants = None
         self.current_session_dir = None
         self.world_spec = None
         self.assets = None
@@ -187,11 +197,22 @@ class CompleteGameContentOrchestrator:
         except Exception as e:
             self.logger.warning(f"Cleanup check failed: {e}")
 
-    async def generate_complete_game_content(self, prompt: str, character_count: int = 5, quest_count: int = 7) -> CompletePipelineResult:
+    async def generate_complete_game_content(self, prompt: str, character_count: int = 5, quest_count: int = 7,
+                                             seed: Optional[int] = None,
+                                             archetype_variants: Optional[int] = None) -> CompletePipelineResult:
         """
         COMPLETE 6-AGENT PIPELINE - generates full game content package with Godot export
+        
+        Every agent draws from its own stream derived from seed, so the same prompt and
+        seed reproduce the same content. A fresh seed is drawn when none is given, which
+        also means the world designer's design cache only serves runs that pass a seed.
+        
+        archetype_variants designs props as that many archetypes per type and exports the
+        rest as instances of them; 0 turns this off, and None turns it on for prop-heavy worlds.
         """
         start_time = asyncio.get_event_loop().time()
+        self.seed = new_seed() if seed is None else seed
+        self.archetype_variants = archetype_variants
         
         # Create session directory
         self.current_session_dir = self._create_session_directory(prompt)
@@ -199,6 +220,7 @@ class CompleteGameContentOrchestrator:
         print(f"\n🎮 COMPLETE MULTI-AGENT GAME CONTENT PIPELINE v4.0")
         print(f"{'='*80}")
         print(f"📝 Prompt: {prompt}")
+        print(f"🎲 Seed: {self.seed}")
         print(f"📁 Session Dir: {self.current_session_dir}")
         print(f"🕐 Started: {datetime.now().strftime('%H:%M:%S')}")
         print(f"🤖 Agents: {sum(self.agents_available.values())}/6 available")
@@ -335,6 +357,7 @@ class CompleteGameContentOrchestrator:
                 "version": "4.0.0",
                 "timestamp": datetime.now().isoformat(),
                 "session_id": self.current_session_dir.name,
+                "seed": self.seed,
                 "complete_pipeline": True,
                 "agents_used": {
                     "world_designer": bool(world_spec),
@@ -351,7 +374,8 @@ class CompleteGameContentOrchestrator:
                     "buildings": content_stats.get('world_buildings', 0),
                     "natural_features": content_stats.get('world_features', 0),
                     "paths": content_stats.get('world_paths', 0),
-                    "file": "world_specification.json"
+                    "file": "world_specification.wspec",
+                    "json_export": "world_specification.json" if self.export_world_json else None
                 },
                 "assets": {
                     "total_count": content_stats.get('total_assets', 0),
@@ -378,7 +402,7 @@ class CompleteGameContentOrchestrator:
                 }
             },
             "file_structure": {
-                "world_specification.json": "Complete world design and layout",
+                "world_specification.wspec": "Complete world design and layout (compact binary, see load_world_spec)",
                 "characters.json": "NPC definitions with personalities and relationships",
                 "quests.json": "Quest systems and storylines",
                 "ai_creative_assets/": "Directory containing all generated 3D assets",
@@ -391,7 +415,7 @@ class CompleteGameContentOrchestrator:
             "usage_instructions": [
                 "1. Review the master manifest and content summary",
                 "2. Import 3D assets from ai_creative_assets/ into your game engine",
-                "3. Use world_specification.json for level layout and positioning",
+                "3. Use world_specification.wspec (or the optional JSON export) for level layout and positioning",
                 "4. Implement NPCs using characters.json definitions",
                 "5. Integrate quest systems using quests.json",
                 "6. Apply balance recommendations from balance report",
@@ -864,7 +888,8 @@ class CompleteGameContentOrchestrator:
             
             # Generate world
             print(f"🏗️  Generating world from prompt...")
-            self.world_spec = await generate_world(prompt)
+            self.world_spec = await generate_world(prompt, output_dir=str(self.current_session_dir),
+                                                   seed=derive_seed(self.seed, "world_designer"))
             
             # Log results
             print(f"✅ World Design Complete!")
@@ -875,11 +900,15 @@ class CompleteGameContentOrchestrator:
             print(f"   Paths: {len(self.world_spec.get('paths', []))}")
             
             # Save world specification
-            world_file = self.current_session_dir / "world_specification.json"
-            with open(world_file, 'w') as f:
-                json.dump(self.world_spec, f, indent=2)
+            world_file = save_world_spec(self.world_spec, self.current_session_dir / "world_specification.wspec")
             print(f"💾 World spec saved: {world_file.name}")
             
+            if self.export_world_json:
+                json_file = self.current_session_dir / "world_specification.json"
+                with open(json_file, 'w') as f:
+                    json.dump(self.world_spec, f, indent=2)
+                print(f"💾 World spec JSON export saved: {json_file.name}")
+            
         except Exception as e:
             error_msg = f"World design failed: {str(e)}"
             self.errors.append(error_msg)
@@ -896,7 +925,9 @@ class CompleteGameContentOrchestrator:
             
             if ASSET_GENERATOR_AVAILABLE:
                 # Use the AI Creative Asset Generator
-                self.ai_asset_generator = AICreativeAssetGenerator(output_dir=str(assets_dir))
+                self.ai_asset_generator = AICreativeAssetGenerator(output_dir=str(assets_dir),
+                                                                   seed=derive_seed(self.seed, "asset_generator"),
+                                                                   archetype_variants=self._archetype_variants())
                 
                 print(f"🎯 Generating AI-powered unique creative assets...")
                 self.assets = await self.ai_asset_generator.generate_creative_assets(self.world_spec)
@@ -917,6 +948,16 @@ class CompleteGameContentOrchestrator:
             print(f"❌ {error_msg}")
             # Don't raise - continue with other agents
 
+    def _archetype_variants(self) -> Optional[int]:
+        """Archetypes per prop type for this run, or None to design every prop individually"""
+        if self.archetype_variants is not None:
+            return self.archetype_variants or None
+        prop_count = len((self.world_spec or {}).get('natural_features', []))
+        if prop_count >= ARCHETYPE_MIN_PROPS:
+            print(f"🌳 {prop_count} props: designing {DEFAULT_ARCHETYPE_VARIANTS} archetypes per type")
+            return DEFAULT_ARCHETYPE_VARIANTS
+        return None
+    
     async def _step_3_character_creation(self, character_count: int):
         """Step 3: Generate unique NPCs with personalities and relationships"""
         print(f"\n👥 STEP 3: CHARACTER CREATION")
@@ -933,7 +974,8 @@ class CompleteGameContentOrchestrator:
                 print(f"✨ Uniqueness Guaranteed: {status.get('uniqueness_guaranteed', True)}")
                 
                 # Generate characters using the world specification
-                self.characters = await generate_characters_for_world(self.world_spec, character_count)
+                self.characters = await generate_characters_for_world(self.world_spec, character_count,
+                                                                      seed=derive_seed(self.seed, "character_creator"))
                 
                 print(f"✅ Character Creation Complete!")
                 if self.characters.get('status') == 'success':
@@ -1604,6 +1646,7 @@ class CompleteGameContentOrchestrator:
                 "session_directory": str(self.current_session_dir),
                 "timestamp": datetime.now().isoformat(),
                 "pipeline_version": "4.0.0",
+                "seed": self.seed,
                 "complete_pipeline": True,
                 "balance_validated": bool(self.balance_report),
                 "godot_export_ready": bool(self.godot_package)
@@ -1877,13 +1920,17 @@ class CompleteGameContentOrchestrator:
         }
 
 # Individual functions for ADK tools
-async def generate_complete_game_content(prompt: str, character_count: int = 5, quest_count: int = 7) -> Dict[str, Any]:
+async def generate_complete_game_content(prompt: str, character_count: int = 5, quest_count: int = 7,
+                                         seed: Optional[int] = None,
+                                         archetype_variants: Optional[int] = None) -> Dict[str, Any]:
     """
     Generate COMPLETE game content package from a text prompt with Godot export
-    Main entry point for the complete 6-agent orchestrator
+    Main entry point for the complete 6-agent orchestrator; pass seed to reproduce a run
+    and to let near-identical prompts reuse a cached world design
     """
     orchestrator = CompleteGameContentOrchestrator()
-    result = await orchestrator.generate_complete_game_content(prompt, character_count, quest_count)
+    result = await orchestrator.generate_complete_game_content(prompt, character_count, quest_count, seed,
+                                                               archetype_variants)
     return asdict(result)
 
 async def get_complete_orchestrator_status() -> Dict[str, Any]:
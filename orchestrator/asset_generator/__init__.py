@@ -58,7 +58,7 @@ MODULES = {
     'prop_generator': {
         'class': PropGenerator,
         'description': 'Natural features and environmental props',
-        'capabilities': ['trees', 'rocks', 'bushes', 'wells', 'style_parameters']
+        'capabilities': ['trees', 'rocks', 'bushes', 'wells', 'style_parameters', 'prop_archetypes']
     },
     'building_generator': {
         'class': BuildingGenerator,
@@ -109,9 +109,9 @@ def get_supported_assets():
     """Get dictionary of supported asset types"""
     return SUPPORTED_ASSET_TYPES.copy()
 
-def create_asset_generator(output_dir: str = "generated_assets"):
+def create_asset_generator(output_dir: str = "generated_assets", seed: int = None, archetype_variants: int = None):
     """Factory function to create a new AICreativeAssetGenerator instance"""
-    return AICreativeAssetGenerator(output_dir)
+    return AICreativeAssetGenerator(output_dir, seed, archetype_variants)
 
 # Version check function
 def check_dependencies():
@@ -179,7 +179,8 @@ if os.getenv('AI_ASSET_GENERATOR_QUIET') != '1':
     print_module_info()
 
 # Convenience functions for quick usage
-def quick_generate(theme: str = 'medieval', buildings: int = 3, props: int = 5, output_dir: str = "quick_assets"):
+def quick_generate(theme: str = 'medieval', buildings: int = 3, props: int = 5, output_dir: str = "quick_assets",
+                   seed: int = None):
     """Quick generation function for simple use cases"""
     import asyncio
     
@@ -202,7 +203,7 @@ def quick_generate(theme: str = 'medieval', buildings: int = 3, props: int = 5,
     }
     
     async def _generate():
-        generator = AICreativeAssetGenerator(output_dir)
+        generator = AICreativeAssetGenerator(output_dir, seed)
         return await generator.generate_creative_assets(world_spec)
     
     return asyncio.run(_generate())
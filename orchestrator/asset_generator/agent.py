@@ -7,7 +7,8 @@ Follows the same modular pattern as the world designer
 import asyncio
 import json
 import os
-from typing import Dict, List, Any, Optional
+import time
+from typing import Any, Awaitable, Dict, List, Optional, Tuple
 from pathlib import Path
 import logging
 
@@ -22,6 +23,8 @@ from .texture_generator import TextureGenerator
 from .environment_generator import EnvironmentGenerator
 from .material_library import MaterialLibrary
 from .blender_integration import BlenderIntegration
+from .asset_tasks import DEFAULT_ASSET_CONCURRENCY
+from ..seeding import derive_seed, new_seed
 
 class AICreativeAssetGenerator:
     """
@@ -34,20 +37,30 @@ class AICreativeAssetGenerator:
     - MODULAR: Split into focused, reusable components
     """
     
-    def __init__(self, output_dir: str = "generated_assets"):
+    def __init__(self, output_dir: str = "generated_assets", seed: Optional[int] = None,
+                 archetype_variants: Optional[int] = None):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
         self.logger = logging.getLogger(__name__)
         
+        # Every module gets its own stream of the seed, so the same seed reproduces the same assets
+        self.seed = new_seed() if seed is None else seed
+        
         # Initialize all modules
         self.ai_core = AICore()
-        self.prop_generator = PropGenerator(self.output_dir, self.ai_core)
-        self.building_generator = BuildingGenerator(self.output_dir, self.ai_core)
-        self.texture_generator = TextureGenerator(self.output_dir, self.ai_core)
-        self.environment_generator = EnvironmentGenerator(self.output_dir, self.ai_core)
-        self.material_library = MaterialLibrary(self.output_dir, self.ai_core)
+        self.prop_generator = PropGenerator(self.output_dir, self.ai_core, derive_seed(self.seed, "props"))
+        self.building_generator = BuildingGenerator(self.output_dir, self.ai_core, derive_seed(self.seed, "buildings"))
+        self.texture_generator = TextureGenerator(self.output_dir, self.ai_core, derive_seed(self.seed, "textures"))
+        self.environment_generator = EnvironmentGenerator(self.output_dir, self.ai_core, derive_seed(self.seed, "environment"))
+        self.material_library = MaterialLibrary(self.output_dir, self.ai_core, derive_seed(self.seed, "materials"))
         self.blender_integration = BlenderIntegration(self.output_dir)
         
+        # Assets in progress at once across every sub-stage of a generation run
+        self.max_concurrency = DEFAULT_ASSET_CONCURRENCY
+        
+        # When set, props are designed as this many archetypes per type and placed as instances of them
+        self.archetype_variants = archetype_variants
+        
         # Shared state
         self.creative_cache = {}
         self.texture_cache = {}
@@ -66,59 +79,103 @@ class AICreativeAssetGenerator:
         buildings = world_spec.get('buildings', [])
         natural_features = world_spec.get('natural_features', [])
         
-        # Generate AI-creative buildings using building module
-        creative_buildings = await self.building_generator.generate_ai_creative_buildings(
-            buildings, theme
-        )
-        
-        # Generate AI-creative props using prop module
-        creative_props = await self.prop_generator.generate_ai_creative_props(
-            natural_features, theme
-        )
-        
-        # Generate AI-creative environment using environment module
-        creative_environment = await self.environment_generator.generate_ai_creative_environment(
-            world_spec, theme
-        )
-        
-        # Create AI material library using material module
-        ai_materials = await self.material_library.generate_ai_material_library(theme)
+        # Sub-stages depend only on the world spec and theme, so they run together and share one budget
+        budget = asyncio.Semaphore(self.max_concurrency)
+        if self.archetype_variants:
+            props_stage = self.prop_generator.generate_prop_archetypes(
+                natural_features, theme, self.archetype_variants, budget)
+        else:
+            props_stage = self.prop_generator.generate_ai_creative_props(natural_features, theme, budget)
+        stages = {
+            'buildings': self.building_generator.generate_ai_creative_buildings(buildings, theme, budget),
+            'props': props_stage,
+            'environment': self._within_budget(
+                budget, self.environment_generator.generate_ai_creative_environment(world_spec, theme)),
+            'ai_materials': self._within_budget(budget, self.material_library.generate_ai_material_library(theme))
+        }
         
-        # Compile creative manifest
+        # Compile creative manifest, filled in as sub-stages finish
         creative_manifest = {
             'theme': theme,
+            'seed': self.seed,
             'ai_generated': True,
+            'status': 'in_progress',
             'creative_features': {
                 'unique_designs': True,
                 'ai_textures': True,
                 'creative_variations': True,
                 'procedural_diversity': True
             },
-            'buildings': creative_buildings,
-            'props': creative_props,
-            'environment': creative_environment,
-            'ai_materials': ai_materials,
-            'generation_summary': {
-                'total_creative_assets': len(creative_buildings) + len(creative_props) + len(creative_environment),
-                'unique_textures_generated': len(self.texture_generator.texture_cache),
-                'ai_variations_created': sum(len(b.get('creative_variations', [])) for b in creative_buildings),
-                'creative_complexity_score': self._calculate_creativity_score(),
-                'buildings_count': len(creative_buildings),
-                'props_count': len(creative_props),
-                'environment_count': len(creative_environment)
-            },
+            'buildings': [],
+            'props': [],
+            'prop_instances': [],
+            'environment': [],
+            'ai_materials': {},
+            'generation_summary': {'completed_stages': [], 'stage_seconds': {}},
             'output_directory': str(self.output_dir)
         }
+        manifest_path = self.output_dir / "ai_creative_manifest.json"
+        
+        # Instances only name their archetypes, so they need not wait for the designs
+        if self.archetype_variants:
+            creative_manifest['prop_instances'] = self.prop_generator.instance_props(
+                natural_features, theme, self.archetype_variants)
+        
+        start = time.perf_counter()
+        tasks = [asyncio.create_task(self._timed_stage(name, stage)) for name, stage in stages.items()]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                name, result, seconds = await finished
+                creative_manifest[name] = result
+                creative_manifest['generation_summary']['completed_stages'].append(name)
+                creative_manifest['generation_summary']['stage_seconds'][name] = round(seconds, 3)
+                self.logger.info(f"✅ {name} finished in {seconds:.2f}s")
+                self._save_manifest(creative_manifest, manifest_path)
+        finally:
+            for task in tasks:
+                task.cancel()
+        
+        creative_buildings = creative_manifest['buildings']
+        creative_props = creative_manifest['props']
+        creative_environment = creative_manifest['environment']
+        creative_manifest['status'] = 'complete'
+        creative_manifest['generation_summary'].update({
+            'total_creative_assets': len(creative_buildings) + len(creative_props) + len(creative_environment),
+            'unique_textures_generated': len(self.texture_generator.texture_cache),
+            'ai_variations_created': sum(len(b.get('creative_variations', [])) for b in creative_buildings),
+            'creative_complexity_score': self._calculate_creativity_score(),
+            'buildings_count': len(creative_buildings),
+            'props_count': len(creative_props),
+            'prop_instances_count': len(creative_manifest['prop_instances']),
+            'environment_count': len(creative_environment),
+            'total_seconds': round(time.perf_counter() - start, 3)
+        })
         
         # Save creative manifest
-        manifest_path = self.output_dir / "ai_creative_manifest.json"
-        with open(manifest_path, 'w') as f:
-            json.dump(creative_manifest, f, indent=2)
+        self._save_manifest(creative_manifest, manifest_path)
         
         self.logger.info(f"🎉 Modular AI Creative Generation Complete! Generated {creative_manifest['generation_summary']['total_creative_assets']} unique assets")
         
         return creative_manifest
 
+    async def _timed_stage(self, name: str, stage: Awaitable[Any]) -> Tuple[str, Any, float]:
+        """Await a sub-stage; returns its name, result and wall time"""
+        start = time.perf_counter()
+        result = await stage
+        return name, result, time.perf_counter() - start
+    
+    async def _within_budget(self, budget: asyncio.Semaphore, stage: Awaitable[Any]) -> Any:
+        """Run a sub-stage that has no per-asset loop while holding one slot of the shared budget"""
+        async with budget:
+            return await stage
+    
+    def _save_manifest(self, creative_manifest: Dict[str, Any], manifest_path: Path):
+        """Write the manifest under a temporary name first, so readers never see a partial file"""
+        temporary = manifest_path.with_name(f"{manifest_path.stem}.{os.getpid()}.tmp")
+        with open(temporary, 'w') as f:
+            json.dump(creative_manifest, f, indent=2)
+        os.replace(temporary, manifest_path)
+    
     def _calculate_creativity_score(self) -> float:
         """Calculate overall creativity score using module data"""
         texture_score = len(self.texture_generator.texture_cache) * 2
@@ -155,9 +212,10 @@ class AICreativeAssetGenerator:
         }
 
 # Enhanced ADK Agent Entry Points
-async def generate_creative_assets(world_spec: Dict[str, Any]) -> Dict[str, Any]:
+async def generate_creative_assets(world_spec: Dict[str, Any], seed: Optional[int] = None,
+                                   archetype_variants: Optional[int] = None) -> Dict[str, Any]:
     """Generate AI-creative assets - main entry point"""
-    generator = AICreativeAssetGenerator()
+    generator = AICreativeAssetGenerator(seed=seed, archetype_variants=archetype_variants)
     return await generator.generate_creative_assets(world_spec)
 
 async def get_creative_status() -> Dict[str, Any]:
@@ -4,9 +4,14 @@ Central AI coordination and API management for the asset generator
 Handles all AI model interactions and API calls
 """
 
+import asyncio
+import json
 import os
+import random
 import logging
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
+
+from ..llm_client import get_llm_client
 
 # Google AI imports
 try:
@@ -16,6 +21,24 @@ try:
 except ImportError:
     AI_AVAILABLE = False
 
+# Objects described per batched model call; 1 sends one call per object and field instead
+DEFAULT_BATCH_SIZE = int(os.getenv('ASSET_BATCH_SIZE', '10'))
+
+# What a batched description should cover, by asset kind
+BATCH_FOCUS = {
+    'prop': 'visual appearance and distinctive features, size and proportions, materials and surface textures',
+    'building': 'architectural style, building materials and construction, size and layout, decorative elements'
+}
+
+# Accepted geometry values: numeric ranges, or the allowed words
+GEOMETRY_RANGES = {
+    'height_multiplier': (0.5, 3.0),
+    'width_multiplier': (0.5, 2.5),
+    'detail_count': (1, 10),
+    'asymmetry_factor': (0.0, 1.0)
+}
+GEOMETRY_COMPLEXITY = ('simple', 'medium', 'complex')
+
 class AICore:
     """
     Central AI coordination module
@@ -26,6 +49,7 @@ class AICore:
         self.ai_available = AI_AVAILABLE
         self.logger = logging.getLogger(__name__)
         self.gemini_model = None
+        self.llm_client = get_llm_client()
         
         if self.ai_available:
             self._initialize_ai()
@@ -48,8 +72,7 @@ class AICore:
             return None
         
         try:
-            response = self.gemini_model.generate_content(prompt)
-            return response.text
+            return await self.llm_client.generate(self.gemini_model, prompt)
         except Exception as e:
             self.logger.warning(f"Gemini API call failed: {e}")
             return None
@@ -156,10 +179,11 @@ class AICore:
         
         return [f"Unique {building_type}", f"Enhanced {building_type}"]
 
-    async def generate_geometry_parameters(self, asset_type: str, description: str) -> dict:
-        """Generate unique geometry parameters for assets"""
+    async def generate_geometry_parameters(self, asset_type: str, description: str,
+                                           rng: Optional[random.Random] = None) -> dict:
+        """Generate unique geometry parameters for assets; fallback values draw from rng"""
         if not self.ai_available:
-            return self._get_fallback_geometry(asset_type)
+            return self._get_fallback_geometry(asset_type, rng)
         
         try:
             prompt = f"""Based on: "{description}"
@@ -180,8 +204,91 @@ class AICore:
         except Exception as e:
             self.logger.warning(f"AI geometry generation failed: {e}")
         
-        return self._get_fallback_geometry(asset_type)
+        return self._get_fallback_geometry(asset_type, rng)
 
+    async def generate_asset_batches(self, kind: str, items: List[Tuple[str, int]], theme: str,
+                                     batch_size: int = DEFAULT_BATCH_SIZE) -> List[Dict]:
+        """
+        Descriptions, variations and geometry for (asset_type, index) items, batch_size per model call.
+        
+        Returns one dict per item holding whichever of 'description', 'variations' and
+        'geometry' came back valid; callers generate anything missing one item at a time.
+        """
+        if not self.ai_available or batch_size <= 1 or not items:
+            return [{} for _ in items]
+        
+        batches = [items[start:start + batch_size] for start in range(0, len(items), batch_size)]
+        results = await asyncio.gather(*(self._generate_batch(kind, batch, theme) for batch in batches))
+        return [design for batch in results for design in batch]
+    
+    async def _generate_batch(self, kind: str, items: List[Tuple[str, int]], theme: str) -> List[Dict]:
+        """One model call for a batch of items; never raises"""
+        listing = "\n".join(f"{n}. {asset_type} (#{index + 1})" for n, (asset_type, index) in enumerate(items, 1))
+        prompt = f"""Design {len(items)} UNIQUE {kind}s for a {theme} game world, each distinct from the others:
+        {listing}
+        
+        Return ONLY a JSON array with one object per {kind}, in the same order, each with:
+        - "item": its number in the list above
+        - "description": 2-3 creative, specific sentences on {BATCH_FOCUS.get(kind, BATCH_FOCUS['prop'])}
+        - "variations": an array of 3 visually distinct variations, 1-2 sentences each
+        - "geometry": {{"height_multiplier": 0.5-3.0, "width_multiplier": 0.5-2.5,
+          "complexity": "simple" | "medium" | "complex", "detail_count": 1-10, "asymmetry_factor": 0.0-1.0}}"""
+        
+        designs = [{} for _ in items]
+        response = await self.call_gemini(prompt)
+        if not response:
+            return designs
+        
+        try:
+            entries = json.loads(response[response.index('['):response.rindex(']') + 1])
+        except ValueError as e:
+            self.logger.warning(f"Unparseable {kind} batch, falling back per item: {e}")
+            return designs
+        if not isinstance(entries, list):
+            return designs
+        
+        for position, entry in enumerate(entries):
+            if not isinstance(entry, dict):
+                continue
+            # Trust the item number over the position, since models sometimes skip or reorder entries
+            slot = entry.get('item')
+            slot = slot - 1 if isinstance(slot, int) and 1 <= slot <= len(items) else position
+            if slot < len(items) and not designs[slot]:
+                designs[slot] = self._validate_design(entry)
+        
+        failed = sum(1 for design in designs if len(design) < 3)
+        if failed:
+            self.logger.warning(f"{failed} of {len(items)} {kind}s in a batch were incomplete, falling back per item")
+        return designs
+    
+    def _validate_design(self, entry: dict) -> Dict:
+        """The fields of one batch entry that are well formed"""
+        design = {}
+        
+        description = entry.get('description')
+        if isinstance(description, str) and description.strip():
+            design['description'] = description.strip()
+        
+        variations = entry.get('variations')
+        if isinstance(variations, list):
+            variations = [v.strip() for v in variations if isinstance(v, str) and v.strip()]
+            if variations:
+                design['variations'] = variations[:3]
+        
+        geometry = entry.get('geometry')
+        if isinstance(geometry, dict):
+            params = {}
+            for key, (low, high) in GEOMETRY_RANGES.items():
+                value = geometry.get(key)
+                if isinstance(value, (int, float)) and not isinstance(value, bool) and low <= value <= high:
+                    params[key] = int(value) if key == 'detail_count' else float(value)
+            if geometry.get('complexity') in GEOMETRY_COMPLEXITY:
+                params['complexity'] = geometry['complexity']
+            if params:
+                design['geometry'] = self._fill_geometry_defaults(params)
+        
+        return design
+    
     def _parse_geometry(self, ai_response: str) -> dict:
         """Parse AI geometry parameters"""
         params = {}
@@ -231,31 +338,32 @@ class AICore:
         
         return params
 
-    def _get_fallback_geometry(self, asset_type: str) -> dict:
+    def _get_fallback_geometry(self, asset_type: str, rng: Optional[random.Random] = None) -> dict:
         """Get fallback geometry parameters"""
-        import random
+        rng = rng or random.Random()
         
         base_params = {
-            'height_multiplier': random.uniform(0.8, 1.5),
-            'width_multiplier': random.uniform(0.8, 1.3),
-            'complexity': random.choice(['simple', 'medium', 'complex']),
-            'detail_count': random.randint(2, 6),
-            'asymmetry_factor': random.uniform(0.1, 0.4)
+            'height_multiplier': rng.uniform(0.8, 1.5),
+            'width_multiplier': rng.uniform(0.8, 1.3),
+            'complexity': rng.choice(['simple', 'medium', 'complex']),
+            'detail_count': rng.randint(2, 6),
+            'asymmetry_factor': rng.uniform(0.1, 0.4)
         }
         
         # Asset-specific adjustments
         if asset_type in ['tree', 'oak_tree']:
-            base_params['height_multiplier'] = random.uniform(1.2, 2.5)
+            base_params['height_multiplier'] = rng.uniform(1.2, 2.5)
         elif asset_type == 'rock':
-            base_params['height_multiplier'] = random.uniform(0.5, 1.2)
-            base_params['width_multiplier'] = random.uniform(0.8, 1.8)
+            base_params['height_multiplier'] = rng.uniform(0.5, 1.2)
+            base_params['width_multiplier'] = rng.uniform(0.8, 1.8)
         
         return base_params
 
-    async def generate_material_properties(self, material_type: str, theme: str) -> dict:
-        """Generate AI-guided material properties"""
+    async def generate_material_properties(self, material_type: str, theme: str,
+                                           rng: Optional[random.Random] = None) -> dict:
+        """Generate AI-guided material properties; fallback values draw from rng"""
         if not self.ai_available:
-            return self._get_fallback_material(material_type, theme)
+            return self._get_fallback_material(material_type, theme, rng)
         
         try:
             prompt = f"""Generate material properties for {material_type} in a {theme} theme:
@@ -274,7 +382,7 @@ class AICore:
         except Exception as e:
             self.logger.warning(f"AI material generation failed: {e}")
         
-        return self._get_fallback_material(material_type, theme)
+        return self._get_fallback_material(material_type, theme, rng)
 
     def _parse_material(self, ai_response: str) -> dict:
         """Parse AI material parameters"""
@@ -328,9 +436,9 @@ class AICore:
         
         return params
 
-    def _get_fallback_material(self, material_type: str, theme: str) -> dict:
+    def _get_fallback_material(self, material_type: str, theme: str, rng: Optional[random.Random] = None) -> dict:
         """Get fallback material properties"""
-        import random
+        rng = rng or random.Random()
         
         # Base material templates
         material_templates = {
@@ -343,13 +451,13 @@ class AICore:
         base = material_templates.get(material_type, material_templates['stone'])
         
         return {
-            'metallic': base['metallic'] + random.uniform(-0.1, 0.1),
-            'roughness': max(0.0, min(1.0, base['roughness'] + random.uniform(-0.2, 0.2))),
+            'metallic': base['metallic'] + rng.uniform(-0.1, 0.1),
+            'roughness': max(0.0, min(1.0, base['roughness'] + rng.uniform(-0.2, 0.2))),
             'base_color': [
-                max(0, min(255, base['base_color'][0] + random.randint(-30, 30))),
-                max(0, min(255, base['base_color'][1] + random.randint(-30, 30))),
-                max(0, min(255, base['base_color'][2] + random.randint(-30, 30)))
+                max(0, min(255, base['base_color'][0] + rng.randint(-30, 30))),
+                max(0, min(255, base['base_color'][1] + rng.randint(-30, 30))),
+                max(0, min(255, base['base_color'][2] + rng.randint(-30, 30)))
             ],
-            'emission_strength': random.uniform(0.0, 0.2),
-            'normal_strength': random.uniform(0.8, 1.2)
+            'emission_strength': rng.uniform(0.0, 0.2),
+            'normal_strength': rng.uniform(0.8, 1.2)
         }
\ No newline at end of file
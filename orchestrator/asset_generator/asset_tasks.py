@@ -0,0 +1,49 @@
+"""
+ASSET TASKS MODULE
+Bounded concurrent processing of independent assets
+Lets the building and prop generators work on many assets at once while keeping output order
+"""
+
+import asyncio
+import logging
+import os
+from typing import Any, Awaitable, Callable, List, Optional, Sequence
+
+# Assets worked on at once by one generator; model calls are further limited by the shared LLM client
+DEFAULT_ASSET_CONCURRENCY = int(os.getenv('ASSET_CONCURRENCY', '16'))
+
+async def gather_assets(items: Sequence[Any], worker: Callable[[int, Any], Awaitable[Any]],
+                        concurrency: int = DEFAULT_ASSET_CONCURRENCY, label: str = 'asset',
+                        logger: Optional[logging.Logger] = None,
+                        budget: Optional[asyncio.Semaphore] = None) -> List[Any]:
+    """
+    Run worker(index, item) over items with at most concurrency in progress.
+    
+    Each item also holds a slot of budget, when given, while it runs, so several
+    generators working at once share one limit. Results come back in input order. An item whose worker raises is logged and
+    left out, so one bad asset never costs the others.
+    """
+    logger = logger or logging.getLogger(__name__)
+    results: List[Any] = [None] * len(items)
+    failed = [False] * len(items)
+    pending = iter(range(len(items)))
+    
+    async def drain():
+        # Workers share one iterator, so only concurrency tasks exist however many items there are
+        for i in pending:
+            try:
+                if budget is None:
+                    results[i] = await worker(i, items[i])
+                else:
+                    async with budget:
+                        results[i] = await worker(i, items[i])
+            except Exception as e:
+                failed[i] = True
+                logger.warning(f"⚠️ Skipping {label} {i}: {e}")
+    
+    await asyncio.gather(*(drain() for _ in range(min(max(concurrency, 1), len(items)))))
+    return [result for result, skipped in zip(results, failed) if not skipped]
+
+async def supplied_or(value: Any, fetch: Callable[[], Awaitable[Any]]) -> Any:
+    """value when a batched call supplied it, otherwise the result of fetch()"""
+    return await fetch() if value is None else value
@@ -4,21 +4,30 @@ Specialized module for generating architectural assets
 Handles houses, taverns, churches, shops, and other building types
 """
 
+import asyncio
 import random
 import hashlib
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 from pathlib import Path
 import logging
 
+from ..seeding import stream_rng
+from .ai_core import DEFAULT_BATCH_SIZE
+from .asset_tasks import DEFAULT_ASSET_CONCURRENCY, gather_assets, supplied_or
+
 class BuildingGenerator:
     """
     Specialized building generation module
     Handles all architectural assets and building creation
     """
     
-    def __init__(self, output_dir: Path, ai_core):
+    def __init__(self, output_dir: Path, ai_core, seed: Optional[int] = None):
         self.output_dir = output_dir
         self.ai_core = ai_core
+        # Each building draws from its own stream of this seed
+        self.seed = seed
+        self.max_concurrency = DEFAULT_ASSET_CONCURRENCY
+        self.batch_size = DEFAULT_BATCH_SIZE
         self.logger = logging.getLogger(__name__)
         
         # Building-specific directories
@@ -27,107 +36,117 @@ class BuildingGenerator:
         self.scripts_dir.mkdir(exist_ok=True)
         self.models_dir.mkdir(exist_ok=True)
     
-    async def generate_ai_creative_buildings(self, buildings: List[Dict], theme: str) -> List[Dict]:
-        """Generate AI-creative buildings with unique architectural designs"""
-        creative_buildings = []
+    async def generate_ai_creative_buildings(self, buildings: List[Dict], theme: str,
+                                             budget: Optional[asyncio.Semaphore] = None) -> List[Dict]:
+        """Generate AI-creative buildings with unique architectural designs, several at a time"""
+        designs = await self.ai_core.generate_asset_batches(
+            'building', [(building.get('type', 'house'), i) for i, building in enumerate(buildings)], theme,
+            self.batch_size
+        )
+        return await gather_assets(
+            buildings, lambda i, building: self._generate_creative_building(building, theme, i, designs[i]),
+            self.max_concurrency, 'building', self.logger, budget
+        )
+    
+    async def _generate_creative_building(self, building: Dict, theme: str, i: int,
+                                          design: Optional[Dict] = None) -> Dict:
+        """Generate one AI-creative building, using whatever its batched design supplied"""
+        design = design or {}
+        building_type = building.get('type', 'house')
+        position = building.get('position', {'x': 0, 'y': 0, 'z': 0})
+        rng = stream_rng(self.seed, "building", building.get('id', i))
         
-        for i, building in enumerate(buildings):
-            building_type = building.get('type', 'house')
-            position = building.get('position', {'x': 0, 'y': 0, 'z': 0})
-            
-            # Generate AI creative description
-            ai_description = await self.ai_core.generate_building_description(building_type, theme, i)
-            
-            # Generate creative variations
-            variations = await self.ai_core.generate_building_variations(building_type, theme)
-            
-            # Generate unique architectural style parameters
-            style_params = await self._generate_building_style(building_type, theme)
-            
-            # Generate AI textures for building
-            building_textures = await self._generate_building_textures(building_type, theme, ai_description, i)
-            
-            # Generate geometry parameters
-            geometry_params = await self.ai_core.generate_geometry_parameters(building_type, ai_description)
-            
-            # Generate architectural details
-            architectural_details = await self._generate_architectural_details(building_type, theme, style_params)
-            
-            # Create building script
-            script_content = self._create_building_script(
-                building, theme, ai_description, variations, style_params,
-                building_textures, geometry_params, architectural_details, i
-            )
-            
-            building_id = f"{building_type}_{i}_{position['x']}_{position['y']}"
-            script_path = self.scripts_dir / f"ai_building_{building_id}.py"
-            
-            with open(script_path, 'w') as f:
-                f.write(script_content)
-            
-            creative_buildings.append({
-                'id': building_id,
-                'type': building_type,
-                'position': position,
-                'ai_description': ai_description,
-                'creative_variations': variations,
-                'style_parameters': style_params,
-                'geometry_parameters': geometry_params,
-                'architectural_details': architectural_details,
-                'unique_textures': building_textures,
-                'script_path': str(script_path),
-                'creativity_score': len(variations) + len(building_textures) + len(architectural_details),
-                'uniqueness_id': hashlib.md5(f"{ai_description}{style_params}".encode()).hexdigest()[:8]
-            })
+        # Description, variations and style are independent; the style is the only one drawing from rng
+        ai_description, variations, style_params = await asyncio.gather(
+            supplied_or(design.get('description'),
+                        lambda: self.ai_core.generate_building_description(building_type, theme, i)),
+            supplied_or(design.get('variations'), lambda: self.ai_core.generate_building_variations(building_type, theme)),
+            self._generate_building_style(building_type, theme, rng)
+        )
+        
+        # Textures and geometry both follow from the description
+        building_textures, geometry_params = await asyncio.gather(
+            self._generate_building_textures(building_type, theme, ai_description, i),
+            supplied_or(design.get('geometry'),
+                        lambda: self.ai_core.generate_geometry_parameters(building_type, ai_description, rng))
+        )
         
-        return creative_buildings
+        # Generate architectural details
+        architectural_details = await self._generate_architectural_details(building_type, theme, style_params, rng)
+        
+        # Create building script
+        script_content = self._create_building_script(
+            building, theme, ai_description, variations, style_params,
+            building_textures, geometry_params, architectural_details, i
+        )
+        
+        building_id = f"{building_type}_{i}_{position['x']}_{position['y']}"
+        script_path = self.scripts_dir / f"ai_building_{building_id}.py"
+        
+        with open(script_path, 'w') as f:
+            f.write(script_content)
+        
+        return {
+            'id': building_id,
+            'type': building_type,
+            'position': position,
+            'ai_description': ai_description,
+            'creative_variations': variations,
+            'style_parameters': style_params,
+            'geometry_parameters': geometry_params,
+            'architectural_details': architectural_details,
+            'unique_textures': building_textures,
+            'script_path': str(script_path),
+            'creativity_score': len(variations) + len(building_textures) + len(architectural_details),
+            'uniqueness_id': hashlib.md5(f"{ai_description}{style_params}".encode()).hexdigest()[:8]
+        }
     
-    async def _generate_building_style(self, building_type: str, theme: str) -> Dict[str, Any]:
+    async def _generate_building_style(self, building_type: str, theme: str, rng: random.Random) -> Dict[str, Any]:
         """Generate unique architectural style parameters"""
         # Base architectural styles with theme variations
         base_styles = {
             'house': {
-                'roof_type': random.choice(['gabled', 'hipped', 'flat', 'shed', 'gambrel']),
-                'wall_material': random.choice(['wood', 'stone', 'brick', 'timber_frame']),
-                'foundation': random.choice(['stone', 'brick', 'concrete', 'raised']),
-                'window_style': random.choice(['casement', 'double_hung', 'bay', 'dormer']),
-                'door_style': random.choice(['single', 'double', 'arched', 'reinforced']),
-                'chimney': random.choice(['none', 'single', 'double', 'ornate']),
-                'stories': random.choice([1, 1, 2, 2, 3]),  # Weighted toward 1-2 stories
-                'architectural_style': random.choice(['cottage', 'farmhouse', 'tudor', 'colonial'])
+                'roof_type': rng.choice(['gabled', 'hipped', 'flat', 'shed', 'gambrel']),
+                'wall_material': rng.choice(['wood', 'stone', 'brick', 'timber_frame']),
+                'foundation': rng.choice(['stone', 'brick', 'concrete', 'raised']),
+                'window_style': rng.choice(['casement', 'double_hung', 'bay', 'dormer']),
+                'door_style': rng.choice(['single', 'double', 'arched', 'reinforced']),
+                'chimney': rng.choice(['none', 'single', 'double', 'ornate']),
+                'stories': rng.choice([1, 1, 2, 2, 3]),  # Weighted toward 1-2 stories
+                'architectural_style': rng.choice(['cottage', 'farmhouse', 'tudor', 'colonial'])
             },
             'tavern': {
-                'roof_type': random.choice(['gabled', 'hipped', 'gambrel']),
-                'wall_material': random.choice(['timber_frame', 'stone', 'brick']),
-                'foundation': random.choice(['stone', 'brick']),
-                'window_style': random.choice(['casement', 'bay', 'leaded_glass']),
-                'door_style': random.choice(['double', 'arched', 'heavy_wood']),
-                'chimney': random.choice(['single', 'double', 'ornate']),
-                'stories': random.choice([2, 2, 3]),  # Usually multi-story
-                'special_features': random.choice(['balcony', 'porch', 'sign_post', 'outdoor_seating']),
-                'architectural_style': random.choice(['inn', 'public_house', 'roadhouse'])
+                'roof_type': rng.choice(['gabled', 'hipped', 'gambrel']),
+                'wall_material': rng.choice(['timber_frame', 'stone', 'brick']),
+                'foundation': rng.choice(['stone', 'brick']),
+                'window_style': rng.choice(['casement', 'bay', 'leaded_glass']),
+                'door_style': rng.choice(['double', 'arched', 'heavy_wood']),
+                'chimney': rng.choice(['single', 'double', 'ornate']),
+                'stories': rng.choice([2, 2, 3]),  # Usually multi-story
+                'special_features': rng.choice(['balcony', 'porch', 'sign_post', 'outdoor_seating']),
+                'architectural_style': rng.choice(['inn', 'public_house', 'roadhouse'])
             },
             'church': {
-                'roof_type': random.choice(['gabled', 'vaulted', 'spired']),
-                'wall_material': random.choice(['stone', 'brick', 'marble']),
+                'roof_type': rng.choice(['gabled', 'vaulted', 'spired']),
+                'wall_material': rng.choice(['stone', 'brick', 'marble']),
                 'foundation': 'stone',  # Churches typically have stone foundations
-                'window_style': random.choice(['gothic', 'rose', 'stained_glass', 'arched']),
-                'door_style': random.choice(['arched', 'ornate', 'double_arched']),
-                'tower': random.choice(['bell_tower', 'spire', 'dome', 'none']),
-                'stories': random.choice([1, 2]),
-                'special_features': random.choice(['flying_buttresses', 'rose_window', 'bell', 'cross']),
-                'architectural_style': random.choice(['gothic', 'romanesque', 'byzantine', 'chapel'])
+                'window_style': rng.choice(['gothic', 'rose', 'stained_glass', 'arched']),
+                'door_style': rng.choice(['arched', 'ornate', 'double_arched']),
+                'tower': rng.choice(['bell_tower', 'spire', 'dome', 'none']),
+                'stories': rng.choice([1, 2]),
+                'special_features': rng.choice(['flying_buttresses', 'rose_window', 'bell', 'cross']),
+                'architectural_style': rng.choice(['gothic', 'romanesque', 'byzantine', 'chapel'])
             },
             'shop': {
-                'roof_type': random.choice(['gabled', 'flat', 'shed']),
-                'wall_material': random.choice(['wood', 'brick', 'stone']),
-                'foundation': random.choice(['stone', 'brick', 'raised']),
-                'window_style': random.choice(['storefront', 'display', 'large_pane']),
-                'door_style': random.choice(['single', 'double', 'sliding']),
-                'chimney': random.choice(['none', 'single']),
-                'stories': random.choice([1, 1, 2]),  # Usually 1-2 stories
-                'special_features': random.choice(['awning', 'display_window', 'hanging_sign', 'workshop']),
-                'architectural_style': random.choice(['merchant', 'craftsman', 'market_stall'])
+                'roof_type': rng.choice(['gabled', 'flat', 'shed']),
+                'wall_material': rng.choice(['wood', 'brick', 'stone']),
+                'foundation': rng.choice(['stone', 'brick', 'raised']),
+                'window_style': rng.choice(['storefront', 'display', 'large_pane']),
+                'door_style': rng.choice(['single', 'double', 'sliding']),
+                'chimney': rng.choice(['none', 'single']),
+                'stories': rng.choice([1, 1, 2]),  # Usually 1-2 stories
+                'special_features': rng.choice(['awning', 'display_window', 'hanging_sign', 'workshop']),
+                'architectural_style': rng.choice(['merchant', 'craftsman', 'market_stall'])
             }
         }
         
@@ -136,17 +155,17 @@ class BuildingGenerator:
         
         # Apply theme-specific modifications
         if theme in ['spooky', 'halloween']:
-            style_params['condition'] = random.choice(['weathered', 'decrepit', 'haunted', 'abandoned'])
-            style_params['special_features'] = random.choice(['boarded_windows', 'cracked_walls', 'overgrown', 'mysterious'])
+            style_params['condition'] = rng.choice(['weathered', 'decrepit', 'haunted', 'abandoned'])
+            style_params['special_features'] = rng.choice(['boarded_windows', 'cracked_walls', 'overgrown', 'mysterious'])
         elif theme == 'fantasy':
-            style_params['magical_elements'] = random.choice(['glowing_windows', 'crystal_accents', 'floating_stones', 'enchanted'])
-            style_params['special_features'] = random.choice(['tower_addition', 'mystical_symbols', 'garden', 'workshop'])
+            style_params['magical_elements'] = rng.choice(['glowing_windows', 'crystal_accents', 'floating_stones', 'enchanted'])
+            style_params['special_features'] = rng.choice(['tower_addition', 'mystical_symbols', 'garden', 'workshop'])
         elif theme == 'desert':
-            style_params['wall_material'] = random.choice(['adobe', 'sandstone', 'mud_brick'])
-            style_params['roof_type'] = random.choice(['flat', 'low_pitched'])
-            style_params['special_features'] = random.choice(['courtyard', 'shade_structure', 'water_feature'])
+            style_params['wall_material'] = rng.choice(['adobe', 'sandstone', 'mud_brick'])
+            style_params['roof_type'] = rng.choice(['flat', 'low_pitched'])
+            style_params['special_features'] = rng.choice(['courtyard', 'shade_structure', 'water_feature'])
         elif theme == 'medieval':
-            style_params['defensive_features'] = random.choice(['none', 'reinforced_door', 'small_windows', 'fortified'])
+            style_params['defensive_features'] = rng.choice(['none', 'reinforced_door', 'small_windows', 'fortified'])
             
         return style_params
     
@@ -179,39 +198,40 @@ class BuildingGenerator:
         texture_id = hashlib.md5(f"{description}_{texture_type}_{theme}_{index}".encode()).hexdigest()[:8]
         return f"textures/buildings/{texture_type}_{theme}_{texture_id}.png"
     
-    async def _generate_architectural_details(self, building_type: str, theme: str, style_params: Dict[str, Any]) -> Dict[str, Any]:
+    async def _generate_architectural_details(self, building_type: str, theme: str, style_params: Dict[str, Any],
+                                              rng: random.Random) -> Dict[str, Any]:
         """Generate detailed architectural elements"""
         details = {}
         
         # Standard architectural details
         details['dimensions'] = {
-            'width': random.uniform(8, 20),
-            'length': random.uniform(10, 25),
-            'height': random.uniform(8, 15) * style_params.get('stories', 1)
+            'width': rng.uniform(8, 20),
+            'length': rng.uniform(10, 25),
+            'height': rng.uniform(8, 15) * style_params.get('stories', 1)
         }
         
         details['structural_elements'] = {
             'support_beams': style_params.get('wall_material') == 'timber_frame',
             'load_bearing_walls': True,
-            'foundation_depth': random.uniform(2, 4)
+            'foundation_depth': rng.uniform(2, 4)
         }
         
         # Roof details
         roof_type = style_params.get('roof_type', 'gabled')
         details['roof_details'] = {
             'type': roof_type,
-            'pitch': random.uniform(30, 45) if roof_type in ['gabled', 'hipped'] else 0,
-            'material': random.choice(['thatch', 'slate', 'wood_shingle', 'tile']),
-            'overhang': random.uniform(0.5, 2.0)
+            'pitch': rng.uniform(30, 45) if roof_type in ['gabled', 'hipped'] else 0,
+            'material': rng.choice(['thatch', 'slate', 'wood_shingle', 'tile']),
+            'overhang': rng.uniform(0.5, 2.0)
         }
         
         # Window and door details
         details['openings'] = {
-            'window_count': random.randint(2, 8),
-            'door_count': 1 if building_type != 'tavern' else random.randint(1, 2),
-            'window_size': random.choice(['small', 'medium', 'large']),
-            'door_width': random.uniform(0.8, 1.2),
-            'window_placement': random.choice(['regular', 'asymmetric', 'grouped'])
+            'window_count': rng.randint(2, 8),
+            'door_count': 1 if building_type != 'tavern' else rng.randint(1, 2),
+            'window_size': rng.choice(['small', 'medium', 'large']),
+            'door_width': rng.uniform(0.8, 1.2),
+            'window_placement': rng.choice(['regular', 'asymmetric', 'grouped'])
         }
         
         # Building-specific details
@@ -220,35 +240,35 @@ class BuildingGenerator:
                 'altar_position': 'east',
                 'nave_length': details['dimensions']['length'] * 0.7,
                 'sanctuary_area': True,
-                'bell_tower_height': random.uniform(20, 40) if style_params.get('tower') == 'bell_tower' else 0
+                'bell_tower_height': rng.uniform(20, 40) if style_params.get('tower') == 'bell_tower' else 0
             }
         elif building_type == 'tavern':
             details['commercial_elements'] = {
                 'common_room_size': details['dimensions']['width'] * details['dimensions']['length'] * 0.6,
                 'kitchen_area': True,
-                'guest_rooms': random.randint(2, 6),
+                'guest_rooms': rng.randint(2, 6),
                 'storage_area': True
             }
         elif building_type == 'shop':
             details['commercial_elements'] = {
                 'shop_floor_area': details['dimensions']['width'] * details['dimensions']['length'] * 0.7,
                 'storage_area': True,
-                'workshop_area': random.choice([True, False]),
+                'workshop_area': rng.choice([True, False]),
                 'display_area': True
             }
         
         # Theme-specific details
         if theme == 'fantasy':
             details['magical_elements'] = {
-                'enchanted_features': random.choice(['glowing_runes', 'floating_objects', 'magical_lights']),
-                'crystal_accents': random.choice([True, False]),
-                'mystical_garden': random.choice([True, False])
+                'enchanted_features': rng.choice(['glowing_runes', 'floating_objects', 'magical_lights']),
+                'crystal_accents': rng.choice([True, False]),
+                'mystical_garden': rng.choice([True, False])
             }
         elif theme in ['spooky', 'halloween']:
             details['atmospheric_elements'] = {
-                'weathering': random.choice(['severe', 'moderate', 'light']),
-                'overgrowth': random.choice([True, False]),
-                'mysterious_features': random.choice(['strange_sounds', 'moving_shadows', 'cold_spots'])
+                'weathering': rng.choice(['severe', 'moderate', 'light']),
+                'overgrowth': rng.choice([True, False]),
+                'mysterious_features': rng.choice(['strange_sounds', 'moving_shadows', 'cold_spots'])
             }
         
         return details
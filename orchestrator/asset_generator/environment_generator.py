@@ -4,20 +4,39 @@ Specialized module for generating environmental assets
 Handles terrain features, paths, water bodies, and atmospheric elements
 """
 
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 from pathlib import Path
 import logging
 import random
 
+from ..world_designer.core.data_types import WorldPosition
+from ..world_designer.core.region_index import RegionIndex, open_region_index
+from ..world_designer.core.terrain_regions import TerrainRegion, find_terrain_regions
+from ..world_designer.core.terrain_store import open_terrain
+from ..seeding import stream_rng
+
+# Terrain regions smaller than this many tiles, or this share of the map, get no feature
+MIN_FEATURE_REGION = 4
+MIN_FEATURE_REGION_SHARE = 0.001
+
+# Largest regions per terrain type that get a feature
+MAX_FEATURES_PER_TERRAIN = 3
+
+# Scattered water features and ambient props keep this far from buildings and paths
+SCATTER_CLEARANCE = 3.0
+SCATTER_ATTEMPTS = 12
+
 class EnvironmentGenerator:
     """
     Specialized environment generation module
     Handles terrain features, paths, water, and atmospheric elements
     """
     
-    def __init__(self, output_dir: Path, ai_core):
+    def __init__(self, output_dir: Path, ai_core, seed: Optional[int] = None):
         self.output_dir = output_dir
         self.ai_core = ai_core
+        # Each environment stage and path draws from its own stream of this seed
+        self.seed = seed
         self.logger = logging.getLogger(__name__)
         
         # Environment-specific directories
@@ -32,19 +51,20 @@ class EnvironmentGenerator:
         
         # Extract world information
         size = world_spec.get('size', (40, 40))
-        terrain_map = world_spec.get('terrain_map', [])
+        terrain = open_terrain(world_spec)
         buildings = world_spec.get('buildings', [])
+        index = open_region_index(world_spec)
         
         # Generate paths connecting buildings
         paths = await self._generate_path_network(buildings, size, theme)
         environment_assets.extend(paths)
         
         # Generate terrain features
-        terrain_features = await self._generate_terrain_features(terrain_map, theme)
+        terrain_features = await self._generate_terrain_features(terrain, theme)
         environment_assets.extend(terrain_features)
         
         # Generate water features if appropriate
-        water_features = await self._generate_water_features(world_spec, theme)
+        water_features = await self._generate_water_features(world_spec, theme, index)
         environment_assets.extend(water_features)
         
         # Generate atmospheric elements
@@ -52,7 +72,7 @@ class EnvironmentGenerator:
         environment_assets.extend(atmospheric)
         
         # Generate ambient props
-        ambient_props = await self._generate_ambient_props(world_spec, theme)
+        ambient_props = await self._generate_ambient_props(world_spec, theme, index)
         environment_assets.extend(ambient_props)
         
         return environment_assets
@@ -82,6 +102,7 @@ class EnvironmentGenerator:
                 continue
                 
             building_pos = building.get('position', {'x': 0, 'y': 0})
+            rng = stream_rng(self.seed, "path", i)
             
             # Create path description
             path_description = await self._generate_path_description(
@@ -89,7 +110,7 @@ class EnvironmentGenerator:
             )
             
             # Generate path geometry
-            path_points = self._calculate_path_points(hub_pos, building_pos)
+            path_points = self._calculate_path_points(hub_pos, building_pos, rng)
             
             path_asset = {
                 'id': f"path_hub_to_{building.get('type', 'building')}_{i}",
@@ -98,7 +119,7 @@ class EnvironmentGenerator:
                 'start_position': hub_pos,
                 'end_position': building_pos,
                 'path_points': path_points,
-                'path_style': await self._generate_path_style(theme),
+                'path_style': await self._generate_path_style(theme, rng),
                 'script_path': self._create_path_script(path_points, theme, i)
             }
             
@@ -130,7 +151,7 @@ class EnvironmentGenerator:
         response = await self.ai_core.call_gemini(prompt)
         return response if response else f"A {distance_desc} {theme} path leading to the {destination_type}"
     
-    def _calculate_path_points(self, start_pos: Dict, end_pos: Dict) -> List[Dict]:
+    def _calculate_path_points(self, start_pos: Dict, end_pos: Dict, rng: random.Random) -> List[Dict]:
         """Calculate path waypoints with natural curves"""
         points = [start_pos]
         
@@ -149,7 +170,7 @@ class EnvironmentGenerator:
                 mid_y = start_pos['y'] + (end_pos['y'] - start_pos['y']) * ratio
                 
                 # Add slight curve offset
-                curve_offset = random.uniform(-3, 3)
+                curve_offset = rng.uniform(-3, 3)
                 perpendicular_angle = 1.5708  # 90 degrees in radians
                 
                 mid_x += curve_offset * (-1 if i % 2 else 1)
@@ -160,32 +181,32 @@ class EnvironmentGenerator:
         points.append(end_pos)
         return points
     
-    async def _generate_path_style(self, theme: str) -> Dict[str, Any]:
+    async def _generate_path_style(self, theme: str, rng: random.Random) -> Dict[str, Any]:
         """Generate path styling parameters"""
         base_styles = {
             'medieval': {
-                'material': random.choice(['cobblestone', 'dirt', 'gravel', 'flagstone']),
-                'width': random.uniform(1.5, 3.0),
-                'edge_treatment': random.choice(['grass', 'stones', 'wild_flowers']),
-                'condition': random.choice(['well_maintained', 'worn', 'overgrown'])
+                'material': rng.choice(['cobblestone', 'dirt', 'gravel', 'flagstone']),
+                'width': rng.uniform(1.5, 3.0),
+                'edge_treatment': rng.choice(['grass', 'stones', 'wild_flowers']),
+                'condition': rng.choice(['well_maintained', 'worn', 'overgrown'])
             },
             'fantasy': {
-                'material': random.choice(['enchanted_stone', 'crystal_path', 'moss_covered', 'glowing_stones']),
-                'width': random.uniform(1.8, 3.5),
-                'edge_treatment': random.choice(['magical_flowers', 'glowing_moss', 'crystal_formations']),
-                'condition': random.choice(['pristine', 'mystical', 'ancient'])
+                'material': rng.choice(['enchanted_stone', 'crystal_path', 'moss_covered', 'glowing_stones']),
+                'width': rng.uniform(1.8, 3.5),
+                'edge_treatment': rng.choice(['magical_flowers', 'glowing_moss', 'crystal_formations']),
+                'condition': rng.choice(['pristine', 'mystical', 'ancient'])
             },
             'spooky': {
-                'material': random.choice(['cracked_stone', 'dark_earth', 'bone_fragments', 'rotting_wood']),
-                'width': random.uniform(1.0, 2.5),
-                'edge_treatment': random.choice(['dead_grass', 'thorny_vines', 'mushrooms', 'fog']),
-                'condition': random.choice(['decrepit', 'abandoned', 'treacherous'])
+                'material': rng.choice(['cracked_stone', 'dark_earth', 'bone_fragments', 'rotting_wood']),
+                'width': rng.uniform(1.0, 2.5),
+                'edge_treatment': rng.choice(['dead_grass', 'thorny_vines', 'mushrooms', 'fog']),
+                'condition': rng.choice(['decrepit', 'abandoned', 'treacherous'])
             },
             'desert': {
-                'material': random.choice(['sandstone', 'packed_sand', 'adobe_bricks', 'sun_dried_clay']),
-                'width': random.uniform(2.0, 4.0),
-                'edge_treatment': random.choice(['sand_dunes', 'desert_plants', 'stone_markers']),
-                'condition': random.choice(['sand_swept', 'sun_bleached', 'well_traveled'])
+                'material': rng.choice(['sandstone', 'packed_sand', 'adobe_bricks', 'sun_dried_clay']),
+                'width': rng.uniform(2.0, 4.0),
+                'edge_treatment': rng.choice(['sand_dunes', 'desert_plants', 'stone_markers']),
+                'condition': rng.choice(['sand_swept', 'sun_bleached', 'well_traveled'])
             }
         }
         
@@ -261,6 +282,7 @@ print("🛤️ AI Path Generation Complete!")
     async def _generate_secondary_paths(self, buildings: List[Dict], theme: str) -> List[Dict]:
         """Generate secondary connecting paths between buildings"""
         secondary_paths = []
+        rng = stream_rng(self.seed, "secondary_paths")
         
         # Connect buildings that are close to each other
         for i, building1 in enumerate(buildings):
@@ -271,8 +293,9 @@ print("🛤️ AI Path Generation Complete!")
                 distance = ((pos2['x'] - pos1['x'])**2 + (pos2['y'] - pos1['y'])**2)**0.5
                 
                 # Create secondary path if buildings are reasonably close
-                if distance < 25 and random.random() < 0.3:  # 30% chance for nearby buildings
-                    path_points = self._calculate_path_points(pos1, pos2)
+                if distance < 25 and rng.random() < 0.3:  # 30% chance for nearby buildings
+                    path_rng = stream_rng(self.seed, "secondary_path", i, j)
+                    path_points = self._calculate_path_points(pos1, pos2, path_rng)
                     
                     # Create safe index for file naming
                     path_index = f"sec_{i}_{j}"
@@ -284,7 +307,7 @@ print("🛤️ AI Path Generation Complete!")
                         'start_position': pos1,
                         'end_position': pos2,
                         'path_points': path_points,
-                        'path_style': await self._generate_path_style(theme),
+                        'path_style': await self._generate_path_style(theme, path_rng),
                         'script_path': self._create_path_script(path_points, theme, path_index)
                     }
                     
@@ -292,48 +315,33 @@ print("🛤️ AI Path Generation Complete!")
         
         return secondary_paths
     
-    async def _generate_terrain_features(self, terrain_map: List[List[str]], theme: str) -> List[Dict]:
-        """Generate terrain features based on terrain map"""
+    async def _generate_terrain_features(self, terrain, theme: str) -> List[Dict]:
+        """Generate terrain features for the significant connected regions of each terrain type"""
         terrain_features = []
         
-        if not terrain_map:
+        if not terrain:
             return terrain_features
         
-        # Analyze terrain for feature placement
-        height = len(terrain_map)
-        width = len(terrain_map[0]) if height > 0 else 0
+        # Small regions are noise; on large maps only regions above a share of the map count
+        min_size = max(MIN_FEATURE_REGION, int(terrain.width * terrain.height * MIN_FEATURE_REGION_SHARE))
+        features_per_type: Dict[str, int] = {}
         
-        # Find terrain clusters for feature placement
-        terrain_clusters = self._find_terrain_clusters(terrain_map)
-        
-        for cluster_type, positions in terrain_clusters.items():
-            if len(positions) > 3:  # Only create features for significant clusters
-                feature = await self._create_terrain_feature(cluster_type, positions, theme)
-                if feature:
-                    terrain_features.append(feature)
+        for region in find_terrain_regions(terrain, min_size=min_size):
+            index = features_per_type.get(region.terrain, 0)
+            if index >= MAX_FEATURES_PER_TERRAIN:
+                continue
+            features_per_type[region.terrain] = index + 1
+            feature = await self._create_terrain_feature(region.terrain, region, theme, index)
+            if feature:
+                terrain_features.append(feature)
         
         return terrain_features
     
-    def _find_terrain_clusters(self, terrain_map: List[List[str]]) -> Dict[str, List[tuple]]:
-        """Find clusters of similar terrain types"""
-        clusters = {}
-        height = len(terrain_map)
-        width = len(terrain_map[0]) if height > 0 else 0
-        
-        for y in range(height):
-            for x in range(width):
-                terrain_type = terrain_map[y][x]
-                if terrain_type not in clusters:
-                    clusters[terrain_type] = []
-                clusters[terrain_type].append((x, y))
-        
-        return clusters
-    
-    async def _create_terrain_feature(self, terrain_type: str, positions: List[tuple], theme: str) -> Dict[str, Any]:
-        """Create a terrain feature for a cluster of terrain"""
-        # Calculate center of cluster
-        center_x = sum(pos[0] for pos in positions) / len(positions)
-        center_y = sum(pos[1] for pos in positions) / len(positions)
+    async def _create_terrain_feature(self, terrain_type: str, region: TerrainRegion, theme: str,
+                                      index: int = 0) -> Dict[str, Any]:
+        """Create a terrain feature for a connected region of terrain"""
+        # Region tile closest to its centroid, so the feature sits inside the region
+        center_x, center_y = region.anchor
         
         # Generate feature based on terrain type
         feature_types = {
@@ -344,21 +352,24 @@ print("🛤️ AI Path Generation Complete!")
             'desert': ['oasis', 'sand_dune', 'rock_formation']
         }
         
+        rng = stream_rng(self.seed, "terrain_feature", terrain_type, index)
         available_features = feature_types.get(terrain_type, ['natural_formation'])
-        feature_type = random.choice(available_features)
+        feature_type = rng.choice(available_features)
         
         # Generate feature description
         description = await self._generate_terrain_feature_description(feature_type, terrain_type, theme)
         
         return {
-            'id': f"terrain_{terrain_type}_{feature_type}",
+            'id': f"terrain_{terrain_type}_{feature_type}_{index}",
             'type': 'terrain_feature',
             'feature_type': feature_type,
             'terrain_type': terrain_type,
             'position': {'x': center_x, 'y': center_y, 'z': 0},
             'description': description,
-            'affected_area': len(positions),
-            'script_path': self._create_terrain_feature_script(feature_type, center_x, center_y, theme)
+            'affected_area': region.size,
+            'region_bounds': list(region.bounds),
+            'script_path': self._create_terrain_feature_script(feature_type, center_x, center_y, theme,
+                                                               rng.getrandbits(32))
         }
     
     async def _generate_terrain_feature_description(self, feature_type: str, terrain_type: str, theme: str) -> str:
@@ -378,7 +389,8 @@ print("🛤️ AI Path Generation Complete!")
         response = await self.ai_core.call_gemini(prompt)
         return response if response else f"A {theme} {feature_type} nestled in the {terrain_type}"
     
-    def _create_terrain_feature_script(self, feature_type: str, x: float, y: float, theme: str) -> str:
+    def _create_terrain_feature_script(self, feature_type: str, x: float, y: float, theme: str,
+                                       script_seed: int) -> str:
         """Create terrain feature generation script"""
         # Convert coordinates to strings for safe concatenation
         x_str = str(int(x))
@@ -389,6 +401,9 @@ import bpy
 import random
 import math
 
+# Seeded so the feature's random details rebuild identically
+random.seed({script_seed})
+
 # AI-GENERATED TERRAIN FEATURE
 # Feature: {feature_type}
 # Theme: {theme}
@@ -535,36 +550,35 @@ print("🌍 AI Terrain Feature Generation Complete!")
         
         return str(script_path)
     
-    async def _generate_water_features(self, world_spec: Dict[str, Any], theme: str) -> List[Dict]:
+    async def _generate_water_features(self, world_spec: Dict[str, Any], theme: str,
+                                       index: Optional[RegionIndex] = None) -> List[Dict]:
         """Generate water features like ponds, streams, fountains"""
         water_features = []
         
         size = world_spec.get('size', (40, 40))
-        terrain_map = world_spec.get('terrain_map', [])
+        terrain = open_terrain(world_spec)
+        if index is None:
+            index = open_region_index(world_spec)
+        
+        rng = stream_rng(self.seed, "water_features")
         
         # Check if world has water terrain
-        has_water_terrain = False
-        if terrain_map:
-            for row in terrain_map:
-                if 'water' in row:
-                    has_water_terrain = True
-                    break
+        has_water_terrain = bool(terrain) and terrain.has_terrain('water')
         
         # Generate water features based on theme and terrain
-        if has_water_terrain or random.random() < 0.4:  # 40% chance even without water terrain
+        if has_water_terrain or rng.random() < 0.4:  # 40% chance even without water terrain
             water_types = ['pond', 'fountain', 'stream']
             if theme == 'desert':
                 water_types = ['oasis', 'well']
             elif theme == 'fantasy':
                 water_types.extend(['magical_spring', 'crystal_pool'])
             
-            num_features = random.randint(1, 3)
+            num_features = rng.randint(1, 3)
             for i in range(num_features):
-                water_type = random.choice(water_types)
+                water_type = rng.choice(water_types)
                 
                 # Random position away from buildings
-                x = random.uniform(5, size[0] - 5)
-                y = random.uniform(5, size[1] - 5)
+                x, y = self._scatter_position(index, size, 5, rng)
                 
                 description = await self._generate_water_feature_description(water_type, theme)
                 
@@ -574,7 +588,7 @@ print("🌍 AI Terrain Feature Generation Complete!")
                     'water_type': water_type,
                     'position': {'x': x, 'y': y, 'z': 0},
                     'description': description,
-                    'script_path': self._create_water_feature_script(water_type, x, y, theme, i)
+                    'script_path': self._create_water_feature_script(water_type, x, y, theme, i, rng.getrandbits(32))
                 }
                 
                 water_features.append(water_feature)
@@ -598,13 +612,17 @@ print("🌍 AI Terrain Feature Generation Complete!")
         response = await self.ai_core.call_gemini(prompt)
         return response if response else f"A beautiful {theme} {water_type} with pristine water"
     
-    def _create_water_feature_script(self, water_type: str, x: float, y: float, theme: str, index: int) -> str:
+    def _create_water_feature_script(self, water_type: str, x: float, y: float, theme: str, index: int,
+                                     script_seed: int) -> str:
         """Create water feature generation script"""
         script_content = f'''
 import bpy
 import random
 import math
 
+# Seeded so the feature's random details rebuild identically
+random.seed({script_seed})
+
 # AI-GENERATED WATER FEATURE
 # Type: {water_type}
 # Theme: {theme}
@@ -796,48 +814,49 @@ print("💧 AI Water Feature Generation Complete!")
     async def _generate_atmospheric_elements(self, theme: str, size: tuple) -> List[Dict]:
         """Generate atmospheric elements like lighting, fog, particle effects"""
         atmospheric_elements = []
+        rng = stream_rng(self.seed, "atmosphere")
         
         # Generate lighting setup
-        lighting = await self._generate_lighting_setup(theme)
+        lighting = await self._generate_lighting_setup(theme, rng)
         atmospheric_elements.append(lighting)
         
         # Generate weather/atmosphere effects
-        if random.random() < 0.6:  # 60% chance of atmospheric effects
-            atmosphere = await self._generate_atmosphere_effects(theme)
+        if rng.random() < 0.6:  # 60% chance of atmospheric effects
+            atmosphere = await self._generate_atmosphere_effects(theme, rng)
             atmospheric_elements.append(atmosphere)
         
         # Generate ambient sounds (metadata only)
-        sounds = await self._generate_ambient_sounds(theme)
+        sounds = await self._generate_ambient_sounds(theme, rng)
         atmospheric_elements.append(sounds)
         
         return atmospheric_elements
     
-    async def _generate_lighting_setup(self, theme: str) -> Dict[str, Any]:
+    async def _generate_lighting_setup(self, theme: str, rng: random.Random) -> Dict[str, Any]:
         """Generate theme-appropriate lighting"""
         lighting_setups = {
             'medieval': {
-                'sun_intensity': random.uniform(3, 5),
-                'sun_angle': random.uniform(30, 60),
+                'sun_intensity': rng.uniform(3, 5),
+                'sun_angle': rng.uniform(30, 60),
                 'ambient_color': [0.4, 0.4, 0.5],
                 'sun_color': [1.0, 0.95, 0.8]
             },
             'fantasy': {
-                'sun_intensity': random.uniform(2, 4),
-                'sun_angle': random.uniform(20, 50),
+                'sun_intensity': rng.uniform(2, 4),
+                'sun_angle': rng.uniform(20, 50),
                 'ambient_color': [0.3, 0.4, 0.6],
                 'sun_color': [0.9, 0.95, 1.0],
                 'magical_lights': True
             },
             'spooky': {
-                'sun_intensity': random.uniform(1, 2),
-                'sun_angle': random.uniform(10, 30),
+                'sun_intensity': rng.uniform(1, 2),
+                'sun_angle': rng.uniform(10, 30),
                 'ambient_color': [0.2, 0.25, 0.3],
                 'sun_color': [0.7, 0.7, 0.8],
                 'fog_density': 0.3
             },
             'desert': {
-                'sun_intensity': random.uniform(4, 6),
-                'sun_angle': random.uniform(40, 80),
+                'sun_intensity': rng.uniform(4, 6),
+                'sun_angle': rng.uniform(40, 80),
                 'ambient_color': [0.6, 0.5, 0.4],
                 'sun_color': [1.0, 0.9, 0.7],
                 'heat_shimmer': True
@@ -854,7 +873,7 @@ print("💧 AI Water Feature Generation Complete!")
             'description': f"Atmospheric lighting setup for {theme} environment"
         }
     
-    async def _generate_atmosphere_effects(self, theme: str) -> Dict[str, Any]:
+    async def _generate_atmosphere_effects(self, theme: str, rng: random.Random) -> Dict[str, Any]:
         """Generate atmospheric effects"""
         effects = {
             'medieval': ['light_fog', 'dust_motes', 'wind'],
@@ -864,18 +883,18 @@ print("💧 AI Water Feature Generation Complete!")
         }
         
         available_effects = effects.get(theme, ['light_fog'])
-        selected_effect = random.choice(available_effects)
+        selected_effect = rng.choice(available_effects)
         
         return {
             'id': f"atmosphere_{theme}_{selected_effect}",
             'type': 'atmospheric_effect',
             'effect_type': selected_effect,
             'theme': theme,
-            'intensity': random.uniform(0.3, 0.8),
+            'intensity': rng.uniform(0.3, 0.8),
             'description': f"{selected_effect.replace('_', ' ').title()} effect for {theme} atmosphere"
         }
     
-    async def _generate_ambient_sounds(self, theme: str) -> Dict[str, Any]:
+    async def _generate_ambient_sounds(self, theme: str, rng: random.Random) -> Dict[str, Any]:
         """Generate ambient sound profile"""
         sound_profiles = {
             'medieval': ['birds_chirping', 'wind_through_trees', 'distant_bells'],
@@ -891,15 +910,18 @@ print("💧 AI Water Feature Generation Complete!")
             'type': 'ambient_sounds',
             'sound_list': sounds,
             'theme': theme,
-            'volume': random.uniform(0.2, 0.6),
+            'volume': rng.uniform(0.2, 0.6),
             'description': f"Ambient soundscape for {theme} environment"
         }
     
-    async def _generate_ambient_props(self, world_spec: Dict[str, Any], theme: str) -> List[Dict]:
+    async def _generate_ambient_props(self, world_spec: Dict[str, Any], theme: str,
+                                      index: Optional[RegionIndex] = None) -> List[Dict]:
         """Generate small ambient props scattered throughout the world"""
         ambient_props = []
         
         size = world_spec.get('size', (40, 40))
+        if index is None:
+            index = open_region_index(world_spec)
         
         # Generate scattered small props
         prop_types = {
@@ -909,15 +931,15 @@ print("💧 AI Water Feature Generation Complete!")
             'desert': ['cactus', 'sun_dial', 'nomad_tent', 'bone', 'sand_dune']
         }
         
+        rng = stream_rng(self.seed, "ambient_props")
         available_props = prop_types.get(theme, ['generic_prop'])
-        num_props = random.randint(3, 8)
+        num_props = rng.randint(3, 8)
         
         for i in range(num_props):
-            prop_type = random.choice(available_props)
+            prop_type = rng.choice(available_props)
             
-            # Random position
-            x = random.uniform(2, size[0] - 2)
-            y = random.uniform(2, size[1] - 2)
+            # Random position clear of buildings and paths
+            x, y = self._scatter_position(index, size, 2, rng)
             
             ambient_prop = {
                 'id': f"ambient_{prop_type}_{i}",
@@ -925,9 +947,18 @@ print("💧 AI Water Feature Generation Complete!")
                 'prop_type': prop_type,
                 'position': {'x': x, 'y': y, 'z': 0},
                 'description': f"A {theme} {prop_type} adding atmosphere to the environment",
-                'scale': random.uniform(0.8, 1.2)
+                'scale': rng.uniform(0.8, 1.2)
             }
             
             ambient_props.append(ambient_prop)
         
-        return ambient_props
\ No newline at end of file
+        return ambient_props
+    
+    def _scatter_position(self, index: RegionIndex, size: tuple, margin: float, rng: random.Random) -> tuple:
+        """Random position at least SCATTER_CLEARANCE from buildings and paths, if one is found"""
+        for _ in range(SCATTER_ATTEMPTS):
+            x = rng.uniform(margin, size[0] - margin)
+            y = rng.uniform(margin, size[1] - margin)
+            if not index.nearest(WorldPosition(x, y), kinds=("buildings", "paths"), max_radius=SCATTER_CLEARANCE):
+                break
+        return x, y
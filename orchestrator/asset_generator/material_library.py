@@ -5,19 +5,23 @@ Handles material definitions, shader settings, and material catalogs
 """
 
 import json
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 from pathlib import Path
 import logging
 
+from ..seeding import stream_rng
+
 class MaterialLibrary:
     """
     Specialized material library management module
     Creates and manages comprehensive material catalogs
     """
     
-    def __init__(self, output_dir: Path, ai_core):
+    def __init__(self, output_dir: Path, ai_core, seed: Optional[int] = None):
         self.output_dir = output_dir
         self.ai_core = ai_core
+        # Each material variation draws from its own stream of this seed
+        self.seed = seed
         self.logger = logging.getLogger(__name__)
         
         # Material-specific directories
@@ -180,7 +184,9 @@ class MaterialLibrary:
             variation_name = f"{base_type}_{theme}_var_{i+1}"
             
             # Generate AI-guided material properties
-            material_props = await self.ai_core.generate_material_properties(base_type, theme)
+            material_props = await self.ai_core.generate_material_properties(
+                base_type, theme, stream_rng(self.seed, "material", variation_name)
+            )
             
             # Generate material description
             description = await self._generate_material_description(base_type, theme, i+1)
@@ -4,22 +4,40 @@ Specialized module for generating natural features and props
 Handles trees, rocks, bushes, wells, and other environmental objects
 """
 
+import asyncio
 import random
 import hashlib
 import math
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 from pathlib import Path
 import logging
 
+from ..seeding import stream_rng
+from .ai_core import DEFAULT_BATCH_SIZE
+from .asset_tasks import DEFAULT_ASSET_CONCURRENCY, gather_assets, supplied_or
+
+# Distinct designs per (prop type, theme) in archetype mode
+DEFAULT_ARCHETYPE_VARIANTS = 4
+
+# Largest per-channel deviation of an instance's tint from white
+INSTANCE_TINT_RANGE = 0.08
+
+def _archetype_id(prop_type: str, theme: str, variant: int) -> str:
+    return f"{prop_type}_{theme}_variant_{variant}"
+
 class PropGenerator:
     """
     Specialized prop generation module
     Handles all natural features and environmental props
     """
     
-    def __init__(self, output_dir: Path, ai_core):
+    def __init__(self, output_dir: Path, ai_core, seed: Optional[int] = None):
         self.output_dir = output_dir
         self.ai_core = ai_core
+        # Each prop draws from its own stream of this seed
+        self.seed = seed
+        self.max_concurrency = DEFAULT_ASSET_CONCURRENCY
+        self.batch_size = DEFAULT_BATCH_SIZE
         self.logger = logging.getLogger(__name__)
         
         # Prop-specific directories
@@ -29,102 +47,161 @@ class PropGenerator:
         # Shared with texture generator
         self.texture_cache = {}
     
-    async def generate_ai_creative_props(self, props: List[Dict], theme: str) -> List[Dict]:
-        """Generate AI-creative props with unique designs"""
-        creative_props = []
+    async def generate_ai_creative_props(self, props: List[Dict], theme: str,
+                                         budget: Optional[asyncio.Semaphore] = None) -> List[Dict]:
+        """Generate AI-creative props with unique designs, several at a time"""
+        designs = await self.ai_core.generate_asset_batches(
+            'prop', [(prop.get('type', 'tree'), i) for i, prop in enumerate(props)], theme, self.batch_size
+        )
+        return await gather_assets(
+            props, lambda i, prop: self._generate_creative_prop(prop, theme, i, designs[i]),
+            self.max_concurrency, 'prop', self.logger, budget
+        )
+    
+    async def _generate_creative_prop(self, prop: Dict, theme: str, i: int, design: Optional[Dict] = None) -> Dict:
+        """Generate one AI-creative prop"""
+        prop_type = prop.get('type', 'tree')
+        position = prop.get('position', {'x': 0, 'y': 0, 'z': 0})
+        rng = stream_rng(self.seed, "prop", prop.get('id', i))
+        return await self._design_prop(prop, theme, i, rng, f"{prop_type}_{i}_{position['x']}_{position['y']}", design)
+    
+    async def generate_prop_archetypes(self, props: List[Dict], theme: str, variants: int = DEFAULT_ARCHETYPE_VARIANTS,
+                                       budget: Optional[asyncio.Semaphore] = None) -> List[Dict]:
+        """
+        Design variants AI-creative props for each distinct prop type once, instead of one per prop.
         
+        Instances from instance_props() point at these by id, so model calls and scripts
+        scale with the number of prop types rather than the number of props.
+        """
+        prop_types = list(dict.fromkeys(prop.get('type', 'tree') for prop in props))
+        slots = [(prop_type, variant) for prop_type in prop_types for variant in range(max(variants, 1))]
+        designs = await self.ai_core.generate_asset_batches(
+            'prop', [(prop_type, k) for k, (prop_type, _) in enumerate(slots)], theme, self.batch_size
+        )
+        return await gather_assets(
+            slots, lambda k, slot: self._generate_archetype(slot[0], slot[1], theme, k, designs[k]),
+            self.max_concurrency, 'prop archetype', self.logger, budget
+        )
+    
+    async def _generate_archetype(self, prop_type: str, variant: int, theme: str, k: int,
+                                  design: Optional[Dict] = None) -> Dict:
+        """Generate one archetype, modelled at the origin"""
+        prop = {'type': prop_type, 'position': {'x': 0, 'y': 0, 'z': 0}}
+        rng = stream_rng(self.seed, "prop_archetype", prop_type, variant)
+        archetype = await self._design_prop(prop, theme, k, rng, _archetype_id(prop_type, theme, variant), design)
+        archetype['variant'] = variant
+        return archetype
+    
+    def instance_props(self, props: List[Dict], theme: str, variants: int = DEFAULT_ARCHETYPE_VARIANTS) -> List[Dict]:
+        """Lightweight instances of the archetypes, one per prop, with its transform, a tint and a seed"""
+        instances = []
         for i, prop in enumerate(props):
             prop_type = prop.get('type', 'tree')
             position = prop.get('position', {'x': 0, 'y': 0, 'z': 0})
-            
-            # Generate AI creative description
-            ai_description = await self.ai_core.generate_prop_description(prop_type, theme, i)
-            
-            # Generate creative variations
-            variations = await self.ai_core.generate_prop_variations(prop_type, theme)
-            
-            # Generate unique style parameters (FIXED with all defaults)
-            style_params = await self._generate_ai_prop_style(prop_type, theme)
-            
-            # Generate AI textures
-            prop_textures = await self._generate_ai_prop_textures(prop_type, theme, ai_description, i)
-            
-            # Generate geometry parameters
-            geometry_params = await self.ai_core.generate_geometry_parameters(prop_type, ai_description)
-            
-            # Create creative script
-            script_content = self._create_ai_creative_prop_script(
-                prop, theme, ai_description, variations, style_params, 
-                prop_textures, geometry_params, i
-            )
-            
-            prop_id = f"{prop_type}_{i}_{position['x']}_{position['y']}"
-            script_path = self.scripts_dir / f"ai_prop_{prop_id}.py"
-            
-            with open(script_path, 'w') as f:
-                f.write(script_content)
-            
-            creative_props.append({
-                'id': prop_id,
+            rng = stream_rng(self.seed, "prop_instance", prop.get('id', i))
+            instances.append({
+                'id': f"{prop_type}_{i}_{position['x']}_{position['y']}",
                 'type': prop_type,
+                'archetype': _archetype_id(prop_type, theme, rng.randrange(max(variants, 1))),
                 'position': position,
-                'ai_description': ai_description,
-                'creative_variations': variations,
-                'style_parameters': style_params,
-                'geometry_parameters': geometry_params,
-                'unique_textures': prop_textures,
-                'script_path': str(script_path),
-                'creativity_score': len(variations) + len(prop_textures),
-                'uniqueness_id': hashlib.md5(f"{ai_description}{style_params}".encode()).hexdigest()[:8]
+                'rotation': prop.get('rotation', 0.0),
+                'scale': prop.get('scale', 1.0),
+                # Per-channel albedo multiplier, so neighbours sharing an archetype do not look stamped
+                'tint': [round(1.0 + rng.uniform(-INSTANCE_TINT_RANGE, INSTANCE_TINT_RANGE), 3) for _ in range(3)],
+                'seed': rng.getrandbits(32)
             })
+        return instances
+    
+    async def _design_prop(self, prop: Dict, theme: str, i: int, rng: random.Random, prop_id: str,
+                           design: Optional[Dict] = None) -> Dict:
+        """Design a prop and write its Blender script, using whatever its batched design supplied"""
+        design = design or {}
+        prop_type = prop.get('type', 'tree')
+        position = prop.get('position', {'x': 0, 'y': 0, 'z': 0})
+        
+        # Description, variations and style are independent; the style is the only one drawing from rng
+        ai_description, variations, style_params = await asyncio.gather(
+            supplied_or(design.get('description'), lambda: self.ai_core.generate_prop_description(prop_type, theme, i)),
+            supplied_or(design.get('variations'), lambda: self.ai_core.generate_prop_variations(prop_type, theme)),
+            self._generate_ai_prop_style(prop_type, theme, rng)
+        )
+        
+        # Textures and geometry both follow from the description
+        prop_textures, geometry_params = await asyncio.gather(
+            self._generate_ai_prop_textures(prop_type, theme, ai_description, i),
+            supplied_or(design.get('geometry'), lambda: self.ai_core.generate_geometry_parameters(prop_type, ai_description, rng))
+        )
+        
+        # Create creative script
+        script_content = self._create_ai_creative_prop_script(
+            prop, theme, ai_description, variations, style_params, 
+            prop_textures, geometry_params, i, rng.getrandbits(32)
+        )
         
-        return creative_props
+        script_path = self.scripts_dir / f"ai_prop_{prop_id}.py"
+        
+        with open(script_path, 'w') as f:
+            f.write(script_content)
+        
+        return {
+            'id': prop_id,
+            'type': prop_type,
+            'position': position,
+            'ai_description': ai_description,
+            'creative_variations': variations,
+            'style_parameters': style_params,
+            'geometry_parameters': geometry_params,
+            'unique_textures': prop_textures,
+            'script_path': str(script_path),
+            'creativity_score': len(variations) + len(prop_textures),
+            'uniqueness_id': hashlib.md5(f"{ai_description}{style_params}".encode()).hexdigest()[:8]
+        }
 
-    async def _generate_ai_prop_style(self, prop_type: str, theme: str) -> Dict[str, Any]:
+    async def _generate_ai_prop_style(self, prop_type: str, theme: str, rng: random.Random) -> Dict[str, Any]:
         """FIXED: Generate unique style parameters for props with all required defaults"""
         # Base style templates with ALL required parameters
         base_styles = {
             'tree': {
-                'trunk_style': random.choice(['straight', 'twisted', 'gnarled', 'split']),
-                'canopy_shape': random.choice(['round', 'oval', 'irregular', 'sparse']),
-                'branch_density': random.choice(['sparse', 'medium', 'dense']),
-                'leaf_type': random.choice(['broad', 'needle', 'palm', 'none']),
-                'seasonal_state': random.choice(['spring', 'summer', 'autumn', 'winter']),
-                'bark_texture': random.choice(['smooth', 'rough', 'scarred', 'mossy']),
-                'height_variation': random.choice(['dwarf', 'normal', 'tall', 'giant'])
+                'trunk_style': rng.choice(['straight', 'twisted', 'gnarled', 'split']),
+                'canopy_shape': rng.choice(['round', 'oval', 'irregular', 'sparse']),
+                'branch_density': rng.choice(['sparse', 'medium', 'dense']),
+                'leaf_type': rng.choice(['broad', 'needle', 'palm', 'none']),
+                'seasonal_state': rng.choice(['spring', 'summer', 'autumn', 'winter']),
+                'bark_texture': rng.choice(['smooth', 'rough', 'scarred', 'mossy']),
+                'height_variation': rng.choice(['dwarf', 'normal', 'tall', 'giant'])
             },
             'oak_tree': {
-                'trunk_style': random.choice(['straight', 'twisted', 'gnarled', 'split']),
-                'canopy_shape': random.choice(['round', 'oval', 'irregular', 'sparse']),
-                'branch_density': random.choice(['sparse', 'medium', 'dense']),
+                'trunk_style': rng.choice(['straight', 'twisted', 'gnarled', 'split']),
+                'canopy_shape': rng.choice(['round', 'oval', 'irregular', 'sparse']),
+                'branch_density': rng.choice(['sparse', 'medium', 'dense']),
                 'leaf_type': 'broad',  # Oak trees have broad leaves
-                'seasonal_state': random.choice(['spring', 'summer', 'autumn', 'winter']),
-                'bark_texture': random.choice(['rough', 'deeply_furrowed', 'scarred']),
-                'height_variation': random.choice(['normal', 'tall', 'ancient'])
+                'seasonal_state': rng.choice(['spring', 'summer', 'autumn', 'winter']),
+                'bark_texture': rng.choice(['rough', 'deeply_furrowed', 'scarred']),
+                'height_variation': rng.choice(['normal', 'tall', 'ancient'])
             },
             'rock': {
-                'shape': random.choice(['rounded', 'angular', 'flat', 'crystalline']),
-                'surface': random.choice(['smooth', 'rough', 'cracked', 'mossy']),
-                'size_category': random.choice(['small', 'medium', 'large', 'boulder']),
-                'formation': random.choice(['single', 'cluster', 'outcrop', 'pile']),
-                'weathering': random.choice(['fresh', 'weathered', 'ancient', 'eroded']),
-                'mineral_type': random.choice(['granite', 'limestone', 'sandstone', 'basalt'])
+                'shape': rng.choice(['rounded', 'angular', 'flat', 'crystalline']),
+                'surface': rng.choice(['smooth', 'rough', 'cracked', 'mossy']),
+                'size_category': rng.choice(['small', 'medium', 'large', 'boulder']),
+                'formation': rng.choice(['single', 'cluster', 'outcrop', 'pile']),
+                'weathering': rng.choice(['fresh', 'weathered', 'ancient', 'eroded']),
+                'mineral_type': rng.choice(['granite', 'limestone', 'sandstone', 'basalt'])
             },
             'bush': {
-                'shape': random.choice(['round', 'oval', 'spreading', 'upright']),
-                'density': random.choice(['sparse', 'medium', 'thick', 'overgrown']),
-                'leaf_size': random.choice(['small', 'medium', 'large']),
-                'flowering': random.choice(['none', 'spring', 'summer', 'year_round']),
-                'berry_type': random.choice(['none', 'red', 'blue', 'purple', 'black']),
-                'thorns': random.choice(['none', 'light', 'heavy'])
+                'shape': rng.choice(['round', 'oval', 'spreading', 'upright']),
+                'density': rng.choice(['sparse', 'medium', 'thick', 'overgrown']),
+                'leaf_size': rng.choice(['small', 'medium', 'large']),
+                'flowering': rng.choice(['none', 'spring', 'summer', 'year_round']),
+                'berry_type': rng.choice(['none', 'red', 'blue', 'purple', 'black']),
+                'thorns': rng.choice(['none', 'light', 'heavy'])
             },
             'well': {
-                'construction': random.choice(['stone', 'brick', 'wood', 'metal']),
-                'roof_style': random.choice(['none', 'wooden', 'tiled', 'thatched']),
-                'bucket_system': random.choice(['rope', 'chain', 'pulley', 'crank']),
-                'water_level': random.choice(['high', 'medium', 'low', 'dry']),
-                'decoration': random.choice(['plain', 'carved', 'painted', 'ivy_covered']),
-                'age': random.choice(['new', 'weathered', 'ancient', 'crumbling'])
+                'construction': rng.choice(['stone', 'brick', 'wood', 'metal']),
+                'roof_style': rng.choice(['none', 'wooden', 'tiled', 'thatched']),
+                'bucket_system': rng.choice(['rope', 'chain', 'pulley', 'crank']),
+                'water_level': rng.choice(['high', 'medium', 'low', 'dry']),
+                'decoration': rng.choice(['plain', 'carved', 'painted', 'ivy_covered']),
+                'age': rng.choice(['new', 'weathered', 'ancient', 'crumbling'])
             }
         }
         
@@ -145,22 +222,22 @@ class PropGenerator:
         else:
             # Generic style for unknown prop types
             style_params = {
-                'shape': random.choice(['round', 'angular', 'organic', 'geometric']),
-                'size': random.choice(['small', 'medium', 'large']),
-                'texture': random.choice(['smooth', 'rough', 'detailed', 'weathered']),
-                'color_scheme': random.choice(['natural', 'vibrant', 'muted', 'monochrome']),
-                'complexity': random.choice(['simple', 'moderate', 'complex', 'intricate'])
+                'shape': rng.choice(['round', 'angular', 'organic', 'geometric']),
+                'size': rng.choice(['small', 'medium', 'large']),
+                'texture': rng.choice(['smooth', 'rough', 'detailed', 'weathered']),
+                'color_scheme': rng.choice(['natural', 'vibrant', 'muted', 'monochrome']),
+                'complexity': rng.choice(['simple', 'moderate', 'complex', 'intricate'])
             }
         
         # Theme-specific modifications
         if theme in ['spooky', 'halloween']:
             if 'seasonal_state' in style_params:
-                style_params['seasonal_state'] = random.choice(['autumn', 'dead', 'withered'])
+                style_params['seasonal_state'] = rng.choice(['autumn', 'dead', 'withered'])
             if 'surface' in style_params:
-                style_params['surface'] = random.choice(['cracked', 'mossy', 'weathered'])
+                style_params['surface'] = rng.choice(['cracked', 'mossy', 'weathered'])
         elif theme == 'desert':
             if 'weathering' in style_params:
-                style_params['weathering'] = random.choice(['sandblasted', 'sun_bleached', 'eroded'])
+                style_params['weathering'] = rng.choice(['sandblasted', 'sun_bleached', 'eroded'])
         
         return style_params
 
@@ -244,7 +321,7 @@ class PropGenerator:
     def _create_ai_creative_prop_script(self, prop: Dict, theme: str, ai_description: str, 
                                       variations: List[str], style_params: Dict[str, Any], 
                                       textures: Dict[str, str], geometry_params: Dict[str, Any], 
-                                      index: int) -> str:
+                                      index: int, script_seed: int) -> str:
         """FIXED: Create AI-creative prop script with proper variable substitution"""
         prop_type = prop.get('type', 'tree')
         position = prop.get('position', {'x': 0, 'y': 0, 'z': 0})
@@ -275,6 +352,9 @@ import random
 import math
 from mathutils import Vector
 
+# Seeded so the prop's random details rebuild identically
+random.seed({script_seed})
+
 # AI-GENERATED CREATIVE PROP
 # Prop #{index + 1}: {prop_type}
 # AI Description: {ai_description}
@@ -5,20 +5,26 @@ Handles procedural texture generation, material properties, and texture caching
 """
 
 import hashlib
-from typing import Dict, Any
+import random
+from typing import Dict, Any, Optional
 from pathlib import Path
 import logging
+import numpy as np
 from PIL import Image, ImageDraw, ImageFilter, ImageEnhance
 
+from ..seeding import stream_rng
+
 class TextureGenerator:
     """
     Specialized texture generation module
     Creates unique procedural textures based on AI descriptions
     """
     
-    def __init__(self, output_dir: Path, ai_core):
+    def __init__(self, output_dir: Path, ai_core, seed: Optional[int] = None):
         self.output_dir = output_dir
         self.ai_core = ai_core
+        # Each texture draws from its own stream of this seed
+        self.seed = seed
         self.logger = logging.getLogger(__name__)
         
         # Texture-specific directories
@@ -45,7 +51,8 @@ class TextureGenerator:
         
         # Generate procedural texture
         try:
-            texture_image = self._create_procedural_texture(description, texture_type, theme)
+            rng = stream_rng(self.seed, "texture", texture_id)
+            texture_image = self._create_procedural_texture(description, texture_type, theme, rng)
             texture_image.save(texture_path)
             
             # Cache the result
@@ -57,7 +64,8 @@ class TextureGenerator:
             self.logger.warning(f"Texture generation failed: {e}")
             return self._create_fallback_texture(texture_type, theme, texture_path)
     
-    def _create_procedural_texture(self, description: str, texture_type: str, theme: str) -> Image.Image:
+    def _create_procedural_texture(self, description: str, texture_type: str, theme: str,
+                                   rng: random.Random) -> Image.Image:
         """Create procedural texture based on description"""
         size = (256, 256)
         
@@ -98,15 +106,15 @@ class TextureGenerator:
         
         # Add texture patterns based on type
         if texture_type == 'wood':
-            self._add_wood_grain(draw, size, colors, description)
+            self._add_wood_grain(draw, size, colors, description, rng)
         elif texture_type == 'stone':
-            self._add_stone_pattern(draw, size, colors, description)
+            self._add_stone_pattern(draw, size, colors, description, rng)
         elif texture_type == 'foliage':
-            self._add_foliage_pattern(draw, size, colors, description)
+            self._add_foliage_pattern(draw, size, colors, description, rng)
         elif texture_type == 'metal':
-            self._add_metal_pattern(draw, size, colors, description)
+            self._add_metal_pattern(draw, size, colors, description, rng)
         else:
-            self._add_generic_pattern(draw, size, colors, description)
+            self._add_generic_pattern(draw, size, colors, description, rng)
         
         # Apply filters for realism
         image = image.filter(ImageFilter.GaussianBlur(0.5))
@@ -116,62 +124,58 @@ class TextureGenerator:
         image = enhancer.enhance(1.2)
         
         # Add subtle noise for texture variety
-        image = self._add_noise(image, 0.1)
+        image = self._add_noise(image, 0.1, np.random.default_rng(rng.getrandbits(64)))
         
         return image
     
-    def _add_wood_grain(self, draw, size, colors, description):
+    def _add_wood_grain(self, draw, size, colors, description, rng):
         """Add wood grain pattern"""
-        import random
-        
         # Analyze description for grain intensity
         grain_intensity = 4 if 'rough' in description.lower() else 6
         grain_intensity = 2 if 'smooth' in description.lower() else grain_intensity
         
         for i in range(0, size[1], grain_intensity):
             # Vary the line color
-            color = colors[random.randint(0, len(colors) - 1)]
+            color = colors[rng.randint(0, len(colors) - 1)]
             # Add some waviness to wood grain
             points = []
             wave_amplitude = 8 if 'twisted' in description.lower() else 3
             
             for x in range(0, size[0], 8):
-                y_offset = random.randint(-wave_amplitude, wave_amplitude)
+                y_offset = rng.randint(-wave_amplitude, wave_amplitude)
                 points.extend([x, i + y_offset])
             if len(points) >= 4:
                 draw.line(points, fill=color, width=1)
         
         # Add knots if mentioned
         if 'gnarled' in description.lower() or 'knot' in description.lower():
-            for _ in range(random.randint(1, 3)):
-                x = random.randint(20, size[0] - 20)
-                y = random.randint(20, size[1] - 20)
-                radius = random.randint(8, 15)
+            for _ in range(rng.randint(1, 3)):
+                x = rng.randint(20, size[0] - 20)
+                y = rng.randint(20, size[1] - 20)
+                radius = rng.randint(8, 15)
                 draw.ellipse([x-radius, y-radius, x+radius, y+radius], 
                            fill=colors[2], outline=colors[0])
     
-    def _add_stone_pattern(self, draw, size, colors, description):
+    def _add_stone_pattern(self, draw, size, colors, description, rng):
         """Add stone pattern"""
-        import random
-        
         # Determine pattern density based on description
         density = size[0] // 3 if 'smooth' in description.lower() else size[0] // 4
         density = size[0] // 2 if 'rough' in description.lower() else density
         
         # Add random dots and small shapes for stone texture
         for _ in range(density):
-            x = random.randint(0, size[0] - 1)
-            y = random.randint(0, size[1] - 1)
-            color = colors[random.randint(0, len(colors) - 1)]
-            radius = random.randint(1, 4)
+            x = rng.randint(0, size[0] - 1)
+            y = rng.randint(0, size[1] - 1)
+            color = colors[rng.randint(0, len(colors) - 1)]
+            radius = rng.randint(1, 4)
             
             if 'crystalline' in description.lower():
                 # Angular crystals
                 points = []
                 for i in range(6):
                     angle = i * 60
-                    px = x + radius * random.uniform(0.7, 1.3) * (1 if i % 2 else 0.5)
-                    py = y + radius * random.uniform(0.7, 1.3) * (1 if i % 2 else 0.5)
+                    px = x + radius * rng.uniform(0.7, 1.3) * (1 if i % 2 else 0.5)
+                    py = y + radius * rng.uniform(0.7, 1.3) * (1 if i % 2 else 0.5)
                     points.append((px, py))
                 draw.polygon(points, fill=color)
             else:
@@ -179,30 +183,28 @@ class TextureGenerator:
         
         # Add cracks if mentioned
         if 'cracked' in description.lower() or 'weathered' in description.lower():
-            for _ in range(random.randint(2, 5)):
-                start_x = random.randint(0, size[0])
-                start_y = random.randint(0, size[1])
-                end_x = start_x + random.randint(-50, 50)
-                end_y = start_y + random.randint(-50, 50)
+            for _ in range(rng.randint(2, 5)):
+                start_x = rng.randint(0, size[0])
+                start_y = rng.randint(0, size[1])
+                end_x = start_x + rng.randint(-50, 50)
+                end_y = start_y + rng.randint(-50, 50)
                 draw.line([start_x, start_y, end_x, end_y], fill=colors[2], width=1)
     
-    def _add_foliage_pattern(self, draw, size, colors, description):
+    def _add_foliage_pattern(self, draw, size, colors, description, rng):
         """Add foliage pattern"""
-        import random
-        
         # Determine leaf pattern based on description
         leaf_count = size[0] // 6 if 'sparse' in description.lower() else size[0] // 8
         leaf_count = size[0] // 4 if 'dense' in description.lower() else leaf_count
         
         # Add leaf-like shapes
         for _ in range(leaf_count):
-            x = random.randint(0, size[0] - 10)
-            y = random.randint(0, size[1] - 10)
-            color = colors[random.randint(0, len(colors) - 1)]
+            x = rng.randint(0, size[0] - 10)
+            y = rng.randint(0, size[1] - 10)
+            color = colors[rng.randint(0, len(colors) - 1)]
             
             if 'needle' in description.lower():
                 # Needle-like leaves
-                draw.line([x, y, x + random.randint(3, 8), y + random.randint(-2, 2)], 
+                draw.line([x, y, x + rng.randint(3, 8), y + rng.randint(-2, 2)], 
                          fill=color, width=1)
             elif 'broad' in description.lower():
                 # Broad leaves
@@ -213,58 +215,51 @@ class TextureGenerator:
                 # Simple leaf shape
                 draw.ellipse([x, y, x + 6, y + 4], fill=color)
     
-    def _add_metal_pattern(self, draw, size, colors, description):
+    def _add_metal_pattern(self, draw, size, colors, description, rng):
         """Add metal pattern"""
-        import random
-        
         # Add scratches and wear patterns
         if 'scratched' in description.lower() or 'worn' in description.lower():
-            for _ in range(random.randint(10, 20)):
-                start_x = random.randint(0, size[0])
-                start_y = random.randint(0, size[1])
-                end_x = start_x + random.randint(-30, 30)
-                end_y = start_y + random.randint(-5, 5)
+            for _ in range(rng.randint(10, 20)):
+                start_x = rng.randint(0, size[0])
+                start_y = rng.randint(0, size[1])
+                end_x = start_x + rng.randint(-30, 30)
+                end_y = start_y + rng.randint(-5, 5)
                 draw.line([start_x, start_y, end_x, end_y], fill=colors[2], width=1)
         
         # Add rust spots if mentioned
         if 'rust' in description.lower() or 'weathered' in description.lower():
             rust_color = (139, 69, 19)  # Brown rust color
-            for _ in range(random.randint(5, 15)):
-                x = random.randint(0, size[0] - 10)
-                y = random.randint(0, size[1] - 10)
-                radius = random.randint(2, 8)
+            for _ in range(rng.randint(5, 15)):
+                x = rng.randint(0, size[0] - 10)
+                y = rng.randint(0, size[1] - 10)
+                radius = rng.randint(2, 8)
                 draw.ellipse([x - radius, y - radius, x + radius, y + radius], 
                            fill=rust_color)
         
         # Add polished highlights
         if 'polished' in description.lower() or 'shiny' in description.lower():
-            for _ in range(random.randint(3, 8)):
-                x = random.randint(0, size[0] - 20)
-                y = random.randint(0, size[1] - 5)
+            for _ in range(rng.randint(3, 8)):
+                x = rng.randint(0, size[0] - 20)
+                y = rng.randint(0, size[1] - 5)
                 draw.ellipse([x, y, x + 20, y + 5], fill=colors[0])
     
-    def _add_generic_pattern(self, draw, size, colors, description):
+    def _add_generic_pattern(self, draw, size, colors, description, rng):
         """Add generic pattern"""
-        import random
-        
         # Simple noise pattern
         density = size[0] // 2
         for _ in range(density):
-            x = random.randint(0, size[0] - 1)
-            y = random.randint(0, size[1] - 1)
-            color = colors[random.randint(0, len(colors) - 1)]
+            x = rng.randint(0, size[0] - 1)
+            y = rng.randint(0, size[1] - 1)
+            color = colors[rng.randint(0, len(colors) - 1)]
             draw.point([x, y], fill=color)
     
-    def _add_noise(self, image: Image.Image, intensity: float) -> Image.Image:
+    def _add_noise(self, image: Image.Image, intensity: float, noise_rng: np.random.Generator) -> Image.Image:
         """Add subtle noise to texture for variety"""
-        import random
-        import numpy as np
-        
         # Convert to numpy array
         img_array = np.array(image)
         
         # Generate noise
-        noise = np.random.normal(0, intensity * 255, img_array.shape).astype(np.int16)
+        noise = noise_rng.normal(0, intensity * 255, img_array.shape).astype(np.int16)
         
         # Add noise and clamp values
         noisy_array = np.clip(img_array.astype(np.int16) + noise, 0, 255).astype(np.uint8)
@@ -295,7 +290,9 @@ class TextureGenerator:
                                          material_type: str, theme: str) -> Dict[str, Any]:
         """Generate complete material definition"""
         # Get AI-generated material properties
-        material_props = await self.ai_core.generate_material_properties(material_type, theme)
+        material_props = await self.ai_core.generate_material_properties(
+            material_type, theme, stream_rng(self.seed, "material", material_name)
+        )
         
         # Create material definition
         material_def = {
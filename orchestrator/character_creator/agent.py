@@ -21,6 +21,9 @@ from datetime import datetime
 # Google ADK imports
 from google.adk.agents import Agent
 
+from ..seeding import new_seed, stream_rng
+from ..llm_client import get_llm_client
+
 # AI imports
 try:
     import google.generativeai as genai
@@ -110,7 +113,7 @@ class CreativeCharacterGenerator:
     - Tracks uniqueness to prevent duplicates
     """
     
-    def __init__(self, output_dir: str = "generated_characters"):
+    def __init__(self, output_dir: str = "generated_characters", seed: Optional[int] = None):
         # Initialize logging FIRST - this is critical to prevent AttributeError
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)
@@ -134,9 +137,15 @@ class CreativeCharacterGenerator:
         self.generated_backstories = set()
         self.uniqueness_tracker = {}
         
+        # Each character and relationship draws from its own stream of the seed
+        self.seed = new_seed() if seed is None else seed
+        
         # AI creativity boosters
         self.creativity_seeds = []
-        self.current_session = str(uuid.uuid4())[:8]
+        self.current_session = str(uuid.UUID(int=stream_rng(self.seed, "session").getrandbits(128)))[:8]
+        
+        # Model calls go through the shared client, which bounds concurrency and request rate
+        self.llm_client = get_llm_client()
         
         # Initialize enhanced AI (this may use the logger, so logger must be set up first)
         self._initialize_enhanced_ai()
@@ -202,9 +211,10 @@ class CreativeCharacterGenerator:
             # Generate with retries to ensure uniqueness
             max_attempts = 5
             for attempt in range(max_attempts):
+                rng = stream_rng(self.seed, "character", i, attempt)
                 try:
                     character = await self._generate_completely_unique_character(
-                        theme, buildings, i, characters, attempt
+                        theme, buildings, i, characters, attempt, rng
                     )
                     
                     # Check for uniqueness
@@ -220,7 +230,7 @@ class CreativeCharacterGenerator:
                     self.logger.warning(f"   ⚠️ Generation attempt {attempt + 1} failed: {e}")
                     if attempt == max_attempts - 1:
                         # Fallback to basic generation
-                        character = await self._generate_fallback_character(theme, buildings, i, characters)
+                        character = await self._generate_fallback_character(theme, buildings, i, characters, rng)
                         characters.append(character)
                         self.logger.info(f"   ⚠️ Used fallback generation for: {character.name}")
                         break
@@ -278,7 +288,7 @@ class CreativeCharacterGenerator:
     
     async def _generate_completely_unique_character(self, theme: str, buildings: List[Dict], 
                                                   index: int, existing_characters: List[CharacterProfile],
-                                                  attempt: int) -> CharacterProfile:
+                                                  attempt: int, rng: random.Random) -> CharacterProfile:
         """Generate a completely unique character using maximum AI creativity"""
         
         # Create uniqueness constraints
@@ -287,22 +297,22 @@ class CreativeCharacterGenerator:
         existing_roles = [char.role for char in existing_characters]
         
         # Generate unique character concept first
-        character_concept = await self._generate_character_concept(theme, existing_names, existing_traits, index, attempt)
+        character_concept = await self._generate_character_concept(theme, existing_names, existing_traits, index, attempt, rng)
         
         # Generate unique name with AI
-        character_name = await self._generate_ai_unique_name(theme, existing_names, character_concept, attempt)
+        character_name = await self._generate_ai_unique_name(theme, existing_names, character_concept, attempt, rng)
         
         # Generate unique role
-        character_role = await self._generate_ai_unique_role(theme, buildings, existing_roles, character_concept)
+        character_role = await self._generate_ai_unique_role(theme, buildings, existing_roles, character_concept, rng)
         
         # Generate AI personality (most important for uniqueness)
-        personality = await self._generate_ai_unique_personality(character_name, character_role, theme, character_concept, existing_traits)
+        personality = await self._generate_ai_unique_personality(character_name, character_role, theme, character_concept, existing_traits, rng)
         
         # Generate age with variation
-        age = await self._generate_varied_age(character_role, personality, attempt)
+        age = await self._generate_varied_age(character_role, personality, attempt, rng)
         
         # Generate AI-powered stats
-        stats = await self._generate_ai_stats(character_role, personality, age, existing_characters)
+        stats = await self._generate_ai_stats(character_role, personality, age, existing_characters, rng)
         
         # Generate AI backstory
         backstory = await self._generate_ai_backstory(character_name, personality, character_role, theme, age)
@@ -319,7 +329,7 @@ class CreativeCharacterGenerator:
         
         # Create unique character ID
         character_id = f"{character_name.lower().replace(' ', '_')}_{self.current_session}_{index}"
-        unique_id = str(uuid.uuid4())
+        unique_id = str(uuid.UUID(int=rng.getrandbits(128)))
         
         # Build the character profile
         character = CharacterProfile(
@@ -345,11 +355,12 @@ class CreativeCharacterGenerator:
         return character
     
     async def _generate_character_concept(self, theme: str, existing_names: List[str], 
-                                        existing_traits: List[str], index: int, attempt: int) -> str:
+                                        existing_traits: List[str], index: int, attempt: int,
+                                        rng: random.Random) -> str:
         """Generate a unique character concept using AI"""
         if not AI_AVAILABLE:
             concepts = ["warrior", "merchant", "scholar", "craftsperson", "healer", "explorer", "artist", "mystic"]
-            return random.choice(concepts)
+            return rng.choice(concepts)
         
         try:
             constraints = ""
@@ -370,10 +381,10 @@ class CreativeCharacterGenerator:
             return f"unique_{theme}_character_{index}_{attempt}"
     
     async def _generate_ai_unique_name(self, theme: str, existing_names: List[str], 
-                                     concept: str, attempt: int) -> str:
+                                     concept: str, attempt: int, rng: random.Random) -> str:
         """Generate unique character name with AI"""
         if not AI_AVAILABLE:
-            return self._generate_fallback_name(theme, existing_names, attempt)
+            return self._generate_fallback_name(theme, existing_names, attempt, rng)
         
         try:
             constraints = f"Must be completely different from: {', '.join(existing_names[:5])}" if existing_names else ""
@@ -387,12 +398,12 @@ class CreativeCharacterGenerator:
             if name and name.strip() and name.strip() not in existing_names:
                 return name.strip().split('\n')[0][:30]
             else:
-                return self._generate_fallback_name(theme, existing_names, attempt)
+                return self._generate_fallback_name(theme, existing_names, attempt, rng)
         except Exception as e:
             self.logger.warning(f"AI name generation failed: {e}")
-            return self._generate_fallback_name(theme, existing_names, attempt)
+            return self._generate_fallback_name(theme, existing_names, attempt, rng)
     
-    def _generate_fallback_name(self, theme: str, existing_names: List[str], attempt: int) -> str:
+    def _generate_fallback_name(self, theme: str, existing_names: List[str], attempt: int, rng: random.Random) -> str:
         """Generate fallback name when AI fails"""
         prefixes = {
             "medieval": ["Sir", "Lady", "Brother", "Sister", "Master"],
@@ -409,20 +420,20 @@ class CreativeCharacterGenerator:
         }
         
         theme_key = theme if theme in prefixes else "medieval"
-        prefix = random.choice(prefixes[theme_key])
-        name = random.choice(names[theme_key])
+        prefix = rng.choice(prefixes[theme_key])
+        name = rng.choice(names[theme_key])
         
         full_name = f"{prefix} {name}"
         if full_name in existing_names:
-            full_name = f"{name} {random.randint(100, 999)}"
+            full_name = f"{name} {rng.randint(100, 999)}"
         
         return full_name
     
     async def _generate_ai_unique_role(self, theme: str, buildings: List[Dict], 
-                                     existing_roles: List[str], concept: str) -> str:
+                                     existing_roles: List[str], concept: str, rng: random.Random) -> str:
         """Generate unique character role with AI"""
         if not AI_AVAILABLE:
-            return self._generate_fallback_role(theme, buildings, existing_roles)
+            return self._generate_fallback_role(theme, buildings, existing_roles, rng)
         
         try:
             building_types = [b.get('type', 'unknown') for b in buildings]
@@ -438,12 +449,13 @@ class CreativeCharacterGenerator:
             if role and role.strip():
                 return role.strip().split('\n')[0][:50]
             else:
-                return self._generate_fallback_role(theme, buildings, existing_roles)
+                return self._generate_fallback_role(theme, buildings, existing_roles, rng)
         except Exception as e:
             self.logger.warning(f"AI role generation failed: {e}")
-            return self._generate_fallback_role(theme, buildings, existing_roles)
+            return self._generate_fallback_role(theme, buildings, existing_roles, rng)
     
-    def _generate_fallback_role(self, theme: str, buildings: List[Dict], existing_roles: List[str]) -> str:
+    def _generate_fallback_role(self, theme: str, buildings: List[Dict], existing_roles: List[str],
+                                rng: random.Random) -> str:
         """Generate fallback role when AI fails"""
         building_roles = {
             "tavern": ["Innkeeper", "Bartender", "Bard", "Bouncer"],
@@ -476,15 +488,16 @@ class CreativeCharacterGenerator:
         available_roles = [role for role in available_roles if role not in existing_roles]
         
         if available_roles:
-            return random.choice(available_roles)
+            return rng.choice(available_roles)
         else:
             return f"Unique {theme} Specialist"
     
     async def _generate_ai_unique_personality(self, name: str, role: str, theme: str, 
-                                            concept: str, existing_traits: List[str]) -> CharacterPersonality:
+                                            concept: str, existing_traits: List[str],
+                                            rng: random.Random) -> CharacterPersonality:
         """Generate unique personality with AI"""
         if not AI_AVAILABLE:
-            return self._generate_fallback_personality(existing_traits)
+            return self._generate_fallback_personality(existing_traits, rng)
         
         try:
             constraints = f"Avoid these existing primary traits: {', '.join(existing_traits[:3])}" if existing_traits else ""
@@ -512,11 +525,11 @@ class CreativeCharacterGenerator:
             if response:
                 return self._parse_personality_response(response)
             else:
-                return self._generate_fallback_personality(existing_traits)
+                return self._generate_fallback_personality(existing_traits, rng)
                 
         except Exception as e:
             self.logger.warning(f"AI personality generation failed: {e}")
-            return self._generate_fallback_personality(existing_traits)
+            return self._generate_fallback_personality(existing_traits, rng)
     
     def _parse_personality_response(self, response: str) -> CharacterPersonality:
         """Parse AI personality response into structured data"""
@@ -543,7 +556,7 @@ class CreativeCharacterGenerator:
             life_goal=personality_data.get('life_goal', 'To make a difference')
         )
     
-    def _generate_fallback_personality(self, existing_traits: List[str]) -> CharacterPersonality:
+    def _generate_fallback_personality(self, existing_traits: List[str], rng: random.Random) -> CharacterPersonality:
         """Generate fallback personality when AI fails"""
         primary_traits = ["Brave", "Clever", "Compassionate", "Determined", "Eccentric", 
                          "Fierce", "Gentle", "Honest", "Inventive", "Jovial"]
@@ -561,11 +574,11 @@ class CreativeCharacterGenerator:
             available_traits = primary_traits
         
         return CharacterPersonality(
-            primary_trait=random.choice(available_traits),
-            secondary_trait=random.choice(secondary_traits),
-            motivation=random.choice(motivations),
-            fear=random.choice(fears),
-            quirk=random.choice(quirks),
+            primary_trait=rng.choice(available_traits),
+            secondary_trait=rng.choice(secondary_traits),
+            motivation=rng.choice(motivations),
+            fear=rng.choice(fears),
+            quirk=rng.choice(quirks),
             speech_pattern="Speaks with confidence",
             alignment="Neutral Good",
             mood="Generally positive",
@@ -573,7 +586,8 @@ class CreativeCharacterGenerator:
             life_goal="To live meaningfully"
         )
     
-    async def _generate_varied_age(self, role: str, personality: CharacterPersonality, attempt: int) -> int:
+    async def _generate_varied_age(self, role: str, personality: CharacterPersonality, attempt: int,
+                                   rng: random.Random) -> int:
         """Generate age with variation based on role and personality"""
         base_ages = {
             "apprentice": 18, "student": 20, "guard": 25, "merchant": 35,
@@ -587,13 +601,14 @@ class CreativeCharacterGenerator:
                 break
         
         # Add variation based on personality and attempt
-        variation = random.randint(-8, 12) + (attempt * 3)
+        variation = rng.randint(-8, 12) + (attempt * 3)
         final_age = max(18, base_age + variation)
         
         return final_age
     
     async def _generate_ai_stats(self, role: str, personality: CharacterPersonality, 
-                                age: int, existing_characters: List[CharacterProfile]) -> CharacterStats:
+                                age: int, existing_characters: List[CharacterProfile],
+                                rng: random.Random) -> CharacterStats:
         """Generate AI-powered character stats"""
         # Base stats on role
         role_stats = {
@@ -632,7 +647,7 @@ class CreativeCharacterGenerator:
         for stat in base_stats:
             base_stats[stat] = max(8, min(18, base_stats[stat]))
         
-        level = random.randint(1, 10)
+        level = rng.randint(1, 10)
         health = base_stats["constitution"] * 5 + level * 3
         
         return CharacterStats(
@@ -867,7 +882,8 @@ class CreativeCharacterGenerator:
         for i, char1 in enumerate(characters):
             for j, char2 in enumerate(characters[i + 1:], i + 1):
                 # Generate relationship between char1 and char2
-                relationship = await self._generate_single_relationship(char1, char2, theme)
+                rng = stream_rng(self.seed, "relationship", i, j)
+                relationship = await self._generate_single_relationship(char1, char2, theme, rng)
                 
                 if relationship:
                     # Add relationship to both characters
@@ -886,10 +902,11 @@ class CreativeCharacterGenerator:
         return characters
     
     async def _generate_single_relationship(self, char1: CharacterProfile, 
-                                          char2: CharacterProfile, theme: str) -> Optional[CharacterRelationship]:
+                                          char2: CharacterProfile, theme: str,
+                                          rng: random.Random) -> Optional[CharacterRelationship]:
         """Generate a single relationship between two characters"""
         if not AI_AVAILABLE:
-            return self._generate_fallback_relationship(char1, char2)
+            return self._generate_fallback_relationship(char1, char2, rng)
         
         try:
             relationship_prompt = f"""
@@ -908,11 +925,11 @@ class CreativeCharacterGenerator:
             if response:
                 return self._parse_relationship_response(response, char2.name)
             else:
-                return self._generate_fallback_relationship(char1, char2)
+                return self._generate_fallback_relationship(char1, char2, rng)
                 
         except Exception as e:
             self.logger.warning(f"AI relationship generation failed: {e}")
-            return self._generate_fallback_relationship(char1, char2)
+            return self._generate_fallback_relationship(char1, char2, rng)
     
     def _parse_relationship_response(self, response: str, target_name: str) -> CharacterRelationship:
         """Parse AI relationship response"""
@@ -943,22 +960,22 @@ class CreativeCharacterGenerator:
         )
     
     def _generate_fallback_relationship(self, char1: CharacterProfile, 
-                                      char2: CharacterProfile) -> CharacterRelationship:
+                                      char2: CharacterProfile, rng: random.Random) -> CharacterRelationship:
         """Generate fallback relationship when AI fails"""
         relationship_types = ["Friend", "Acquaintance", "Rival", "Ally", "Colleague", "Neighbor"]
         
         # Base relationship type on roles
         if char1.role == char2.role:
-            rel_type = random.choice(["Colleague", "Rival", "Friend"])
+            rel_type = rng.choice(["Colleague", "Rival", "Friend"])
         elif char1.location == char2.location:
-            rel_type = random.choice(["Neighbor", "Acquaintance", "Friend"])
+            rel_type = rng.choice(["Neighbor", "Acquaintance", "Friend"])
         else:
-            rel_type = random.choice(relationship_types)
+            rel_type = rng.choice(relationship_types)
         
         return CharacterRelationship(
             target_character=char2.name,
             relationship_type=rel_type,
-            relationship_strength=random.randint(3, 8),
+            relationship_strength=rng.randint(3, 8),
             history=f"They know each other through their work in town",
             current_status="Neutral"
         )
@@ -1240,13 +1257,15 @@ class CreativeCharacterGenerator:
         characters = []
         
         for i in range(character_count):
+            rng = stream_rng(self.seed, "character", i)
+            
             # Generate basic character using fallback methods
-            character_name = self._generate_fallback_name(theme, [c.name for c in characters], i)
-            character_role = self._generate_fallback_role(theme, buildings, [c.role for c in characters])
-            personality = self._generate_fallback_personality([c.personality.primary_trait for c in characters])
+            character_name = self._generate_fallback_name(theme, [c.name for c in characters], i, rng)
+            character_role = self._generate_fallback_role(theme, buildings, [c.role for c in characters], rng)
+            personality = self._generate_fallback_personality([c.personality.primary_trait for c in characters], rng)
             
-            age = random.randint(20, 60)
-            stats = await self._generate_ai_stats(character_role, personality, age, characters)
+            age = rng.randint(20, 60)
+            stats = await self._generate_ai_stats(character_role, personality, age, characters, rng)
             location = self._assign_unique_location(character_role, buildings, characters)
             inventory = self._generate_fallback_inventory(character_role, theme)
             
@@ -1275,7 +1294,7 @@ class CreativeCharacterGenerator:
                 age=age,
                 appearance=f"A {age}-year-old {character_role} with distinctive features.",
                 voice_description=personality.speech_pattern,
-                unique_id=str(uuid.uuid4())
+                unique_id=str(uuid.UUID(int=rng.getrandbits(128)))
             )
             
             characters.append(character)
@@ -1284,8 +1303,9 @@ class CreativeCharacterGenerator:
         # Add basic relationships
         for i, char1 in enumerate(characters):
             for j, char2 in enumerate(characters[i + 1:], i + 1):
-                if random.random() < 0.3:  # 30% chance of relationship
-                    relationship = self._generate_fallback_relationship(char1, char2)
+                rng = stream_rng(self.seed, "relationship", i, j)
+                if rng.random() < 0.3:  # 30% chance of relationship
+                    relationship = self._generate_fallback_relationship(char1, char2, rng)
                     char1.relationships.append(relationship)
                     
                     reciprocal = CharacterRelationship(
@@ -1311,14 +1331,15 @@ class CreativeCharacterGenerator:
         }
     
     async def _generate_fallback_character(self, theme: str, buildings: List[Dict], 
-                                         index: int, existing_characters: List[CharacterProfile]) -> CharacterProfile:
+                                         index: int, existing_characters: List[CharacterProfile],
+                                         rng: random.Random) -> CharacterProfile:
         """Generate a single fallback character"""
-        character_name = self._generate_fallback_name(theme, [c.name for c in existing_characters], index)
-        character_role = self._generate_fallback_role(theme, buildings, [c.role for c in existing_characters])
-        personality = self._generate_fallback_personality([c.personality.primary_trait for c in existing_characters])
+        character_name = self._generate_fallback_name(theme, [c.name for c in existing_characters], index, rng)
+        character_role = self._generate_fallback_role(theme, buildings, [c.role for c in existing_characters], rng)
+        personality = self._generate_fallback_personality([c.personality.primary_trait for c in existing_characters], rng)
         
-        age = random.randint(20, 60)
-        stats = await self._generate_ai_stats(character_role, personality, age, existing_characters)
+        age = rng.randint(20, 60)
+        stats = await self._generate_ai_stats(character_role, personality, age, existing_characters, rng)
         location = self._assign_unique_location(character_role, buildings, existing_characters)
         inventory = self._generate_fallback_inventory(character_role, theme)
         
@@ -1341,7 +1362,7 @@ class CreativeCharacterGenerator:
             age=age,
             appearance=f"A distinctive {age}-year-old {character_role}.",
             voice_description=personality.speech_pattern,
-            unique_id=str(uuid.uuid4())
+            unique_id=str(uuid.UUID(int=rng.getrandbits(128)))
         )
     
     async def _call_creative_ai(self, prompt: str, temperature: float = 1.0) -> Optional[str]:
@@ -1362,8 +1383,7 @@ class CreativeCharacterGenerator:
                 max_output_tokens=800,
             )
             
-            response = self.gemini_model.generate_content(enhanced_prompt, generation_config=generation_config)
-            return response.text
+            return await self.llm_client.generate(self.gemini_model, enhanced_prompt, generation_config=generation_config)
         except Exception as e:
             self.logger.warning(f"Creative AI call failed: {e}")
             return None
@@ -1401,9 +1421,10 @@ class CreativeCharacterGenerator:
         }
 
 # ADK Agent Functions for integration
-async def generate_characters_for_world(world_spec: Dict[str, Any], character_count: int = 5) -> Dict[str, Any]:
+async def generate_characters_for_world(world_spec: Dict[str, Any], character_count: int = 5,
+                                        seed: Optional[int] = None) -> Dict[str, Any]:
     """Generate truly unique characters - main entry point"""
-    generator = CreativeCharacterGenerator()
+    generator = CreativeCharacterGenerator(seed=seed)
     return await generator.generate_unique_characters(world_spec, character_count)
 
 async def get_character_creator_status() -> Dict[str, Any]:
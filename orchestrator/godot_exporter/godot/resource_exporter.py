@@ -6,6 +6,7 @@ Handles export of data files, assets, and Godot resources with proper syntax
 
 import json
 import logging
+import math
 import shutil
 from pathlib import Path
 from typing import Dict, Any, List
@@ -117,6 +118,11 @@ class GodotResourceExporter:
             copied_files = await self._copy_pipeline_assets(assets)
             asset_files.extend(copied_files)
         
+        # Props generated as archetypes arrive as instance lists, one MultiMesh per archetype
+        if assets and assets.get('prop_instances'):
+            instances_file = await self._export_prop_instances(assets)
+            asset_files.append(instances_file)
+        
         self.logger.info(f"   ✅ Created {len(asset_files)} asset files")
         return asset_files
     
@@ -176,6 +182,52 @@ class GodotResourceExporter:
         
         return "game_config.json"
     
+    async def _export_prop_instances(self, assets: Dict[str, Any]) -> str:
+        """Export prop instances grouped by archetype, ready to fill a MultiMeshInstance3D each"""
+        scripts = {prop.get('id'): prop.get('script_path') for prop in assets.get('props', [])}
+        groups = {}
+        
+        for instance in assets['prop_instances']:
+            archetype = instance.get('archetype', 'unknown')
+            group = groups.setdefault(archetype, {
+                "type": instance.get('type', 'rock'),
+                "script_path": scripts.get(archetype),
+                "ids": [],
+                "transforms": [],
+                "colors": [],
+                "seeds": []
+            })
+            position = instance.get('position', {'x': 0, 'y': 0, 'z': 0})
+            scale = instance.get('scale', 1.0)
+            rotation = math.radians(instance.get('rotation', 0.0))
+            cos_r, sin_r = math.cos(rotation), math.sin(rotation)
+            
+            # Same Transform3D layout as the scene builder: world x/y map to Godot x/z and elevation to y
+            group["ids"].append(instance.get('id'))
+            group["transforms"].append([
+                cos_r * scale, 0, sin_r * scale, 0, scale, 0, -sin_r * scale, 0, cos_r * scale,
+                position.get('x', 0), position.get('z', 0), position.get('y', 0)
+            ])
+            group["colors"].append(list(instance.get('tint', [1.0, 1.0, 1.0])) + [1.0])
+            group["seeds"].append(instance.get('seed', 0))
+        
+        for group in groups.values():
+            group["instance_count"] = len(group["ids"])
+        
+        instances_data = {
+            "note": "Set MultiMesh.instance_count, then set_instance_transform and set_instance_color per entry",
+            "multimesh": {"transform_format": "TRANSFORM_3D", "use_colors": True},
+            "transform_layout": "basis rows then origin, as written in .tscn Transform3D(...)",
+            "archetypes": groups
+        }
+        
+        instances_file = self.data_dir / "prop_instances.json"
+        with open(instances_file, 'w', encoding='utf-8') as f:
+            json.dump(instances_data, f, indent=2)
+        
+        self.logger.info(f"   🌳 Exported {len(assets['prop_instances'])} prop instances of {len(groups)} archetypes")
+        return "prop_instances.json"
+    
     async def _create_basic_meshes(self) -> List[str]:
         """Create basic mesh resources for buildings and objects"""
         mesh_files = []
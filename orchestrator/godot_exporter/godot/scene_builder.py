@@ -10,6 +10,11 @@ import math
 from pathlib import Path
 from typing import Dict, Any, List
 
+import numpy as np
+
+from ...world_designer.core.data_types import TERRAIN_NAMES
+from ...world_designer.core.terrain_store import open_terrain
+
 class GodotSceneBuilder:
     """Fixed Godot scene builder with proper SubResource ID management"""
     
@@ -94,6 +99,12 @@ class GodotSceneBuilder:
         
         # Generate all SubResources with proper IDs
         sub_resources_data = self._generate_all_subresources(buildings, natural_features)
+        
+        # Large worlds keep terrain on disk; build ground from it one tile at a time
+        terrain_chunks_section = ""
+        if world_spec.get('terrain_ref'):
+            terrain_chunks_section = self._create_terrain_chunks_section(world_spec, sub_resources_data)
+        
         total_subresources = len(sub_resources_data['ids'])
         total_load_steps = total_ext_resources + total_subresources
         
@@ -127,7 +138,7 @@ mesh = SubResource("{sub_resources_data['ground_mesh_id']}")
 [node name="GroundCollision" type="CollisionShape3D" parent="Environment/Ground"]
 shape = SubResource("{sub_resources_data['ground_shape_id']}")
 
-{self._create_player_node_with_camera(sub_resources_data)}
+{terrain_chunks_section}{self._create_player_node_with_camera(sub_resources_data)}
 
 [node name="Buildings" type="Node3D" parent="."]
 
@@ -368,6 +379,51 @@ metallic = 0.0
             'environmental_resources': environmental_resources
         }
     
+    def _create_terrain_chunks_section(self, world_spec: Dict[str, Any], sub_resources_data: Dict) -> str:
+        """Create one ground mesh per terrain tile, colored by the tile's dominant terrain"""
+        terrain = open_terrain(world_spec)
+        if not terrain:
+            return ""
+        
+        mesh_ids = {}
+        material_ids = {}
+        section = '[node name="TerrainChunks" type="Node3D" parent="Environment/Ground"]\n\n'
+        
+        for x0, y0, codes in terrain.iter_tiles():
+            tile_height, tile_width = codes.shape
+            dominant = TERRAIN_NAMES[int(np.bincount(codes.ravel()).argmax())]
+            
+            # Share meshes between equally sized tiles and materials between terrain types
+            if (tile_width, tile_height) not in mesh_ids:
+                mesh_id = self._get_next_subresource_id("PlaneMesh")
+                mesh_ids[(tile_width, tile_height)] = mesh_id
+                sub_resources_data['ids'].append(mesh_id)
+                sub_resources_data['content'] += f'''[sub_resource type="PlaneMesh" id="{mesh_id}"]
+size = Vector2({tile_width}, {tile_height})
+
+'''
+            if dominant not in material_ids:
+                material_id = self._get_next_subresource_id("StandardMaterial3D")
+                material_ids[dominant] = material_id
+                sub_resources_data['ids'].append(material_id)
+                sub_resources_data['content'] += f'''[sub_resource type="StandardMaterial3D" id="{material_id}"]
+albedo_color = Color{self._get_terrain_color(dominant)}
+roughness = 1.0
+metallic = 0.0
+
+'''
+
+            center_x = x0 + tile_width / 2
+            center_z = y0 + tile_height / 2
+            section += f'''[node name="Chunk_{x0}_{y0}" type="MeshInstance3D" parent="Environment/Ground/TerrainChunks"]
+transform = Transform3D(1, 0, 0, 0, 1, 0, 0, 0, 1, {center_x}, 0.01, {center_z})
+mesh = SubResource("{mesh_ids[(tile_width, tile_height)]}")
+surface_material_override/0 = SubResource("{material_ids[dominant]}")
+
+'''
+
+        return section
+    
     def _create_environmental_props_section(self, natural_features: List[Dict], sub_resources_data: Dict) -> str:
         """Create environmental props section with proper SubResource references"""
         if not natural_features:
@@ -643,6 +699,19 @@ shape = SubResource("{player_shape_id}")
         }
         return colors.get(building_type, colors['generic'])
     
+    def _get_terrain_color(self, terrain_type: str) -> str:
+        """Get color for terrain type"""
+        colors = {
+            'grass': '(0.13, 0.55, 0.13, 1)',
+            'dirt': '(0.55, 0.27, 0.07, 1)',
+            'stone': '(0.41, 0.41, 0.41, 1)',
+            'water': '(0.27, 0.51, 0.71, 1)',
+            'sand': '(0.96, 0.64, 0.38, 1)',
+            'forest': '(0.0, 0.39, 0.0, 1)',
+            'mountain': '(0.5, 0.5, 0.5, 1)'
+        }
+        return colors.get(terrain_type, '(0.4, 0.6, 0.3, 1)')
+    
     def _sanitize_node_name(self, name: str, fallback: str) -> str:
         """Sanitize node names for Godot"""
         if not name or not isinstance(name, str):
@@ -0,0 +1,161 @@
+"""
+SHARED LLM CLIENT
+Non-blocking, rate-limited model calls shared by every agent in the process
+
+The Gemini SDK's generate_content blocks, so awaiting it directly stalls the
+event loop and serializes the whole pipeline. LLMClient runs each call on a
+dedicated thread pool, caps the number of calls in flight with a semaphore,
+and paces requests with a token bucket so bursts of concurrent callers stay
+under the API's rate limit. A call's timeout starts once it is actually running and is
+also handed to SDK versions that accept request_options, so a hung request
+gives its worker thread back.
+"""
+
+import asyncio
+import inspect
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+# Requests in flight at once across all agents
+DEFAULT_MAX_CONCURRENCY = int(os.getenv('LLM_MAX_CONCURRENCY', '8'))
+
+# Sustained requests per second, and how many may be sent back to back after an idle spell
+DEFAULT_REQUESTS_PER_SECOND = float(os.getenv('LLM_REQUESTS_PER_SECOND', '4'))
+DEFAULT_BURST = int(os.getenv('LLM_BURST', '8'))
+
+# Seconds before a single call is abandoned
+DEFAULT_TIMEOUT = float(os.getenv('LLM_TIMEOUT', '60'))
+
+# Worker threads per concurrent call; the spares run new calls while abandoned ones wind down
+EXECUTOR_HEADROOM = 2
+
+class TokenBucket:
+    """
+    Token bucket pacing requests to rate per second with bursts of up to capacity.
+
+    Callers reserve a token up front and sleep until it is due, so waiting never
+    holds a lock and the bucket works from any thread or event loop.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = max(capacity, 1)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token; returns how many seconds to wait before using it"""
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return max(-self._tokens / self.rate, 0.0)
+
+    async def acquire(self):
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+class LLMClient:
+    """
+    Bounded-concurrency, rate-limited runner for model calls.
+
+    generate() takes any model object with generate_content, so agents keep their
+    own model configuration and share only the limits. The SDK's
+    generate_content_async is not used: its gRPC client stays bound to the first
+    event loop it runs on, and agents run under several asyncio.run calls.
+    Errors propagate to the caller.
+    """
+
+    def __init__(self, max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND, burst: int = DEFAULT_BURST,
+                 timeout: Optional[float] = DEFAULT_TIMEOUT):
+        self.max_concurrency = max(max_concurrency, 1)
+        self.timeout = timeout
+        self.bucket = TokenBucket(requests_per_second, burst)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency * EXECUTOR_HEADROOM,
+                                            thread_name_prefix='llm')
+        # asyncio semaphores belong to one event loop; agents may run under several asyncio.run calls
+        self._semaphores: Dict[asyncio.AbstractEventLoop, asyncio.Semaphore] = {}
+        self._lock = threading.Lock()
+        self.stats = {'requests': 0, 'failures': 0, 'in_flight': 0, 'peak_in_flight': 0}
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            for stale in [other for other in self._semaphores if other.is_closed()]:
+                del self._semaphores[stale]
+            if loop not in self._semaphores:
+                self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+            return self._semaphores[loop]
+
+    async def generate(self, model: Any, prompt: str, **kwargs) -> str:
+        """Run model.generate_content(prompt, **kwargs) without blocking the loop; returns the response text"""
+        async with self._semaphore():
+            await self.bucket.acquire()
+            self._track(1)
+            try:
+                response = await self._dispatch(model, prompt, kwargs)
+                return response.text
+            except Exception:
+                with self._lock:
+                    self.stats['failures'] += 1
+                raise
+            finally:
+                self._track(-1)
+
+    async def _dispatch(self, model: Any, prompt: str, kwargs: Dict[str, Any]):
+        if self.timeout is not None and _accepts_request_options(model):
+            # Let the SDK abandon the request itself, so a hung call does not keep its thread
+            kwargs = {**kwargs, 'request_options': {'timeout': self.timeout, **kwargs.get('request_options', {})}}
+        loop = asyncio.get_running_loop()
+        started = asyncio.Event()
+
+        def run():
+            loop.call_soon_threadsafe(started.set)
+            return model.generate_content(prompt, **kwargs)
+
+        # Time only the call itself, not the wait for a free worker thread
+        future = loop.run_in_executor(self._executor, run)
+        await started.wait()
+        return await asyncio.wait_for(future, self.timeout)
+
+    def _track(self, delta: int):
+        with self._lock:
+            if delta > 0:
+                self.stats['requests'] += 1
+            self.stats['in_flight'] += delta
+            self.stats['peak_in_flight'] = max(self.stats['peak_in_flight'], self.stats['in_flight'])
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            'max_concurrency': self.max_concurrency,
+            'requests_per_second': self.bucket.rate,
+            'burst': self.bucket.capacity,
+            **self.stats
+        }
+
+def _accepts_request_options(model: Any) -> bool:
+    """Older google-generativeai releases reject request_options; wait_for still times those calls out"""
+    try:
+        return 'request_options' in inspect.signature(model.generate_content).parameters
+    except (TypeError, ValueError):
+        return False
+
+_shared_client: Optional[LLMClient] = None
+_shared_lock = threading.Lock()
+
+def get_llm_client() -> LLMClient:
+    """The process-wide client, so every agent draws from the same concurrency and rate budget"""
+    global _shared_client
+    with _shared_lock:
+        if _shared_client is None:
+            _shared_client = LLMClient()
+        return _shared_client
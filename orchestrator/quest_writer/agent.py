@@ -17,6 +17,8 @@ import logging
 # Google ADK imports
 from google.adk.agents import Agent
 
+from ..llm_client import get_llm_client
+
 # AI imports
 try:
     import google.generativeai as genai
@@ -87,6 +89,9 @@ class AIQuestWriter:
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)
         
+        # Model calls go through the shared client, which bounds concurrency and request rate
+        self.llm_client = get_llm_client()
+        
         # Initialize AI AFTER logger is ready
         self._initialize_ai()
     
@@ -1031,8 +1036,7 @@ class AIQuestWriter:
             return None
         
         try:
-            response = self.gemini_model.generate_content(prompt)
-            return response.text
+            return await self.llm_client.generate(self.gemini_model, prompt)
         except Exception as e:
             self.logger.warning(f"Gemini API call failed: {e}")
             return None
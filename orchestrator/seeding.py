@@ -0,0 +1,40 @@
+"""
+PIPELINE SEEDING
+Seed helpers shared by every agent, so one pipeline seed reproduces a whole run
+
+Each agent and each stage inside it draws from its own stream, derived from the
+pipeline seed and a label path such as ("asset_generator", "props"). Streams are
+independent of each other and of the order in which they are requested.
+"""
+
+import hashlib
+import random
+import secrets
+from typing import Optional, Union
+
+_MASK64 = 0xFFFFFFFFFFFFFFFF
+
+def new_seed() -> int:
+    """Draw a fresh 63-bit seed from OS entropy"""
+    return secrets.randbits(63)
+
+def stream_key(seed: int, salt: int) -> int:
+    """Mix a seed and a salt into a 64-bit stream key"""
+    h = (seed * 0x9E3779B97F4A7C15 + salt * 0x165667B19E3779F9) & _MASK64
+    h = ((h ^ (h >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    h = ((h ^ (h >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return h ^ (h >> 31)
+
+def derive_seed(seed: int, *labels: Union[str, int]) -> int:
+    """
+    63-bit seed for the stream named by labels, e.g. (seed, "assets", "building", 3).
+
+    Labels are hashed with a fixed digest, so derived seeds are stable across runs and
+    processes and do not depend on the order in which streams are requested.
+    """
+    digest = hashlib.blake2b(repr(labels).encode("utf-8"), digest_size=8).digest()
+    return stream_key(seed, int.from_bytes(digest, "little")) & 0x7FFFFFFFFFFFFFFF
+
+def stream_rng(seed: Optional[int], *labels: Union[str, int]) -> random.Random:
+    """Independent random.Random for the named stream; unseeded when seed is None"""
+    return random.Random(None if seed is None else derive_seed(seed, *labels))
@@ -7,6 +7,7 @@ Handles copying and organizing 3D models, textures, and materials
 from typing import Dict, List, Any
 from pathlib import Path
 import logging
+import math
 import shutil
 
 from ..core.data_types import UnityGameObject, UnityComponent
@@ -51,9 +52,59 @@ class AssetExporter:
         )
         asset_objects.append(asset_manager)
         
+        # Props generated as archetypes arrive as instance lists, drawn with GPU instancing
+        if assets and assets.get('prop_instances'):
+            asset_objects.append(self._create_prop_instancers(assets))
+        
         self.logger.info(f"   ✅ Exported asset system")
         return asset_objects
     
+    def _create_prop_instancers(self, assets: Dict[str, Any]) -> UnityGameObject:
+        """One PropInstancer per archetype, holding the TRS, color and seed of each of its instances"""
+        scripts = {prop.get('id'): prop.get('script_path') for prop in assets.get('props', [])}
+        groups = {}
+        
+        for instance in assets['prop_instances']:
+            archetype = instance.get('archetype', 'unknown')
+            group = groups.setdefault(archetype, {
+                "archetype": archetype,
+                "propType": instance.get('type', 'rock'),
+                "sourceScript": scripts.get(archetype),
+                "positions": [],
+                "rotations": [],
+                "scales": [],
+                "colors": [],
+                "seeds": []
+            })
+            position = instance.get('position', {'x': 0, 'y': 0, 'z': 0})
+            scale = instance.get('scale', 1.0)
+            half_angle = math.radians(instance.get('rotation', 0.0)) / 2
+            
+            # Unity is y-up: world x/y map to x/z and elevation to y; rotation is a yaw quaternion (x, y, z, w)
+            group["positions"].append([position.get('x', 0), position.get('z', 0), position.get('y', 0)])
+            group["rotations"].append([0, math.sin(half_angle), 0, math.cos(half_angle)])
+            group["scales"].append([scale, scale, scale])
+            group["colors"].append(list(instance.get('tint', [1.0, 1.0, 1.0])) + [1.0])
+            group["seeds"].append(instance.get('seed', 0))
+        
+        instancers = []
+        for archetype, group in groups.items():
+            group["instanceCount"] = len(group["seeds"])
+            instancers.append(UnityGameObject(
+                name=f"Instances_{archetype}",
+                transform={"position": [0, 0, 0], "rotation": [0, 0, 0, 1], "scale": [1, 1, 1]},
+                components=[UnityComponent(component_type="PropInstancer", properties=group)],
+                children=[]
+            ))
+        
+        self.logger.info(f"   🌳 Exported {len(assets['prop_instances'])} prop instances of {len(groups)} archetypes")
+        return UnityGameObject(
+            name="PropInstances",
+            transform={"position": [0, 0, 0], "rotation": [0, 0, 0, 1], "scale": [1, 1, 1]},
+            components=[],
+            children=instancers
+        )
+    
     async def _copy_asset_files(self, assets: Dict[str, Any]):
         """Copy asset files to Unity project"""
         self.logger.info("📁 Copying asset files...")
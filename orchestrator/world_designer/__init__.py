@@ -4,7 +4,16 @@ World Designer - Modular game world generation system.
 
 from .main_designer import design_world_from_prompt, generate_world, get_status
 from .core.world_spec import WorldSpec
-from .core.data_types import TerrainType, WorldPosition
+from .core.world_changes import ChangeSet
+from .core.world_objects import Building, NaturalFeature, WorldPath, SpawnPoint, WorldObjects
+from .core.data_types import TerrainType, TerrainCode, WorldPosition
+from .core.terrain_grid import TerrainGrid
+from .core.terrain_store import ChunkedTerrain, open_terrain
+from .core.terrain_regions import TerrainRegion, find_terrain_regions
+from .core.region_index import RegionIndex, open_region_index
+from .core.world_store import CompactWorldSpec, save_world_spec, load_world_spec
+from .core.world_cache import WorldDesignCache
+from .analysis.prompt_analyzer import analyze_prompts
 from .analysis import * 
 __version__ = "1.0.0"
 __all__ = [
@@ -12,6 +21,25 @@ __all__ = [
     "generate_world", 
     "get_status",
     "WorldSpec",
+    "ChangeSet",
+    "Building",
+    "NaturalFeature",
+    "WorldPath",
+    "SpawnPoint",
+    "WorldObjects",
     "TerrainType",
+    "TerrainCode",
+    "TerrainGrid",
+    "ChunkedTerrain",
+    "open_terrain",
+    "TerrainRegion",
+    "find_terrain_regions",
+    "RegionIndex",
+    "open_region_index",
+    "CompactWorldSpec",
+    "save_world_spec",
+    "load_world_spec",
+    "WorldDesignCache",
+    "analyze_prompts",
     "WorldPosition"
 ]
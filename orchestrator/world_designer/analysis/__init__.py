@@ -2,6 +2,6 @@
 Prompt analysis and layout planning.
 """
 
-from .prompt_analyzer import _analyze_design_prompt
+from .prompt_analyzer import _analyze_design_prompt, analyze_prompts, KeywordHit
 
-__all__ = ["_analyze_design_prompt"]
\ No newline at end of file
+__all__ = ["_analyze_design_prompt", "analyze_prompts", "KeywordHit"]
\ No newline at end of file
@@ -2,8 +2,10 @@
 Prompt analysis and parsing functionality.
 """
 
+import copy
 import re
-from typing import Dict, Tuple
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 from ..utils.theme_configs import get_theme_defaults, get_theme_moods
 
 def _analyze_design_prompt(prompt: str, constraints):
@@ -12,6 +14,10 @@ def _analyze_design_prompt(prompt: str, constraints):
     # Parse prompt using keyword detection
     analysis = _parse_prompt_keywords(prompt)
     
+    # Explicit constraints override what the prompt implies
+    if constraints and constraints.get("size"):
+        analysis["size"] = tuple(constraints["size"])
+    
     # Add enhanced analysis
     analysis["environmental_story"] = _generate_environmental_story(analysis)
     analysis["layout_type"] = _determine_optimal_layout(analysis)
@@ -19,98 +25,204 @@ def _analyze_design_prompt(prompt: str, constraints):
     
     return analysis
 
+def analyze_prompts(prompts: Sequence[str], constraints: Optional[Dict[str, Any]] = None) -> List[Dict]:
+    """
+    Analyze many prompts at once for bulk generation jobs.
+    
+    Prompts that differ only in case and spacing are analyzed once; each
+    returned analysis is an independent copy.
+    """
+    analyses: Dict[str, Dict] = {}
+    results = []
+    for prompt in prompts:
+        key = " ".join(prompt.lower().split())
+        if key not in analyses:
+            analyses[key] = _analyze_design_prompt(prompt, constraints)
+        results.append(copy.deepcopy(analyses[key]))
+    return results
+
+# Keyword tables; within each table the first label with a hit wins
+THEME_KEYWORDS = {
+    "medieval": ["medieval", "castle", "knight", "blacksmith", "tavern"],
+    "spooky": ["spooky", "halloween", "ghost", "haunted", "scary", "dark"],
+    "halloween": ["halloween", "pumpkin", "witch", "skeleton", "zombie"],
+    "desert": ["desert", "oasis", "sand", "trading post", "merchant", "dune"],
+    "fantasy": ["fantasy", "magic", "wizard", "dragon", "elf", "dwarf"],
+    "modern": ["modern", "city", "urban", "contemporary"],
+    "sci-fi": ["sci-fi", "space", "futuristic", "cyber", "robot"]
+}
+
+SCALE_KEYWORDS = {
+    "outpost": ["outpost", "camp", "small settlement"],
+    "village": ["village", "hamlet", "small town"],
+    "town": ["town", "large village"],
+    "city": ["city", "large town", "metropolis"]
+}
+
+FEATURE_KEYWORDS = {
+    "house": ["house", "home", "residence", "dwelling"],
+    "shop": ["shop", "store", "merchant"],
+    "tavern": ["tavern", "inn", "pub", "bar"],
+    "church": ["church", "temple", "shrine", "cathedral"],
+    "blacksmith": ["blacksmith", "forge", "smithy"],
+    "market": ["market", "bazaar", "marketplace"],
+    "fountain": ["fountain", "well", "water feature"],
+    "tower": ["tower", "spire", "lookout"],
+    "wall": ["wall", "fortification", "defense"]
+}
+
+MOOD_KEYWORDS = {
+    "dark": ["dark", "gloomy", "ominous", "forbidding"],
+    "cheerful": ["bright", "cheerful", "happy", "welcoming"],
+    "mysterious": ["mysterious", "enigmatic", "hidden", "secret"],
+    "bustling": ["busy", "bustling", "active", "lively"]
+}
+
+# Nouns that a number in the prompt can count
+COUNT_KEYWORDS = {
+    "npc_count": ["npc", "character", "villager"],
+    "quest_count": ["quest", "storyline", "mission"]
+}
+
+NUMBER_WORDS = {
+    "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6,
+    "seven": 7, "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12
+}
+
+# A number binds to a count noun at most this many words after it, or failing that before it
+COUNT_WORDS_AFTER = 3
+COUNT_WORDS_BEFORE = 1
+
+@dataclass(frozen=True, slots=True)
+class KeywordHit:
+    """One keyword match: its category ("theme", "scale", ...), label, matched text and span"""
+    category: str
+    label: str
+    text: str
+    start: int
+    end: int
+
+def _keyword_pattern(keyword: str) -> str:
+    """Regex for a keyword with flexible spacing and an optional plural ending"""
+    words = [re.escape(word) for word in keyword.split()]
+    last = words[-1]
+    if re.fullmatch(r"\w*[^aeiou\W]y", last):
+        words[-1] = last[:-1] + "(?:y|ies)"
+    elif last[-1].isalpha():
+        words[-1] = last + "(?:e?s)?"
+    return r"\s+".join(words)
+
+def _compile_keyword_matcher():
+    """One alternation over every keyword, longest first, with each keyword in its own group"""
+    targets: Dict[str, List[Tuple[str, str]]] = {}
+    tables = {"theme": THEME_KEYWORDS, "scale": SCALE_KEYWORDS, "feature": FEATURE_KEYWORDS,
+              "mood": MOOD_KEYWORDS, "count": COUNT_KEYWORDS}
+    for category, table in tables.items():
+        for label, keywords in table.items():
+            for keyword in keywords:
+                targets.setdefault(keyword, []).append((category, label))
+    for word, value in NUMBER_WORDS.items():
+        targets.setdefault(word, []).append(("number", str(value)))
+    
+    keywords = sorted(targets, key=len, reverse=True)
+    groups = [f"(?P<k{i}>{_keyword_pattern(keyword)})" for i, keyword in enumerate(keywords)]
+    pattern = re.compile(r"(?<![\w-])(?:" + "|".join(groups) + r"|(?P<digits>\d+))(?![\w-])", re.IGNORECASE)
+    return pattern, [targets[keyword] for keyword in keywords]
+
+_KEYWORD_PATTERN, _KEYWORD_TARGETS = _compile_keyword_matcher()
+_WORD_PATTERN = re.compile(r"[\w-]+")
+_COUNT_LABEL_PATTERN = re.compile(r"\s*[:=]\s*")
+
+def _match_prompt_keywords(prompt: str) -> List[KeywordHit]:
+    """Every theme, scale, feature, mood, count-noun and number hit in the prompt, in one pass"""
+    hits = []
+    for match in _KEYWORD_PATTERN.finditer(prompt):
+        start, end = match.span()
+        if match.lastgroup == "digits":
+            hits.append(KeywordHit("number", match.group(), match.group(), start, end))
+            continue
+        for category, label in _KEYWORD_TARGETS[int(match.lastgroup[1:])]:
+            hits.append(KeywordHit(category, label, match.group(), start, end))
+    return hits
+
+def _first_label(hits: List[KeywordHit], category: str, table: Dict[str, List[str]]) -> Optional[str]:
+    """The earliest label in table order that has a hit"""
+    found = {hit.label for hit in hits if hit.category == category}
+    return next((label for label in table if label in found), None)
+
+def _bind_counts(prompt: str, hits: List[KeywordHit]) -> Dict[str, int]:
+    """
+    Bind each number to the nearest count noun, e.g. "5 NPCs and 3 quests" or "quests: 4".
+    
+    A number labelled by the noun just before it ("quests: 4") binds to that noun.
+    Otherwise it takes the first unclaimed noun within COUNT_WORDS_AFTER words after
+    it, then the nearest unclaimed noun within COUNT_WORDS_BEFORE words before it.
+    Another number in between blocks the binding.
+    """
+    terms = sorted((hit for hit in hits if hit.category in ("number", "count")), key=lambda hit: hit.start)
+    claimed = set()
+    counts = {}
+    
+    def words_between(a: KeywordHit, b: KeywordHit) -> int:
+        return len(_WORD_PATTERN.findall(prompt, a.end, b.start))
+    
+    for i, number in enumerate(terms):
+        if number.category != "number":
+            continue
+        noun = None
+        if i > 0 and terms[i - 1].category == "count" and terms[i - 1].start not in claimed and \
+                _COUNT_LABEL_PATTERN.fullmatch(prompt, terms[i - 1].end, number.start):
+            noun = terms[i - 1]
+        for later in terms[i + 1:] if noun is None else ():
+            if later.category == "number" or words_between(number, later) > COUNT_WORDS_AFTER:
+                break
+            if later.start not in claimed:
+                noun = later
+                break
+        if noun is None:
+            for earlier in reversed(terms[:i]):
+                if earlier.category == "number" or words_between(earlier, number) > COUNT_WORDS_BEFORE:
+                    break
+                if earlier.start not in claimed:
+                    noun = earlier
+                    break
+        if noun is not None and noun.label not in counts:
+            claimed.add(noun.start)
+            counts[noun.label] = int(number.label)
+    return counts
+
 def _parse_prompt_keywords(prompt: str):
     """Parse prompt using keyword detection and rules"""
-    prompt_lower = prompt.lower()
-    
-    # Theme detection
-    theme_keywords = {
-        "medieval": ["medieval", "castle", "knight", "blacksmith", "tavern"],
-        "spooky": ["spooky", "halloween", "ghost", "haunted", "scary", "dark"],
-        "halloween": ["halloween", "pumpkin", "witch", "skeleton", "zombie"],
-        "desert": ["desert", "oasis", "sand", "trading post", "merchant", "dune"],
-        "fantasy": ["fantasy", "magic", "wizard", "dragon", "elf", "dwarf"],
-        "modern": ["modern", "city", "urban", "contemporary"],
-        "sci-fi": ["sci-fi", "space", "futuristic", "cyber", "robot"]
-    }
-    
-    detected_theme = "medieval"  # default
-    for theme, keywords in theme_keywords.items():
-        if any(keyword in prompt_lower for keyword in keywords):
-            detected_theme = theme
-            break
-    
-    # Scale detection
-    scale_keywords = {
-        "outpost": ["outpost", "camp", "small settlement"],
-        "village": ["village", "hamlet", "small town"],
-        "town": ["town", "large village"],
-        "city": ["city", "large town", "metropolis"]
-    }
+    hits = _match_prompt_keywords(prompt)
     
-    detected_scale = "village"  # default
-    for scale, keywords in scale_keywords.items():
-        if any(keyword in prompt_lower for keyword in keywords):
-            detected_scale = scale
-            break
-    
-    # Feature extraction
-    building_keywords = {
-        "house": ["house", "home", "residence", "dwelling"],
-        "shop": ["shop", "store", "merchant"],
-        "tavern": ["tavern", "inn", "pub", "bar"],
-        "church": ["church", "temple", "shrine", "cathedral"],
-        "blacksmith": ["blacksmith", "forge", "smithy"],
-        "market": ["market", "bazaar", "marketplace"],
-        "fountain": ["fountain", "well", "water feature"],
-        "tower": ["tower", "spire", "lookout"],
-        "wall": ["wall", "fortification", "defense"]
-    }
+    detected_theme = _first_label(hits, "theme", THEME_KEYWORDS) or "medieval"
+    detected_scale = _first_label(hits, "scale", SCALE_KEYWORDS) or "village"
     
-    detected_features = []
-    for building, keywords in building_keywords.items():
-        if any(keyword in prompt_lower for keyword in keywords):
-            detected_features.append(building)
+    found_features = {hit.label for hit in hits if hit.category == "feature"}
+    detected_features = [feature for feature in FEATURE_KEYWORDS if feature in found_features]
     
     # If no specific features mentioned, add defaults based on theme
     if not detected_features:
         detected_features = get_theme_defaults(detected_theme)
     
-    # NPC and quest detection
-    npc_count = 5  # default
-    quest_count = 3  # default
-    
-    # Look for numbers in prompt
-    numbers = re.findall(r'\d+', prompt)
-    if numbers:
-        for i, num in enumerate(numbers):
-            if "npc" in prompt_lower or "character" in prompt_lower:
-                npc_count = int(num)
-            elif "quest" in prompt_lower:
-                quest_count = int(num)
+    # NPC and quest counts come from numbers next to those nouns
+    counts = _bind_counts(prompt, hits)
     
     return {
         "theme": detected_theme,
         "scope": detected_scale,
         "key_features": detected_features,
-        "npc_count": npc_count,
-        "quest_count": quest_count,
-        "mood": _infer_mood(detected_theme, prompt_lower),
+        "npc_count": counts.get("npc_count", 5),
+        "quest_count": counts.get("quest_count", 3),
+        "mood": _infer_mood(detected_theme, hits),
         "size": _calculate_size_from_scope(detected_scale)
     }
 
-def _infer_mood(theme: str, prompt_lower: str) -> str:
+def _infer_mood(theme: str, hits: List[KeywordHit]) -> str:
     """Infer mood from theme and prompt content"""
-    mood_keywords = {
-        "dark": ["dark", "gloomy", "ominous", "forbidding"],
-        "cheerful": ["bright", "cheerful", "happy", "welcoming"],
-        "mysterious": ["mysterious", "enigmatic", "hidden", "secret"],
-        "bustling": ["busy", "bustling", "active", "lively"]
-    }
-    
-    for mood, keywords in mood_keywords.items():
-        if any(keyword in prompt_lower for keyword in keywords):
-            return mood
+    mood = _first_label(hits, "mood", MOOD_KEYWORDS)
+    if mood:
+        return mood
     
     # Default moods by theme
     theme_moods = get_theme_moods()
@@ -0,0 +1,236 @@
+"""
+World designer benchmark: per-stage wall time, peak memory and object counts
+across map sizes, themes and layouts, with fixed seeds.
+
+Run as a module:
+    python -m orchestrator.world_designer.benchmark --output bench.json
+    python -m orchestrator.world_designer.benchmark --sizes 20 256 --compare bench.json
+
+Wall times are the best of --repeat untraced runs; peak memory comes from one
+extra run under tracemalloc, since tracing slows Python-heavy stages down.
+Progress and regression messages go to stderr, so without --output stdout
+carries only the results JSON.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .analysis.prompt_analyzer import _analyze_design_prompt
+from .core.world_cache import GENERATOR_VERSION
+from .core.world_objects import WorldObjects
+from .core.world_spec import WorldSpec
+from .generation.building_placer import _plan_building_placement
+from .generation.heightmap import _apply_elevation, _generate_heightmap
+from .generation.natural_features import _calculate_spawn_points, _place_natural_features
+from .generation.path_network import _generate_path_network
+from .generation.terrain_generator import _generate_terrain_map
+from ..seeding import stream_rng
+from .validation.design_validator import _validate_design
+from .visualization.viz_data_creator import _create_visualization_data
+
+DEFAULT_SIZES = (20, 64, 256, 1024, 2048)
+DEFAULT_THEMES = ("medieval", "spooky", "halloween", "desert", "fantasy")
+DEFAULT_SEED = 1234
+
+# Untraced runs per case; the fastest run of each stage is reported, along with the
+# spread between its fastest and slowest run
+DEFAULT_REPEAT = 3
+
+# Layout types and the settlement scope that produces each
+LAYOUT_SCOPES = {"linear": "outpost", "radial": "village", "grid": "town", "complex_grid": "city"}
+
+STAGES = ("terrain", "smoothing", "buildings", "paths", "features", "validation", "visualization")
+
+# A stage regresses when it is this much slower (or uses this much more memory) than the
+# baseline, and by more than the noise: the floor, or NOISE_SPREADS times the larger
+# run-to-run spread of the two results, whichever is bigger
+DEFAULT_THRESHOLD = 0.25
+TIME_NOISE_FLOOR = 0.005
+MEMORY_NOISE_FLOOR = 1 << 20
+NOISE_SPREADS = 2.0
+
+def _run_pipeline(theme: str, layout: str, size: int, seed: int, output_dir: str,
+                  timer: Callable[[str, Callable[[], Any]], Any]) -> Dict[str, int]:
+    """Run every stage of one world through timer(stage, fn); returns object counts"""
+    analysis = _analyze_design_prompt(f"a {theme} {LAYOUT_SCOPES[layout]}", {"size": (size, size)})
+    analysis["theme"], analysis["layout_type"] = theme, layout
+    dimensions = (size, size)
+    
+    terrain = timer("terrain", lambda: _generate_terrain_map(dimensions, theme, seed))
+    buildings = timer("buildings", lambda: WorldObjects(
+        _plan_building_placement(analysis, dimensions, terrain, stream_rng(seed, "buildings"))))
+    paths = timer("paths", lambda: _generate_path_network(buildings, dimensions, terrain))
+    natural_features, spawn_points = timer("features", lambda: (
+        _place_natural_features(analysis, terrain, buildings, paths, stream_rng(seed, "natural_features")),
+        _calculate_spawn_points(buildings, paths)))
+    timer("smoothing", lambda: _apply_elevation(_generate_heightmap(terrain, dimensions, seed, buildings),
+                                                buildings, paths, natural_features, spawn_points))
+    
+    world_spec = WorldSpec(
+        theme=theme, size=dimensions, terrain_map=terrain, buildings=buildings, paths=paths,
+        natural_features=natural_features, spawn_points=spawn_points,
+        boundaries={"min_x": 0, "max_x": size, "min_y": 0, "max_y": size},
+        metadata={"analysis": analysis, "layout_type": layout, "seed": seed}
+    )
+    timer("validation", lambda: _validate_design(world_spec))
+    timer("visualization", lambda: _create_visualization_data(world_spec, output_dir))
+    
+    return {
+        "tiles": size * size,
+        "buildings": len(world_spec.buildings),
+        "paths": len(world_spec.paths),
+        "natural_features": len(world_spec.natural_features),
+        "spawn_points": len(world_spec.spawn_points)
+    }
+
+def benchmark_case(theme: str, layout: str, size: int, seed: int = DEFAULT_SEED, repeat: int = DEFAULT_REPEAT,
+                   measure_memory: bool = True) -> Dict[str, Any]:
+    """Benchmark one (theme, layout, size) world; returns its JSON record"""
+    seconds: Dict[str, float] = {}
+    slowest: Dict[str, float] = {}
+    peak_bytes: Dict[str, int] = {}
+    
+    def timed(stage: str, fn: Callable[[], Any]) -> Any:
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        seconds[stage] = min(seconds.get(stage, elapsed), elapsed)
+        slowest[stage] = max(slowest.get(stage, elapsed), elapsed)
+        return result
+    
+    def traced(stage: str, fn: Callable[[], Any]) -> Any:
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        result = fn()
+        peak_bytes[stage] = tracemalloc.get_traced_memory()[1] - before
+        return result
+    
+    with tempfile.TemporaryDirectory() as output_dir, contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(max(repeat, 1)):
+            counts = _run_pipeline(theme, layout, size, seed, output_dir, timed)
+        if measure_memory:
+            tracemalloc.start()
+            try:
+                _run_pipeline(theme, layout, size, seed, output_dir, traced)
+            finally:
+                tracemalloc.stop()
+    
+    return {
+        "theme": theme,
+        "layout": layout,
+        "size": size,
+        "seed": seed,
+        "total_seconds": sum(seconds.values()),
+        "stages": {stage: {"seconds": seconds[stage], "spread_seconds": slowest[stage] - seconds[stage],
+                           "peak_bytes": peak_bytes.get(stage)} for stage in STAGES},
+        "counts": counts
+    }
+
+def run_benchmarks(sizes: Sequence[int] = DEFAULT_SIZES, themes: Sequence[str] = DEFAULT_THEMES,
+                   layouts: Sequence[str] = tuple(LAYOUT_SCOPES), seed: int = DEFAULT_SEED, repeat: int = DEFAULT_REPEAT,
+                   measure_memory: bool = True) -> Dict[str, Any]:
+    """Benchmark every combination of size, theme and layout"""
+    cases = []
+    for size in sizes:
+        for theme in themes:
+            for layout in layouts:
+                case = benchmark_case(theme, layout, size, seed, repeat, measure_memory)
+                print(f"⏱️ {size}x{size} {theme} {layout}: {case['total_seconds']:.3f}s, "
+                      f"{case['counts']['buildings']} buildings", file=sys.stderr)
+                cases.append(case)
+    
+    return {
+        "environment": {
+            "timestamp": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "generator_version": GENERATOR_VERSION
+        },
+        "settings": {"sizes": list(sizes), "themes": list(themes), "layouts": list(layouts),
+                     "seed": seed, "repeat": repeat},
+        "cases": cases
+    }
+
+def compare_results(current: Dict[str, Any], baseline: Dict[str, Any],
+                    threshold: float = DEFAULT_THRESHOLD) -> List[Dict[str, Any]]:
+    """Stage timings and peak memory that regressed beyond threshold against the baseline"""
+    key = lambda case: (case["theme"], case["layout"], case["size"], case["seed"])
+    baseline_cases = {key(case): case for case in baseline.get("cases", [])}
+    regressions = []
+    
+    for case in current["cases"]:
+        previous = baseline_cases.get(key(case))
+        if previous is None:
+            continue
+        for stage, measured in case["stages"].items():
+            reference = previous["stages"].get(stage, {})
+            # Timings vary from run to run; a slowdown within that variation is not a regression
+            spread = max(measured.get("spread_seconds") or 0.0, reference.get("spread_seconds") or 0.0)
+            time_noise = max(TIME_NOISE_FLOOR, NOISE_SPREADS * spread)
+            for metric, noise in (("seconds", time_noise), ("peak_bytes", MEMORY_NOISE_FLOOR)):
+                now, before = measured.get(metric), reference.get(metric)
+                if now is None or before is None:
+                    continue
+                if now > before * (1 + threshold) and now - before > noise:
+                    regressions.append({
+                        "theme": case["theme"], "layout": case["layout"], "size": case["size"],
+                        "stage": stage, "metric": metric, "baseline": before, "current": now,
+                        "ratio": now / before if before else float("inf")
+                    })
+    return regressions
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the world designer stage by stage")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="map side lengths")
+    parser.add_argument("--themes", nargs="+", default=list(DEFAULT_THEMES))
+    parser.add_argument("--layouts", nargs="+", default=list(LAYOUT_SCOPES), choices=list(LAYOUT_SCOPES))
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="untraced runs per case; the fastest counts")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc run")
+    parser.add_argument("--output", help="write results as JSON to this file (default: stdout)")
+    parser.add_argument("--compare", metavar="BASELINE", help="flag regressions against a stored result file")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="relative slowdown or memory growth that counts as a regression")
+    args = parser.parse_args(argv)
+    
+    results = run_benchmarks(args.sizes, args.themes, args.layouts, args.seed, args.repeat, not args.no_memory)
+    
+    exit_code = 0
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare_results(results, baseline, args.threshold)
+        results["regressions"] = regressions
+        for r in regressions:
+            print(f"⚠️ Regression: {r['size']}x{r['size']} {r['theme']} {r['layout']} {r['stage']} "
+                  f"{r['metric']} {r['baseline']:.4g} -> {r['current']:.4g} ({r['ratio']:.2f}x)", file=sys.stderr)
+        if regressions:
+            exit_code = 1
+        else:
+            print(f"✅ No regressions against {args.compare}", file=sys.stderr)
+    
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"📁 Results written to {args.output}", file=sys.stderr)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    return exit_code
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,7 +2,19 @@
 Core data structures and types.
 """
 
-from .data_types import TerrainType, WorldPosition
+from .data_types import TerrainType, TerrainCode, WorldPosition
+from .terrain_grid import TerrainGrid
+from .terrain_store import ChunkedTerrain, open_terrain
+from .terrain_regions import TerrainRegion, find_terrain_regions
+from .region_index import RegionIndex, open_region_index
+from .world_objects import Building, NaturalFeature, WorldPath, SpawnPoint, WorldObjects
+from .world_changes import ChangeSet
 from .world_spec import WorldSpec
+from .world_store import CompactWorldSpec, LazyTable, save_world_spec, load_world_spec
+from .world_cache import WorldDesignCache, design_cache_key, design_data_dir
 
-__all__ = ["TerrainType", "WorldPosition", "WorldSpec"]
+__all__ = ["TerrainType", "TerrainCode", "WorldPosition", "TerrainGrid", "ChunkedTerrain", "open_terrain", "TerrainRegion",
+           "find_terrain_regions", "RegionIndex", "open_region_index", "ChangeSet", "WorldSpec",
+           "Building", "NaturalFeature", "WorldPath", "SpawnPoint", "WorldObjects",
+           "CompactWorldSpec", "LazyTable", "save_world_spec", "load_world_spec", "WorldDesignCache", "design_cache_key",
+           "design_data_dir"]
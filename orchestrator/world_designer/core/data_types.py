@@ -2,7 +2,7 @@
 Core data types and enums for the world designer system.
 """
 
-from enum import Enum
+from enum import Enum, IntEnum
 from typing import Dict, List, Tuple, Optional, Any
 from dataclasses import dataclass
 
@@ -15,8 +15,27 @@ class TerrainType(Enum):
     FOREST = "forest"
     MOUNTAIN = "mountain"
 
-@dataclass
+# Compact uint8 codes for grid storage, one per TerrainType in declaration order
+TerrainCode = IntEnum("TerrainCode", [(t.name, i) for i, t in enumerate(TerrainType)])
+
+TERRAIN_NAMES: Tuple[str, ...] = tuple(t.value for t in TerrainType)
+
+# Terrain that can be neither walked across nor built on
+BLOCKING_TERRAIN: Tuple[str, ...] = (TerrainType.WATER.value, TerrainType.MOUNTAIN.value)
+
+def terrain_code(name: str) -> int:
+    """Get the uint8 grid code for a terrain name"""
+    return TerrainCode[TerrainType(name).name].value
+
+@dataclass(slots=True)
 class WorldPosition:
     x: float
     y: float
-    z: float = 0.0
\ No newline at end of file
+    z: float = 0.0
+    
+    @classmethod
+    def from_dict(cls, position: Dict[str, float]) -> "WorldPosition":
+        return cls(position["x"], position["y"], position.get("z", 0.0))
+    
+    def to_dict(self) -> Dict[str, float]:
+        return {"x": self.x, "y": self.y, "z": self.z}
@@ -0,0 +1,232 @@
+"""
+Quadtree region index over a world's buildings, natural features, paths and spawn points.
+"""
+
+import heapq
+import itertools
+import math
+from typing import Any, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .data_types import WorldPosition
+
+KINDS = ("buildings", "natural_features", "paths", "spawn_points")
+
+# Entries a node holds before it splits, and the deepest level it splits to
+DEFAULT_NODE_CAPACITY = 16
+DEFAULT_MAX_DEPTH = 12
+
+Bounds = Tuple[float, float, float, float]
+
+class _Entry:
+    """An indexed object with its kind, xy vertices and bounding box"""
+    
+    __slots__ = ("kind", "item", "vertices", "bounds", "order")
+    
+    def __init__(self, kind: str, item: Any, vertices: np.ndarray, order: int):
+        self.kind = kind
+        self.item = item
+        self.vertices = vertices
+        self.bounds = (float(vertices[:, 0].min()), float(vertices[:, 1].min()),
+                       float(vertices[:, 0].max()), float(vertices[:, 1].max()))
+        self.order = order
+    
+    def distance(self, x: float, y: float) -> float:
+        """Distance from (x, y) to the point, or to the nearest segment of a polyline"""
+        if len(self.vertices) == 1:
+            return math.hypot(self.vertices[0, 0] - x, self.vertices[0, 1] - y)
+        start, end = self.vertices[:-1], self.vertices[1:]
+        segment = end - start
+        length2 = np.maximum((segment ** 2).sum(axis=1), 1e-12)
+        t = np.clip(((x - start[:, 0]) * segment[:, 0] + (y - start[:, 1]) * segment[:, 1]) / length2, 0.0, 1.0)
+        return float(np.hypot(start[:, 0] + t * segment[:, 0] - x, start[:, 1] + t * segment[:, 1] - y).min())
+
+class _Node:
+    """Quadtree node; entries that straddle its quadrants stay on the node itself"""
+    
+    __slots__ = ("bounds", "depth", "entries", "children")
+    
+    def __init__(self, bounds: Bounds, depth: int):
+        self.bounds = bounds
+        self.depth = depth
+        self.entries: List[_Entry] = []
+        self.children: Optional[List["_Node"]] = None
+    
+    def child_for(self, bounds: Bounds) -> Optional["_Node"]:
+        """The quadrant that fully contains bounds, if any"""
+        if not _contains(self.bounds, bounds):
+            return None
+        mid_x = (self.bounds[0] + self.bounds[2]) / 2
+        mid_y = (self.bounds[1] + self.bounds[3]) / 2
+        if bounds[2] < mid_x:
+            column = 0
+        elif bounds[0] >= mid_x:
+            column = 1
+        else:
+            return None
+        if bounds[3] < mid_y:
+            row = 0
+        elif bounds[1] >= mid_y:
+            row = 1
+        else:
+            return None
+        return self.children[row * 2 + column]
+    
+    def split(self):
+        min_x, min_y, max_x, max_y = self.bounds
+        mid_x, mid_y = (min_x + max_x) / 2, (min_y + max_y) / 2
+        self.children = [_Node(bounds, self.depth + 1) for bounds in (
+            (min_x, min_y, mid_x, mid_y), (mid_x, min_y, max_x, mid_y),
+            (min_x, mid_y, mid_x, max_y), (mid_x, mid_y, max_x, max_y)
+        )]
+
+class RegionIndex:
+    """
+    Quadtree over world objects for bbox, radius and k-nearest queries.
+    
+    Points (buildings, features, spawn points) and polylines (paths) are indexed by
+    their bounding boxes; distances to paths are measured to the nearest segment.
+    Queries return the indexed objects themselves (WorldSpec objects or dicts),
+    optionally limited to some kinds, e.g. kinds=("buildings",).
+    """
+    
+    def __init__(self, bounds: Bounds, capacity: int = DEFAULT_NODE_CAPACITY, max_depth: int = DEFAULT_MAX_DEPTH):
+        self.capacity = capacity
+        self.max_depth = max_depth
+        self._root = _Node(bounds, 0)
+        self._count = 0
+    
+    @classmethod
+    def from_world_spec(cls, world_spec, **kwargs) -> "RegionIndex":
+        """Index a WorldSpec, CompactWorldSpec or world spec dict"""
+        entries = [(kind, item, _vertices(kind, item)) for kind in KINDS for item in (_field(world_spec, kind) or [])]
+        width, height = _field(world_spec, "size") or (0, 0)
+        min_x, min_y, max_x, max_y = 0.0, 0.0, float(width), float(height)
+        for _, _, vertices in entries:
+            min_x, min_y = min(min_x, float(vertices[:, 0].min())), min(min_y, float(vertices[:, 1].min()))
+            max_x, max_y = max(max_x, float(vertices[:, 0].max())), max(max_y, float(vertices[:, 1].max()))
+        
+        index = cls((min_x, min_y, max_x, max_y), **kwargs)
+        for kind, item, vertices in entries:
+            index._insert(_Entry(kind, item, vertices, index._count))
+        return index
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def insert(self, kind: str, item: Any):
+        """Add one object of the given kind"""
+        self._insert(_Entry(kind, item, _vertices(kind, item), self._count))
+    
+    def _insert(self, entry: _Entry):
+        node = self._root
+        while node.children is not None:
+            child = node.child_for(entry.bounds)
+            if child is None:
+                break
+            node = child
+        node.entries.append(entry)
+        self._count += 1
+        
+        if node.children is None and len(node.entries) > self.capacity and node.depth < self.max_depth:
+            node.split()
+            entries, node.entries = node.entries, []
+            for moved in entries:
+                (node.child_for(moved.bounds) or node).entries.append(moved)
+    
+    def query_bbox(self, min_x: float, min_y: float, max_x: float, max_y: float,
+                   kinds: Optional[Sequence[str]] = None) -> List[Any]:
+        """Objects whose bounding box overlaps the box, in insertion order"""
+        hits = []
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            for entry in node.entries:
+                if (kinds is None or entry.kind in kinds) and _overlaps(entry.bounds, (min_x, min_y, max_x, max_y)):
+                    hits.append(entry)
+            if node.children is not None:
+                stack.extend(child for child in node.children if _overlaps(child.bounds, (min_x, min_y, max_x, max_y)))
+        hits.sort(key=lambda entry: entry.order)
+        return [entry.item for entry in hits]
+    
+    def query_radius(self, position: WorldPosition, radius: float, kinds: Optional[Sequence[str]] = None) -> List[Any]:
+        """Objects within radius of position, nearest first"""
+        x, y = float(position.x), float(position.y)
+        hits = []
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            for entry in node.entries:
+                if (kinds is None or entry.kind in kinds) and _box_distance(entry.bounds, x, y) <= radius:
+                    distance = entry.distance(x, y)
+                    if distance <= radius:
+                        hits.append((distance, entry.order, entry.item))
+            if node.children is not None:
+                stack.extend(child for child in node.children if _box_distance(child.bounds, x, y) <= radius)
+        hits.sort(key=lambda hit: hit[:2])
+        return [item for _, _, item in hits]
+    
+    def nearest(self, position: WorldPosition, k: int = 1, kinds: Optional[Sequence[str]] = None,
+                max_radius: Optional[float] = None) -> List[Any]:
+        """Up to k objects closest to position, nearest first"""
+        x, y = float(position.x), float(position.y)
+        limit = math.inf if max_radius is None else max_radius
+        
+        # Best-first search: nodes are keyed by the distance to their box, entries by their exact
+        # distance, so an entry popped from the heap is closer than anything still queued
+        node_order = itertools.count()
+        heap: List[Tuple[float, int, int, Any]] = [(0.0, 0, next(node_order), self._root)]
+        results = []
+        while heap and len(results) < k:
+            distance, is_entry, order, target = heapq.heappop(heap)
+            if distance > limit:
+                break
+            if is_entry:
+                results.append(target.item)
+                continue
+            for entry in target.entries:
+                if kinds is None or entry.kind in kinds:
+                    heapq.heappush(heap, (entry.distance(x, y), 1, entry.order, entry))
+            for child in target.children or ():
+                if child.entries or child.children:
+                    heapq.heappush(heap, (_box_distance(child.bounds, x, y), 0, next(node_order), child))
+        return results
+
+def _contains(outer: Bounds, inner: Bounds) -> bool:
+    return outer[0] <= inner[0] and outer[1] <= inner[1] and inner[2] <= outer[2] and inner[3] <= outer[3]
+
+def _overlaps(a: Bounds, b: Bounds) -> bool:
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+def _box_distance(bounds: Bounds, x: float, y: float) -> float:
+    """Distance from (x, y) to the box, 0 inside it"""
+    dx = max(bounds[0] - x, 0.0, x - bounds[2])
+    dy = max(bounds[1] - y, 0.0, y - bounds[3])
+    return math.hypot(dx, dy)
+
+def _field(world_spec, name: str):
+    return world_spec.get(name) if isinstance(world_spec, dict) else getattr(world_spec, name, None)
+
+def _vertices(kind: str, item: Any) -> np.ndarray:
+    """(M, 2) xy vertices of an object or its dict form: the path polyline, else the position"""
+    if kind == "paths":
+        if isinstance(item, dict):
+            points = item.get("points") or [item["start"], item["end"]]
+            return np.array([[p["x"], p["y"]] for p in points], dtype=np.float64).reshape(-1, 2)
+        return np.asarray(item.points, dtype=np.float64)[:, :2]
+    if isinstance(item, dict):
+        position = item.get("position", item)
+        return np.array([[position["x"], position["y"]]], dtype=np.float64)
+    return np.array([[item.position.x, item.position.y]], dtype=np.float64)
+
+def open_region_index(world_spec) -> RegionIndex:
+    """
+    Region index for a WorldSpec or world spec dict.
+    
+    WorldSpec keeps its index between calls; other forms are indexed on each call,
+    so callers should hold on to the result.
+    """
+    if hasattr(world_spec, "region_index"):
+        return world_spec.region_index()
+    return RegionIndex.from_world_spec(world_spec)
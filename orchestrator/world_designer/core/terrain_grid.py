@@ -0,0 +1,145 @@
+"""
+NumPy-backed terrain grid with a lazy list-of-strings compatibility view.
+"""
+
+from typing import Dict, Iterator, List, Sequence, Tuple, Union
+
+import numpy as np
+
+from .data_types import TERRAIN_NAMES, terrain_code
+
+_NAME_LOOKUP = np.array(TERRAIN_NAMES, dtype=object)
+
+class TerrainRow(Sequence):
+    """Read-only view of one grid row that yields terrain names on access"""
+    
+    __slots__ = ("_codes",)
+    
+    def __init__(self, codes: np.ndarray):
+        self._codes = codes
+    
+    def __len__(self) -> int:
+        return len(self._codes)
+    
+    def __getitem__(self, x: Union[int, slice]):
+        if isinstance(x, slice):
+            return _NAME_LOOKUP[self._codes[x]].tolist()
+        return TERRAIN_NAMES[self._codes[x]]
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(_NAME_LOOKUP[self._codes].tolist())
+    
+    def __contains__(self, name) -> bool:
+        try:
+            return bool((self._codes == terrain_code(name)).any())
+        except ValueError:
+            return False
+    
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+class TerrainGrid:
+    """
+    Terrain map stored as a (height, width) uint8 array of TerrainCode values.
+    
+    Indexing as ``grid[y][x]`` and iterating rows behaves like the legacy
+    ``List[List[str]]`` terrain map, but names are only produced on access.
+    """
+    
+    __slots__ = ("codes",)
+    
+    def __init__(self, codes: np.ndarray):
+        self.codes = np.ascontiguousarray(codes, dtype=np.uint8)
+    
+    @classmethod
+    def from_rows(cls, rows: List[List[str]]) -> "TerrainGrid":
+        """Build a grid from a legacy list-of-strings terrain map"""
+        if isinstance(rows, TerrainGrid):
+            return rows
+        if not rows:
+            return cls(np.zeros((0, 0), dtype=np.uint8))
+        lookup = {name: i for i, name in enumerate(TERRAIN_NAMES)}
+        codes = np.array([[lookup[t] for t in row] for row in rows], dtype=np.uint8)
+        return cls(codes)
+    
+    @property
+    def height(self) -> int:
+        return self.codes.shape[0]
+    
+    @property
+    def width(self) -> int:
+        return self.codes.shape[1]
+    
+    @property
+    def shape(self):
+        return self.codes.shape
+    
+    def __len__(self) -> int:
+        return self.height
+    
+    def __getitem__(self, y: Union[int, slice]):
+        if isinstance(y, slice):
+            return [TerrainRow(row) for row in self.codes[y]]
+        return TerrainRow(self.codes[y])
+    
+    def __iter__(self) -> Iterator[TerrainRow]:
+        for row in self.codes:
+            yield TerrainRow(row)
+    
+    def __bool__(self) -> bool:
+        return self.codes.size > 0
+    
+    def __eq__(self, other) -> bool:
+        if isinstance(other, TerrainGrid):
+            return np.array_equal(self.codes, other.codes)
+        return NotImplemented
+    
+    def tolist(self) -> List[List[str]]:
+        """Materialize the legacy List[List[str]] terrain map"""
+        return _NAME_LOOKUP[self.codes].tolist()
+    
+    def counts(self) -> Dict[str, int]:
+        """Count tiles per terrain type present in the grid"""
+        counts = np.bincount(self.codes.ravel(), minlength=len(TERRAIN_NAMES))
+        return {TERRAIN_NAMES[i]: int(c) for i, c in enumerate(counts) if c}
+    
+    def terrain_types(self) -> List[str]:
+        """List the distinct terrain types present in the grid"""
+        return [TERRAIN_NAMES[i] for i in np.unique(self.codes)]
+    
+    def has_terrain(self, name: str) -> bool:
+        """Check whether any tile has the given terrain type"""
+        return bool(self.mask(name).any())
+    
+    def sample(self, xs, ys) -> np.ndarray:
+        """Terrain codes at integer tile coordinates, clipped to the grid"""
+        xs = np.clip(np.asarray(xs, dtype=np.intp), 0, self.width - 1)
+        ys = np.clip(np.asarray(ys, dtype=np.intp), 0, self.height - 1)
+        return self.codes[ys, xs]
+    
+    def read_window(self, x0: int, y0: int, x1: int, y1: int) -> np.ndarray:
+        """Terrain codes for the half-open tile window [x0, x1) x [y0, y1)"""
+        return self.codes[y0:y1, x0:x1]
+    
+    def write_window(self, x0: int, y0: int, x1: int, y1: int, codes):
+        """Store terrain codes into the half-open tile window [x0, x1) x [y0, y1)"""
+        self.codes[y0:y1, x0:x1] = codes
+    
+    def iter_tiles(self, tile_size: int = 512) -> Iterator[Tuple[int, int, np.ndarray]]:
+        """Yield (x0, y0, codes) for each tile_size square of the grid"""
+        for y0 in range(0, self.height, tile_size):
+            for x0 in range(0, self.width, tile_size):
+                yield x0, y0, self.codes[y0:y0 + tile_size, x0:x0 + tile_size]
+    
+    def mask(self, name: str) -> np.ndarray:
+        """Boolean mask of tiles with the given terrain type"""
+        return self.codes == terrain_code(name)
+    
+    def __repr__(self) -> str:
+        return f"TerrainGrid({self.width}x{self.height})"
+
+def terrain_rows(terrain_map) -> List[List[str]]:
+    """Return a terrain map as plain nested lists, whatever its representation"""
+    if isinstance(terrain_map, TerrainGrid):
+        return terrain_map.tolist()
+    return terrain_map
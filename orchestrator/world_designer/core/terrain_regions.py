@@ -0,0 +1,145 @@
+"""
+Connected terrain regions, labeled band by band over TerrainGrid or ChunkedTerrain.
+
+Each row is split into runs of equal terrain; runs in neighboring rows that share
+terrain and overlap are joined (4-connectivity). The run graph is solved with
+vectorized hooking and pointer jumping, so no Python loop touches single tiles
+and only one band of rows is held in memory at a time.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from .data_types import TERRAIN_NAMES
+
+# Rows read per band; a band holds about this many rows times the map width
+DEFAULT_BAND_ROWS = 256
+
+@dataclass(frozen=True, slots=True)
+class TerrainRegion:
+    """One connected region of a single terrain type"""
+    terrain: str
+    size: int
+    centroid: Tuple[float, float]
+    # (min_x, min_y, max_x, max_y), inclusive tile coordinates
+    bounds: Tuple[int, int, int, int]
+    # Tile inside the region closest to the centroid; the centroid of a ring or
+    # crescent can fall outside it
+    anchor: Tuple[int, int]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "terrain": self.terrain,
+            "size": self.size,
+            "centroid": self.centroid,
+            "bounds": self.bounds,
+            "anchor": self.anchor
+        }
+
+def find_terrain_regions(terrain, min_size: int = 1, band_rows: int = DEFAULT_BAND_ROWS) -> List[TerrainRegion]:
+    """Connected regions of at least min_size tiles, largest first"""
+    if not terrain:
+        return []
+    width, height = terrain.width, terrain.height
+    
+    run_code, run_x, run_y, run_length, edges = [], [], [], [], []
+    run_count = 0
+    previous = None
+    
+    for y0 in range(0, height, band_rows):
+        codes = np.asarray(terrain.read_window(0, y0, width, min(y0 + band_rows, height)))
+        
+        # A run starts at column 0 and wherever the terrain changes along a row
+        starts = np.ones(codes.shape, dtype=bool)
+        starts[:, 1:] = codes[:, 1:] != codes[:, :-1]
+        flat_starts = np.flatnonzero(starts)
+        run_ids = (np.cumsum(starts.ravel()) - 1 + run_count).reshape(codes.shape)
+        
+        run_code.append(codes.ravel()[flat_starts])
+        run_x.append(flat_starts % width)
+        run_y.append(flat_starts // width + y0)
+        run_length.append(np.diff(flat_starts, append=codes.size))
+        
+        # Join runs to the rows above, including the last row of the previous band
+        if previous is not None:
+            codes, starts, run_ids = (np.concatenate((prev, band)) for prev, band in zip(previous, (codes, starts, run_ids)))
+        edges.append(_vertical_edges(codes, starts, run_ids))
+        
+        run_count += flat_starts.size
+        previous = (codes[-1:], starts[-1:], run_ids[-1:])
+    
+    run_code, run_x, run_y, run_length = (np.concatenate(parts) for parts in (run_code, run_x, run_y, run_length))
+    upper, lower = (np.concatenate(side) for side in zip(*edges))
+    roots = _component_roots(run_count, upper, lower)
+    return _summarize_regions(roots, run_code, run_x, run_y, run_length, min_size)
+
+def _vertical_edges(codes: np.ndarray, starts: np.ndarray, run_ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """One (upper run, lower run) pair per overlap of equal terrain between adjacent rows"""
+    # Inside an overlap the pair of runs only changes where either row starts a new run
+    keep = (codes[1:] == codes[:-1]) & (starts[1:] | starts[:-1])
+    return run_ids[:-1][keep], run_ids[1:][keep]
+
+def _component_roots(count: int, u: np.ndarray, v: np.ndarray) -> np.ndarray:
+    """
+    Smallest node id in each node's component, for the graph with edges (u, v).
+    
+    Each round hooks the larger of every edge's two roots onto the smaller, then
+    pointer-jumps until every node points at its root.
+    """
+    parent = np.arange(count)
+    while True:
+        pu, pv = parent[u], parent[v]
+        differ = pu != pv
+        if not differ.any():
+            return parent
+        u, v = u[differ], v[differ]
+        np.minimum.at(parent, np.maximum(pu[differ], pv[differ]), np.minimum(pu[differ], pv[differ]))
+        while True:
+            jumped = parent[parent]
+            if np.array_equal(jumped, parent):
+                break
+            parent = jumped
+
+def _summarize_regions(roots: np.ndarray, run_code: np.ndarray, run_x: np.ndarray, run_y: np.ndarray,
+                       run_length: np.ndarray, min_size: int) -> List[TerrainRegion]:
+    """Aggregate per-run statistics into regions"""
+    # Roots are the smallest run id of each region, so numbering roots in id order labels regions
+    is_root = roots == np.arange(roots.size)
+    region_of_run = (np.cumsum(is_root) - 1)[roots]
+    count = int(is_root.sum())
+    run_last = run_x + run_length - 1
+    
+    size = np.bincount(region_of_run, weights=run_length, minlength=count)
+    sum_x = np.bincount(region_of_run, weights=run_length * (run_x + run_last) / 2, minlength=count)
+    sum_y = np.bincount(region_of_run, weights=run_length * run_y, minlength=count)
+    centroid_x, centroid_y = sum_x / size, sum_y / size
+    
+    # Group runs by region, so bounds and nearest distances are segment reductions
+    order = np.argsort(region_of_run, kind="stable")
+    group_starts = np.searchsorted(region_of_run[order], np.arange(count))
+    min_x = np.minimum.reduceat(run_x[order], group_starts)
+    max_x = np.maximum.reduceat(run_last[order], group_starts)
+    min_y = np.minimum.reduceat(run_y[order], group_starts)
+    max_y = np.maximum.reduceat(run_y[order], group_starts)
+    
+    # Anchor: nearest tile of each run to its region's centroid, then the first nearest run
+    nearest_x = np.clip(np.rint(centroid_x[region_of_run]), run_x, run_last).astype(np.int64)
+    distance = ((nearest_x - centroid_x[region_of_run]) ** 2 + (run_y - centroid_y[region_of_run]) ** 2)[order]
+    nearest = np.repeat(np.minimum.reduceat(distance, group_starts), np.diff(group_starts, append=order.size))
+    closest = np.flatnonzero(distance == nearest)
+    first = order[closest[np.diff(region_of_run[order[closest]], prepend=-1) != 0]]
+    
+    regions = [
+        TerrainRegion(
+            terrain=TERRAIN_NAMES[run_code[first[i]]],
+            size=int(size[i]),
+            centroid=(float(centroid_x[i]), float(centroid_y[i])),
+            bounds=(int(min_x[i]), int(min_y[i]), int(max_x[i]), int(max_y[i])),
+            anchor=(int(nearest_x[first[i]]), int(run_y[first[i]]))
+        )
+        for i in np.flatnonzero(size >= min_size)
+    ]
+    regions.sort(key=lambda region: (-region.size, region.bounds[1], region.bounds[0]))
+    return regions
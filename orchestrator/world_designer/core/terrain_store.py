@@ -0,0 +1,167 @@
+"""
+Memory-mapped on-disk terrain storage for worlds too large to hold in memory.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .data_types import TERRAIN_NAMES, terrain_code
+from .terrain_grid import TerrainGrid
+
+DEFAULT_TILE_SIZE = 512
+
+class ChunkedTerrain:
+    """
+    Terrain codes in a memory-mapped ``.npy`` file, read one tile at a time.
+    
+    Exposes the same read API as TerrainGrid (``sample``, ``read_window``,
+    ``iter_tiles``, ``counts``) so consumers can work with either.
+    """
+    
+    def __init__(self, path: Union[str, Path], tile_size: int = DEFAULT_TILE_SIZE):
+        self.path = Path(path)
+        self.tile_size = tile_size
+        self._codes: Optional[np.ndarray] = None
+    
+    @classmethod
+    def create(cls, path: Union[str, Path], size: Tuple[int, int],
+               tile_size: int = DEFAULT_TILE_SIZE) -> "ChunkedTerrain":
+        """Allocate a new on-disk terrain array for a (width, height) world"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        store = cls(path, tile_size)
+        store._codes = np.lib.format.open_memmap(path, mode="w+", dtype=np.uint8,
+                                                 shape=(size[1], size[0]))
+        return store
+    
+    @classmethod
+    def from_ref(cls, ref: Dict[str, Any]) -> "ChunkedTerrain":
+        """Open the terrain array described by a WorldSpec terrain reference"""
+        return cls(ref["path"], ref.get("tile_size", DEFAULT_TILE_SIZE))
+    
+    def to_ref(self) -> Dict[str, Any]:
+        """Describe this array for embedding in a WorldSpec"""
+        return {
+            "path": str(self.path.resolve()),
+            "format": "npy",
+            "dtype": "uint8",
+            "shape": list(self.shape),
+            "tile_size": self.tile_size,
+            "terrain_types": list(TERRAIN_NAMES)
+        }
+    
+    @property
+    def codes(self) -> np.ndarray:
+        if self._codes is None:
+            self._codes = np.load(self.path, mmap_mode="r")
+        return self._codes
+    
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.codes.shape
+    
+    @property
+    def height(self) -> int:
+        return self.codes.shape[0]
+    
+    @property
+    def width(self) -> int:
+        return self.codes.shape[1]
+    
+    def tile_grid(self) -> Tuple[int, int]:
+        """Number of (columns, rows) of tiles"""
+        return (-(-self.width // self.tile_size), -(-self.height // self.tile_size))
+    
+    def tile_bounds(self, tx: int, ty: int) -> Tuple[int, int, int, int]:
+        """Half-open (x0, y0, x1, y1) tile coordinates covered by tile (tx, ty)"""
+        x0, y0 = tx * self.tile_size, ty * self.tile_size
+        return x0, y0, min(x0 + self.tile_size, self.width), min(y0 + self.tile_size, self.height)
+    
+    def read_tile(self, tx: int, ty: int) -> np.ndarray:
+        """Load one tile into memory"""
+        return self.read_window(*self.tile_bounds(tx, ty))
+    
+    def write_tile(self, tx: int, ty: int, codes: np.ndarray):
+        """Store one tile's codes"""
+        x0, y0, x1, y1 = self.tile_bounds(tx, ty)
+        self.codes[y0:y1, x0:x1] = codes
+    
+    def read_window(self, x0: int, y0: int, x1: int, y1: int) -> np.ndarray:
+        """Load the half-open tile window [x0, x1) x [y0, y1) into memory"""
+        return np.array(self.codes[y0:y1, x0:x1])
+    
+    def write_window(self, x0: int, y0: int, x1: int, y1: int, codes):
+        """Store terrain codes into the half-open tile window [x0, x1) x [y0, y1)"""
+        if not self.codes.flags.writeable:
+            # Opened read-only from an existing file; reopen for in-place edits
+            self._codes = np.load(self.path, mmap_mode="r+")
+        self.codes[y0:y1, x0:x1] = codes
+    
+    def iter_tiles(self, tile_size: Optional[int] = None) -> Iterator[Tuple[int, int, np.ndarray]]:
+        """Yield (x0, y0, codes) per tile, loading only one tile at a time"""
+        tile_size = tile_size or self.tile_size
+        for y0 in range(0, self.height, tile_size):
+            for x0 in range(0, self.width, tile_size):
+                yield x0, y0, self.read_window(x0, y0, x0 + tile_size, y0 + tile_size)
+    
+    def sample(self, xs, ys) -> np.ndarray:
+        """Terrain codes at integer tile coordinates, clipped to the grid"""
+        xs = np.clip(np.asarray(xs, dtype=np.intp), 0, self.width - 1)
+        ys = np.clip(np.asarray(ys, dtype=np.intp), 0, self.height - 1)
+        return np.asarray(self.codes[ys, xs])
+    
+    def counts(self) -> Dict[str, int]:
+        """Count tiles per terrain type, streaming over tiles"""
+        totals = np.zeros(len(TERRAIN_NAMES), dtype=np.int64)
+        for _, _, codes in self.iter_tiles():
+            totals += np.bincount(codes.ravel(), minlength=len(TERRAIN_NAMES))
+        return {TERRAIN_NAMES[i]: int(c) for i, c in enumerate(totals) if c}
+    
+    def terrain_types(self) -> List[str]:
+        """List the distinct terrain types present"""
+        return list(self.counts().keys())
+    
+    def has_terrain(self, name: str) -> bool:
+        """Check whether any tile has the given terrain type, stopping at the first hit"""
+        code = terrain_code(name)
+        return any((codes == code).any() for _, _, codes in self.iter_tiles())
+    
+    def flush(self):
+        if self._codes is not None and hasattr(self._codes, "flush"):
+            self._codes.flush()
+    
+    def __bool__(self) -> bool:
+        return self.path.exists()
+    
+    def __repr__(self) -> str:
+        return f"ChunkedTerrain({self.path.name}, tile_size={self.tile_size})"
+
+def open_terrain(world_spec) -> Optional[Union[TerrainGrid, ChunkedTerrain]]:
+    """
+    Open the terrain of a WorldSpec or world spec dict.
+    
+    Returns a ChunkedTerrain when the spec references an on-disk array,
+    a TerrainGrid for an embedded terrain map, or None if there is no terrain.
+    """
+    if isinstance(world_spec, dict):
+        terrain_ref = world_spec.get("terrain_ref")
+        terrain_map = world_spec.get("terrain_map")
+    else:
+        terrain_ref = getattr(world_spec, "terrain_ref", None)
+        terrain_map = getattr(world_spec, "terrain_map", None)
+    
+    if terrain_ref:
+        return ChunkedTerrain.from_ref(terrain_ref)
+    if isinstance(terrain_map, TerrainGrid):
+        return terrain_map
+    if terrain_map:
+        return TerrainGrid.from_rows(terrain_map)
+    return None
+
+def as_terrain(terrain_map) -> Union[TerrainGrid, ChunkedTerrain]:
+    """Accept any terrain representation and return one with the grid read API"""
+    if isinstance(terrain_map, (TerrainGrid, ChunkedTerrain)):
+        return terrain_map
+    return TerrainGrid.from_rows(terrain_map)
@@ -0,0 +1,170 @@
+"""
+Two-tier cache of finished world designs.
+
+Designs are keyed by a canonical hash of the prompt analysis, the seed, the
+candidate count and GENERATOR_VERSION, so prompts that analyze the same way
+share one entry. Recent designs stay in an in-process LRU; every design is
+also written as a .wspec file under <output_dir>/world_cache so later runs
+can reuse it. A cached design's terrain and heightmap files live in
+<output_dir>/world_cache/<key>/, where no other design writes. A design
+cached for one output directory is copied, files included, before it is
+returned for another, so a hit never points into someone else's directory.
+Editing a spec first moves it onto its own copies of those files under
+<output_dir>/world_edits/, so edits never reach the cache entry.
+
+Only seeded designs are cached: callers that want reuse must pass a seed.
+"""
+
+import copy
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from collections import OrderedDict
+from dataclasses import replace
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from .world_spec import WorldSpec
+from .world_store import load_world_spec, save_world_spec
+
+# Bump whenever generation changes, so designs cached by older code are not reused
+GENERATOR_VERSION = 4
+
+# Designs kept in memory before the least recently used one is dropped
+DEFAULT_CACHE_SIZE = 32
+
+CACHE_DIR_NAME = "world_cache"
+EDITS_DIR_NAME = "world_edits"
+
+def design_cache_key(analysis: Dict[str, Any], seed: int, candidates: int = 1) -> str:
+    """Canonical hash of everything that determines a generated design"""
+    canonical = json.dumps(
+        {"analysis": analysis, "seed": seed, "candidates": candidates, "version": GENERATOR_VERSION},
+        sort_keys=True, separators=(",", ":"), default=str
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:32]
+
+def design_data_dir(key: str, output_dir: Union[str, Path]) -> Path:
+    """Directory for the terrain and heightmap files of the design cached under key"""
+    return Path(output_dir) / CACHE_DIR_NAME / key
+
+class WorldDesignCache:
+    """
+    In-process LRU of WorldSpecs backed by .wspec files on disk.
+    
+    Cached specs are shared between hits, so callers must not modify them.
+    """
+    
+    def __init__(self, max_entries: int = DEFAULT_CACHE_SIZE):
+        self.max_entries = max_entries
+        # Keyed by (design key, resolved output directory)
+        self._entries: "OrderedDict[Tuple[str, Optional[str]], WorldSpec]" = OrderedDict()
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+    
+    def get(self, key: str, output_dir: Optional[Union[str, Path]] = None) -> Tuple[Optional[WorldSpec], Optional[str]]:
+        """The cached spec and the tier it came from ("memory" or "disk"), or (None, None)"""
+        entry = (key, _directory_key(output_dir))
+        world_spec = self._entries.get(entry)
+        if world_spec is not None and _terrain_available(world_spec.terrain_ref):
+            self._entries.move_to_end(entry)
+            self.stats["memory_hits"] += 1
+            return world_spec, "memory"
+        
+        path = self._path(key, output_dir)
+        if path is not None and path.exists():
+            try:
+                stored = load_world_spec(path)
+                if _terrain_available(stored.terrain_ref):
+                    world_spec = stored.to_world_spec()
+                    self._remember(entry, world_spec)
+                    self.stats["disk_hits"] += 1
+                    return world_spec, "disk"
+            except (OSError, ValueError, KeyError) as e:
+                print(f"⚠️ Ignoring unreadable cached design {path.name}: {e}")
+        
+        # The same design cached for another output directory is copied here, files included
+        if output_dir:
+            source = next((spec for (cached_key, _), spec in reversed(self._entries.items())
+                           if cached_key == key and _terrain_available(spec.terrain_ref)), None)
+            if source is not None:
+                world_spec = replace(source, metadata=copy.deepcopy(source.metadata),
+                                     terrain_ref=copy.deepcopy(source.terrain_ref))
+                copy_design_files(world_spec, design_data_dir(key, output_dir))
+                self.put(key, world_spec, output_dir)
+                self.stats["memory_hits"] += 1
+                return world_spec, "memory"
+        
+        self.stats["misses"] += 1
+        return None, None
+    
+    def put(self, key: str, world_spec: WorldSpec, output_dir: Optional[Union[str, Path]] = None):
+        """Store a design in memory and, when an output directory is given, on disk"""
+        self._remember((key, _directory_key(output_dir)), world_spec)
+        path = self._path(key, output_dir)
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write to a temporary name first so readers never see a partial file
+            temporary = path.with_name(f"{path.stem}.{os.getpid()}.tmp")
+            save_world_spec(world_spec, temporary)
+            os.replace(temporary, path)
+    
+    def clear(self):
+        """Drop the in-memory tier; files on disk are left in place"""
+        self._entries.clear()
+    
+    def _remember(self, entry: Tuple[str, Optional[str]], world_spec: WorldSpec):
+        self._entries[entry] = world_spec
+        self._entries.move_to_end(entry)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+    
+    @staticmethod
+    def _path(key: str, output_dir: Optional[Union[str, Path]]) -> Optional[Path]:
+        return Path(output_dir) / CACHE_DIR_NAME / f"{key}.wspec" if output_dir else None
+
+def copy_design_files(world_spec: WorldSpec, target_dir: Union[str, Path]):
+    """Copy the terrain and heightmap files world_spec points at into target_dir and repoint it there"""
+    target = Path(target_dir)
+    target.mkdir(parents=True, exist_ok=True)
+    for record, field in _design_files(world_spec):
+        source = Path(record[field])
+        destination = target / source.name
+        if source.exists() and source.resolve() != destination.resolve():
+            shutil.copy2(source, destination)
+        record[field] = str(destination.resolve())
+
+def detach_from_cache(world_spec: WorldSpec) -> bool:
+    """
+    Move world_spec onto private copies of any terrain and heightmap files it shares with the cache.
+    
+    Edits write those files in place, so they are copied first into a fresh directory
+    under <output_dir>/world_edits/. Returns True if files were copied.
+    """
+    shared = [Path(record[field]).resolve() for record, field in _design_files(world_spec)]
+    shared = [path for path in shared if path.parent.parent.name == CACHE_DIR_NAME]
+    if not shared:
+        return False
+    
+    data_dir = shared[0].parent
+    edits_dir = data_dir.parent.parent / EDITS_DIR_NAME
+    edits_dir.mkdir(parents=True, exist_ok=True)
+    target = tempfile.mkdtemp(prefix=f"{data_dir.name}-", dir=edits_dir)
+    print(f"📄 Copying cached world files to {target} before editing")
+    copy_design_files(world_spec, target)
+    return True
+
+def _design_files(world_spec: WorldSpec) -> List[Tuple[Dict, str]]:
+    """(record, field) pairs naming each file a spec's terrain and heightmap live in"""
+    files = [(world_spec.terrain_ref, "path")] if world_spec.terrain_ref else []
+    heightmap = world_spec.metadata.get("heightmap") or {}
+    files.extend((heightmap, field) for field in ("array", "raw", "png") if heightmap.get(field))
+    return files
+
+def _directory_key(output_dir: Optional[Union[str, Path]]) -> Optional[str]:
+    return str(Path(output_dir).resolve()) if output_dir else None
+
+def _terrain_available(terrain_ref: Optional[Dict]) -> bool:
+    """Chunked terrain lives in its own file, which may have been removed since caching"""
+    return not terrain_ref or Path(terrain_ref["path"]).exists()
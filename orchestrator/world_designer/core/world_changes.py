@@ -0,0 +1,108 @@
+"""
+Change sets describing incremental edits to a WorldSpec.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+from .region_index import KINDS
+
+Bounds = Tuple[float, float, float, float]
+
+# Reach around an edited building whose ground, features and spawn points are regenerated;
+# covers its levelled pad and blend plus the feature clearance
+BUILDING_EDIT_MARGIN = 8.0
+
+def object_key(kind: str, item: Any) -> str:
+    """Stable key of a world object or its dict form: its id, or the type for spawn points"""
+    if isinstance(item, dict):
+        return item["type"] if kind == "spawn_points" else item["id"]
+    return item.type if kind == "spawn_points" else item.id
+
+@dataclass(slots=True)
+class ChangeSet:
+    """
+    Keys of the objects added, modified and removed by a batch of edits, by kind,
+    plus the regions whose contents were regenerated.
+    
+    Consumers such as the asset and export stages only need to rebuild the
+    touched objects and drop the removed ones; see filter().
+    """
+    added: Dict[str, List[str]] = field(default_factory=lambda: {kind: [] for kind in KINDS})
+    modified: Dict[str, List[str]] = field(default_factory=lambda: {kind: [] for kind in KINDS})
+    removed: Dict[str, List[str]] = field(default_factory=lambda: {kind: [] for kind in KINDS})
+    # (min_x, min_y, max_x, max_y) areas whose objects or elevation were regenerated
+    dirty_regions: List[Bounds] = field(default_factory=list)
+    # Half-open tile windows whose terrain was repainted
+    terrain_regions: List[Tuple[int, int, int, int]] = field(default_factory=list)
+    
+    def record(self, kind: str, key: str, change: str):
+        """Note that an object was "added", "modified" or "removed", folding repeated edits together"""
+        added, modified, removed = self.added[kind], self.modified[kind], self.removed[kind]
+        if change == "added":
+            if key in removed:
+                removed.remove(key)
+                modified.append(key)
+            elif key not in added:
+                added.append(key)
+        elif change == "modified":
+            if key not in added and key not in modified:
+                modified.append(key)
+        elif change == "removed":
+            if key in added:
+                added.remove(key)
+                return
+            if key in modified:
+                modified.remove(key)
+            if key not in removed:
+                removed.append(key)
+        else:
+            raise ValueError(f"Unknown change {change!r}")
+    
+    def mark_dirty(self, bounds: Bounds):
+        self.dirty_regions.append(tuple(float(v) for v in bounds))
+    
+    def touched(self, kind: str) -> Set[str]:
+        """Keys of the objects of a kind that were added or modified"""
+        return set(self.added[kind]) | set(self.modified[kind])
+    
+    def filter(self, kind: str, items: Iterable[Any]) -> List[Any]:
+        """The added or modified objects among items (objects or their dict forms)"""
+        touched = self.touched(kind)
+        return [item for item in items if object_key(kind, item) in touched]
+    
+    def is_empty(self) -> bool:
+        return not (self.dirty_regions or any(self.added.values()) or any(self.modified.values())
+                    or any(self.removed.values()))
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "added": {kind: list(keys) for kind, keys in self.added.items()},
+            "modified": {kind: list(keys) for kind, keys in self.modified.items()},
+            "removed": {kind: list(keys) for kind, keys in self.removed.items()},
+            "dirty_regions": [list(bounds) for bounds in self.dirty_regions],
+            "terrain_regions": [list(bounds) for bounds in self.terrain_regions]
+        }
+
+def building_region(building, position=None) -> Bounds:
+    """Box around a building (at position, if given) that an edit to it makes dirty"""
+    position = position or building.position
+    footprint = building.properties.get("footprint") or (0.0, 0.0)
+    reach_x = footprint[0] / 2 + BUILDING_EDIT_MARGIN
+    reach_y = footprint[1] / 2 + BUILDING_EDIT_MARGIN
+    return (position.x - reach_x, position.y - reach_y, position.x + reach_x, position.y + reach_y)
+
+def merge_regions(regions: Iterable[Bounds]) -> List[Bounds]:
+    """Union overlapping boxes into their bounding boxes until none overlap"""
+    merged: List[Bounds] = []
+    for box in regions:
+        while True:
+            overlapping = [other for other in merged if box[0] <= other[2] and other[0] <= box[2]
+                           and box[1] <= other[3] and other[1] <= box[3]]
+            if not overlapping:
+                break
+            for other in overlapping:
+                merged.remove(other)
+                box = (min(box[0], other[0]), min(box[1], other[1]), max(box[2], other[2]), max(box[3], other[3]))
+        merged.append(box)
+    return merged
@@ -0,0 +1,194 @@
+"""
+Typed world objects and an array-backed container for them.
+"""
+
+from collections.abc import MutableSequence
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Type, Union
+
+import numpy as np
+
+from .data_types import WorldPosition
+
+@dataclass(slots=True)
+class PlacedObject:
+    """An object placed at a position in the world"""
+    id: str
+    type: str
+    position: WorldPosition
+    rotation: float = 0.0
+    scale: float = 1.0
+    properties: Dict[str, Any] = field(default_factory=dict)
+    
+    @classmethod
+    def from_dict(cls, item: Dict) -> "PlacedObject":
+        return cls(item["id"], item["type"], WorldPosition.from_dict(item["position"]),
+                   item.get("rotation", 0.0), item.get("scale", 1.0), dict(item.get("properties", {})))
+    
+    def to_dict(self) -> Dict:
+        return {
+            "id": self.id,
+            "type": self.type,
+            "position": self.position.to_dict(),
+            "rotation": self.rotation,
+            "scale": self.scale,
+            "properties": dict(self.properties)
+        }
+
+@dataclass(slots=True)
+class Building(PlacedObject):
+    """A building; properties carry importance and, in cities, district, lot and footprint"""
+
+@dataclass(slots=True)
+class NaturalFeature(PlacedObject):
+    """A decorative or interactive natural feature"""
+
+@dataclass(slots=True)
+class WorldPath:
+    """A road between two buildings, routed as an (M, 3) polyline from start to end"""
+    id: str
+    start: WorldPosition
+    end: WorldPosition
+    points: np.ndarray
+    length: float
+    width: float = 2.0
+    surface_type: str = "dirt"
+    properties: Dict[str, Any] = field(default_factory=dict)
+    
+    @property
+    def position(self) -> WorldPosition:
+        """Midpoint of the endpoints, used as the path's anchor"""
+        return WorldPosition((self.start.x + self.end.x) / 2, (self.start.y + self.end.y) / 2,
+                             (self.start.z + self.end.z) / 2)
+    
+    @classmethod
+    def from_dict(cls, item: Dict) -> "WorldPath":
+        points = item.get("points") or [item["start"], item["end"]]
+        points = np.array([[p["x"], p["y"], p.get("z", 0.0)] for p in points], dtype=np.float64).reshape(-1, 3)
+        length = item.get("length", float(np.hypot(*np.diff(points[:, :2], axis=0).T).sum()))
+        return cls(item["id"], WorldPosition.from_dict(item["start"]), WorldPosition.from_dict(item["end"]), points,
+                   length, item.get("width", 2.0), item.get("surface_type", "dirt"), dict(item.get("properties", {})))
+    
+    def to_dict(self) -> Dict:
+        return {
+            "id": self.id,
+            "start": self.start.to_dict(),
+            "end": self.end.to_dict(),
+            "points": [{"x": x, "y": y, "z": z} for x, y, z in self.points.tolist()],
+            "length": self.length,
+            "width": self.width,
+            "surface_type": self.surface_type,
+            "properties": dict(self.properties)
+        }
+
+@dataclass(slots=True)
+class SpawnPoint:
+    """A player spawn point; serialized flat as {"x", "y", "z", "type", ...}"""
+    position: WorldPosition
+    type: str = "default"
+    description: Optional[str] = None
+    
+    @classmethod
+    def from_dict(cls, item: Dict) -> "SpawnPoint":
+        return cls(WorldPosition.from_dict(item), item.get("type", "default"), item.get("description"))
+    
+    def to_dict(self) -> Dict:
+        spawn = {**self.position.to_dict(), "type": self.type}
+        if self.description is not None:
+            spawn["description"] = self.description
+        return spawn
+
+WorldObject = Union[Building, NaturalFeature, WorldPath, SpawnPoint]
+
+class WorldObjects(MutableSequence):
+    """
+    List of world objects that also exposes their positions as an (N, 3) float32 array.
+    
+    The array is built on first use and kept current by changes made through the
+    container, including move(). Call refresh() after moving an object in place.
+    Every change made through the container, or announced by refresh(), bumps
+    version, so caches derived from the objects can tell when they are stale.
+    """
+    
+    __slots__ = ("_items", "_positions", "_version")
+    
+    def __init__(self, items: Iterable[WorldObject] = ()):
+        self._items: List[WorldObject] = list(items)
+        self._positions: Optional[np.ndarray] = None
+        self._version = 0
+    
+    @classmethod
+    def from_dicts(cls, object_type: Type, items: Iterable[Dict]) -> "WorldObjects":
+        return cls(object_type.from_dict(item) for item in items)
+    
+    def to_dicts(self) -> List[Dict]:
+        return [item.to_dict() for item in self._items]
+    
+    def __len__(self) -> int:
+        return len(self._items)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return WorldObjects(self._items[index])
+        return self._items[index]
+    
+    def __setitem__(self, index, item):
+        self._items[index] = item
+        self._positions = None
+        self._version += 1
+    
+    def __delitem__(self, index):
+        del self._items[index]
+        self._positions = None
+        self._version += 1
+    
+    def insert(self, index: int, item: WorldObject):
+        self._items.insert(index, item)
+        self._positions = None
+        self._version += 1
+    
+    def __repr__(self) -> str:
+        return f"WorldObjects({len(self._items)} items)"
+    
+    @property
+    def version(self) -> int:
+        """Count of changes made through the container since it was created"""
+        return self._version
+    
+    @property
+    def positions(self) -> np.ndarray:
+        """(N, 3) float32 array of object positions"""
+        if self._positions is None:
+            positions = [item.position for item in self._items]
+            self._positions = np.array([(p.x, p.y, p.z) for p in positions], dtype=np.float32).reshape(-1, 3)
+        return self._positions
+    
+    def refresh(self):
+        """Drop the cached positions array after objects were moved in place"""
+        self._positions = None
+        self._version += 1
+    
+    def move(self, index: int, position: WorldPosition):
+        """Move an object, keeping the positions array current"""
+        self._items[index].position = position
+        if self._positions is not None:
+            self._positions[index] = (position.x, position.y, position.z)
+        self._version += 1
+    
+    def centroid(self) -> Optional[WorldPosition]:
+        """Mean position of the objects, or None if there are none"""
+        if not self._items:
+            return None
+        return WorldPosition(*(float(v) for v in self.positions.astype(np.float64).mean(axis=0)))
+    
+    def within(self, position: WorldPosition, radius: float) -> np.ndarray:
+        """Indices of objects whose xy position lies within radius of position"""
+        xy = self.positions[:, :2].astype(np.float64)
+        d2 = (xy[:, 0] - position.x) ** 2 + (xy[:, 1] - position.y) ** 2
+        return np.flatnonzero(d2 <= radius * radius)
+
+def as_world_objects(items: Iterable, object_type: Type) -> WorldObjects:
+    """Wrap objects or their dict forms in a WorldObjects container"""
+    if isinstance(items, WorldObjects):
+        return items
+    return WorldObjects(object_type.from_dict(item) if isinstance(item, dict) else item for item in items)
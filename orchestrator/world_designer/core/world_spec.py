@@ -2,17 +2,161 @@
 World specification data structures.
 """
 
-from typing import Dict, List, Tuple
-from dataclasses import dataclass
+import copy
+from typing import Any, Dict, List, Optional, Tuple, Union
+from dataclasses import dataclass, field, replace
 
-@dataclass
+from .data_types import WorldPosition, terrain_code
+from .region_index import KINDS, RegionIndex
+from .terrain_grid import TerrainGrid, terrain_rows
+from .terrain_store import open_terrain
+from .world_changes import ChangeSet, building_region
+from .world_objects import Building, NaturalFeature, SpawnPoint, WorldObjects, WorldPath, as_world_objects
+
+@dataclass(slots=True)
 class WorldSpec:
     theme: str
     size: Tuple[int, int]
-    terrain_map: List[List[str]]
-    buildings: List[Dict]
-    paths: List[Dict]
-    natural_features: List[Dict]
-    spawn_points: List[Dict]
+    terrain_map: Union[TerrainGrid, List[List[str]]]
+    buildings: WorldObjects
+    paths: WorldObjects
+    natural_features: WorldObjects
+    spawn_points: WorldObjects
     boundaries: Dict[str, float]
-    metadata: Dict
\ No newline at end of file
+    metadata: Dict
+    # Set instead of an embedded terrain_map when terrain lives in an on-disk array
+    terrain_ref: Optional[Dict] = None
+    # Region index and the object lists and versions it was built from
+    _region_index: Optional[Tuple[Tuple, RegionIndex]] = field(default=None, init=False, repr=False, compare=False)
+    # Edits made since the last regenerate()
+    _pending: Optional[ChangeSet] = field(default=None, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # Lists of objects or of their dict forms are both accepted
+        self.buildings = as_world_objects(self.buildings, Building)
+        self.paths = as_world_objects(self.paths, WorldPath)
+        self.natural_features = as_world_objects(self.natural_features, NaturalFeature)
+        self.spawn_points = as_world_objects(self.spawn_points, SpawnPoint)
+    
+    def region_index(self) -> RegionIndex:
+        """
+        Quadtree over buildings, natural features, paths and spawn points.
+        
+        Built on first use and rebuilt whenever a container's version changes: objects
+        added, removed, replaced or moved through it, or refresh() called after
+        moving objects in place.
+        """
+        key = tuple((id(objects), objects.version) for objects in (getattr(self, kind) for kind in KINDS))
+        if self._region_index is None or self._region_index[0] != key:
+            self._region_index = (key, RegionIndex.from_world_spec(self))
+        return self._region_index[1]
+    
+    @property
+    def pending_changes(self) -> ChangeSet:
+        """Edits made since the last regenerate(), with the regions they made dirty"""
+        if self._pending is None:
+            self._pending = ChangeSet()
+        return self._pending
+    
+    def add_building(self, building_type: str, position: WorldPosition, rotation: float = 0.0,
+                     properties: Optional[Dict[str, Any]] = None, building_id: Optional[str] = None) -> Building:
+        """Place a new building; roads, features and spawn points around it follow on regenerate()"""
+        ids = {b.id for b in self.buildings}
+        if building_id is None:
+            index = len(self.buildings)
+            while f"building_{index}" in ids:
+                index += 1
+            building_id = f"building_{index}"
+        elif building_id in ids:
+            raise ValueError(f"Building {building_id!r} already exists")
+        
+        building = Building(building_id, building_type, replace(position), rotation, properties=dict(properties or {}))
+        self.buildings.append(building)
+        self.pending_changes.record("buildings", building_id, "added")
+        self.pending_changes.mark_dirty(building_region(building))
+        self._region_index = None
+        return building
+    
+    def move_building(self, building_id: str, position: WorldPosition) -> Building:
+        """Move a building; roads, features and spawn points at both ends follow on regenerate()"""
+        index = self._building_index(building_id)
+        building = self.buildings[index]
+        self.pending_changes.mark_dirty(building_region(building))
+        self.buildings.move(index, replace(position))
+        self.pending_changes.mark_dirty(building_region(building))
+        self.pending_changes.record("buildings", building_id, "modified")
+        self._region_index = None
+        return building
+    
+    def remove_building(self, building_id: str) -> Building:
+        """Remove a building; its roads go and its ground is refilled on regenerate()"""
+        building = self.buildings.pop(self._building_index(building_id))
+        self.pending_changes.record("buildings", building_id, "removed")
+        self.pending_changes.mark_dirty(building_region(building))
+        self._region_index = None
+        return building
+    
+    def paint_terrain(self, terrain_type: str, min_x: int, min_y: int, max_x: int, max_y: int):
+        """Repaint the half-open tile window [min_x, max_x) x [min_y, max_y); roads crossing it are re-routed"""
+        code = terrain_code(terrain_type)
+        width, height = self.size
+        x0, y0 = max(int(min_x), 0), max(int(min_y), 0)
+        x1, y1 = min(int(max_x), width), min(int(max_y), height)
+        if x0 >= x1 or y0 >= y1:
+            return
+        
+        if self.terrain_ref:
+            # Imported here: the design cache builds on WorldSpec. On-disk terrain is written in
+            # place, so a spec still sharing its files with a cached design gets its own copies first
+            from .world_cache import detach_from_cache
+            detach_from_cache(self)
+        
+        terrain = open_terrain(self)
+        if terrain is None:
+            raise ValueError("World has no terrain to paint")
+        if not self.terrain_ref and not isinstance(self.terrain_map, TerrainGrid):
+            self.terrain_map = terrain
+        terrain.write_window(x0, y0, x1, y1, code)
+        if self.terrain_ref:
+            terrain.flush()
+        
+        self.pending_changes.terrain_regions.append((x0, y0, x1, y1))
+        self.pending_changes.mark_dirty((x0, y0, x1, y1))
+    
+    def regenerate(self) -> ChangeSet:
+        """
+        Rebuild what the pending edits affected and return the combined change set.
+        
+        Roads are re-planned over the new building set, but only those whose
+        endpoints changed or whose routing window crosses repainted terrain are
+        routed again; features, spawn points and elevation are regenerated inside
+        the dirty regions only.
+        """
+        # Imported here: generation builds on core, so core cannot import it at module level
+        from ..generation.incremental import _regenerate_dirty
+        
+        changes, self._pending = self.pending_changes, None
+        if changes.is_empty():
+            return changes
+        return _regenerate_dirty(self, changes)
+    
+    def _building_index(self, building_id: str) -> int:
+        for index, building in enumerate(self.buildings):
+            if building.id == building_id:
+                return index
+        raise KeyError(building_id)
+    
+    def to_dict(self) -> Dict:
+        """Convert to a JSON-serializable dict with a list-of-strings terrain map"""
+        return {
+            "theme": self.theme,
+            "size": self.size,
+            "terrain_map": terrain_rows(self.terrain_map),
+            "buildings": self.buildings.to_dicts(),
+            "paths": self.paths.to_dicts(),
+            "natural_features": self.natural_features.to_dicts(),
+            "spawn_points": self.spawn_points.to_dicts(),
+            "boundaries": dict(self.boundaries),
+            "metadata": copy.deepcopy(self.metadata),
+            "terrain_ref": copy.deepcopy(self.terrain_ref)
+        }
@@ -0,0 +1,332 @@
+"""
+Compact binary world-spec container with lazy, memory-mapped loading.
+
+Layout of a .wspec file:
+    8-byte magic, uint32 header length, JSON header, then 64-byte aligned array blocks.
+
+The header carries the small scalar fields (theme, size, spawn points, metadata)
+and a schema for every table. Buildings, paths and natural features are stored
+column by column: numbers as numeric arrays, nested coordinates as one column
+per axis, polylines as flat arrays plus offsets, repeated strings as category
+codes and everything else as JSON in a packed byte column. Terrain is a packed
+uint8 grid, or a reference to an existing chunked terrain file.
+"""
+
+import json
+import struct
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+
+from .terrain_grid import TerrainGrid, terrain_rows
+from .terrain_store import ChunkedTerrain
+from .world_spec import WorldSpec
+
+MAGIC = b"WSPEC\x00\x01\x00"
+_ALIGNMENT = 64
+_TABLES = ("buildings", "paths", "natural_features")
+_HEADER_FIELDS = ("theme", "size", "boundaries", "spawn_points", "metadata")
+
+# String columns with at most this many distinct values are stored as category codes
+MAX_CATEGORIES = 4096
+
+class _ArrayWriter:
+    """Collects arrays and their header entries, assigning aligned offsets"""
+    
+    def __init__(self):
+        self.arrays: List[np.ndarray] = []
+        self.entries: Dict[str, Dict] = {}
+        self.size = 0
+    
+    def add(self, name: str, array: np.ndarray) -> str:
+        array = np.ascontiguousarray(array)
+        self.size += -self.size % _ALIGNMENT
+        self.entries[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": self.size}
+        self.arrays.append(array)
+        self.size += array.nbytes
+        return name
+
+def save_world_spec(world_spec, path: Union[str, Path]) -> Path:
+    """
+    Write a world spec (WorldSpec or its dict form) to a compact .wspec file.
+    
+    Chunked terrain is referenced by path rather than copied.
+    """
+    if isinstance(world_spec, dict):
+        spec = world_spec
+    else:
+        spec = {field: getattr(world_spec, field) for field in (*_HEADER_FIELDS, "terrain_map", "terrain_ref")}
+        spec.update({name: getattr(world_spec, name).to_dicts() for name in (*_TABLES, "spawn_points")})
+    path = Path(path)
+    writer = _ArrayWriter()
+    
+    header: Dict[str, Any] = {field: spec.get(field) for field in _HEADER_FIELDS}
+    header["terrain_ref"] = spec.get("terrain_ref")
+    if not spec.get("terrain_ref") and spec.get("terrain_map"):
+        terrain = spec["terrain_map"]
+        codes = terrain.codes if isinstance(terrain, TerrainGrid) else TerrainGrid.from_rows(terrain).codes
+        header["terrain"] = writer.add("terrain", codes)
+    
+    header["tables"] = {name: _encode_table(spec.get(name) or [], name, writer) for name in _TABLES}
+    header["arrays"] = writer.entries
+    
+    header_bytes = json.dumps(header, separators=(",", ":"), default=_json_default).encode("utf-8")
+    data_start = len(MAGIC) + 4 + len(header_bytes)
+    data_start += -data_start % _ALIGNMENT
+    
+    with open(path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<I", len(header_bytes)))
+        f.write(header_bytes)
+        f.write(b"\x00" * (data_start - f.tell()))
+        for array, entry in zip(writer.arrays, writer.entries.values()):
+            f.write(b"\x00" * (data_start + entry["offset"] - f.tell()))
+            f.write(array.tobytes())
+    
+    return path
+
+def load_world_spec(path: Union[str, Path]) -> "CompactWorldSpec":
+    """Open a .wspec file; arrays are memory-mapped and rows decoded on access"""
+    return CompactWorldSpec(path)
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return str(value)
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float, np.number)) and not isinstance(value, bool)
+
+def _is_coordinate(value) -> bool:
+    return isinstance(value, dict) and bool(value) and all(_is_number(v) for v in value.values())
+
+def _encode_table(rows: Sequence[Dict], table: str, writer: _ArrayWriter) -> Dict:
+    """Encode a list of dicts column by column; returns the table schema"""
+    keys: List[str] = []
+    for row in rows:
+        keys.extend(key for key in row if key not in keys)
+    
+    columns = []
+    for key in keys:
+        values = [row.get(key, _MISSING) for row in rows]
+        name = f"{table}/{key}"
+        present = [v for v in values if v is not _MISSING]
+        
+        if len(present) < len(values):
+            kind = "json"
+        elif all(isinstance(v, bool) for v in values):
+            kind = "bool"
+        elif all(_is_number(v) for v in values):
+            kind = "int" if all(isinstance(v, (int, np.integer)) for v in values) else "float"
+        elif all(_is_coordinate(v) for v in values) and len({tuple(v) for v in values}) == 1:
+            kind = "coordinate"
+        elif all(isinstance(v, list) and all(_is_coordinate(p) for p in v) for v in values) and \
+                len({tuple(p) for v in values for p in v}) == 1:
+            kind = "polyline"
+        elif all(isinstance(v, str) for v in values) and len(set(values)) <= min(MAX_CATEGORIES, max(len(values) // 2, 1)):
+            kind = "category"
+        else:
+            kind = "json"
+        
+        column: Dict[str, Any] = {"key": key, "kind": kind}
+        if kind == "bool":
+            column["array"] = writer.add(name, np.array(values, dtype=np.bool_))
+        elif kind == "int":
+            column["array"] = writer.add(name, np.array(values, dtype=np.int64))
+        elif kind == "float":
+            column["array"] = writer.add(name, np.array(values, dtype=np.float64))
+        elif kind == "coordinate":
+            column["axes"] = {axis: writer.add(f"{name}.{axis}", np.array([v[axis] for v in values], dtype=np.float64))
+                              for axis in values[0]}
+        elif kind == "polyline":
+            axes = next(tuple(p) for v in values for p in v)
+            column["offsets"] = writer.add(f"{name}.offsets", np.cumsum([0] + [len(v) for v in values], dtype=np.int64))
+            column["axes"] = {axis: writer.add(f"{name}.{axis}", np.array([p[axis] for v in values for p in v], dtype=np.float64))
+                              for axis in axes}
+        elif kind == "category":
+            categories = sorted(set(values))
+            lookup = {value: i for i, value in enumerate(categories)}
+            column["categories"] = categories
+            column["array"] = writer.add(name, np.array([lookup[v] for v in values], dtype=np.uint16))
+        else:
+            encoded = [b"" if v is _MISSING else json.dumps(v, separators=(",", ":"), default=_json_default).encode("utf-8")
+                       for v in values]
+            column["offsets"] = writer.add(f"{name}.offsets", np.cumsum([0] + [len(e) for e in encoded], dtype=np.int64))
+            column["array"] = writer.add(name, np.frombuffer(b"".join(encoded) or b"\x00", dtype=np.uint8))
+        columns.append(column)
+    
+    return {"count": len(rows), "columns": columns}
+
+class _Missing:
+    """Marker for keys absent from a row"""
+
+_MISSING = _Missing()
+
+class LazyTable(Sequence):
+    """
+    Read-only list of row dicts backed by memory-mapped columns.
+    
+    Rows are rebuilt only when indexed; column() exposes a whole column as an
+    array for fast partial reads (e.g. every building's x coordinate).
+    """
+    
+    def __init__(self, store: "CompactWorldSpec", schema: Dict):
+        self._store = store
+        self._count = schema["count"]
+        self._columns = {column["key"]: column for column in schema["columns"]}
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def keys(self) -> List[str]:
+        return list(self._columns)
+    
+    def column(self, key: str, axis: Optional[str] = None) -> np.ndarray:
+        """Column key as an array; coordinate columns need an axis, e.g. column("position", "x")"""
+        column = self._columns[key]
+        if column["kind"] in ("coordinate", "polyline"):
+            return self._store._array(column["axes"][axis])
+        if column["kind"] == "category":
+            return np.asarray(column["categories"], dtype=object)[self._store._array(column["array"])]
+        if column["kind"] == "json":
+            return np.array([self._value(column, i) for i in range(self._count)], dtype=object)
+        return self._store._array(column["array"])
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        row = {}
+        for key, column in self._columns.items():
+            value = self._value(column, index)
+            if value is not _MISSING:
+                row[key] = value
+        return row
+    
+    def __iter__(self) -> Iterator[Dict]:
+        for i in range(self._count):
+            yield self[i]
+    
+    def _value(self, column: Dict, i: int):
+        kind, array = column["kind"], self._store._array
+        if kind == "bool":
+            return bool(array(column["array"])[i])
+        if kind == "int":
+            return int(array(column["array"])[i])
+        if kind == "float":
+            return float(array(column["array"])[i])
+        if kind == "coordinate":
+            return {axis: float(array(name)[i]) for axis, name in column["axes"].items()}
+        if kind == "polyline":
+            start, stop = array(column["offsets"])[i:i + 2].tolist()
+            coordinates = {axis: array(name)[start:stop].tolist() for axis, name in column["axes"].items()}
+            return [dict(zip(coordinates, values)) for values in zip(*coordinates.values())]
+        if kind == "category":
+            return column["categories"][int(array(column["array"])[i])]
+        start, stop = array(column["offsets"])[i:i + 2].tolist()
+        if start == stop:
+            return _MISSING
+        return json.loads(array(column["array"])[start:stop].tobytes())
+
+class CompactWorldSpec:
+    """
+    Lazy view of a .wspec file with the same fields as WorldSpec.
+    
+    Only the JSON header is read on open; arrays are memory-mapped on first use.
+    """
+    
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{self.path} is not a compact world spec")
+            (header_length,) = struct.unpack("<I", f.read(4))
+            self.header = json.loads(f.read(header_length))
+        data_start = len(MAGIC) + 4 + header_length
+        self._data_start = data_start + (-data_start % _ALIGNMENT)
+        self._arrays: Dict[str, np.ndarray] = {}
+        self._tables: Dict[str, LazyTable] = {}
+    
+    def _array(self, name: str) -> np.ndarray:
+        if name not in self._arrays:
+            entry = self.header["arrays"][name]
+            if 0 in entry["shape"]:
+                self._arrays[name] = np.empty(entry["shape"], dtype=entry["dtype"])
+            else:
+                self._arrays[name] = np.memmap(self.path, dtype=entry["dtype"], mode="r",
+                                               offset=self._data_start + entry["offset"], shape=tuple(entry["shape"]))
+        return self._arrays[name]
+    
+    def _table(self, name: str) -> LazyTable:
+        if name not in self._tables:
+            self._tables[name] = LazyTable(self, self.header["tables"][name])
+        return self._tables[name]
+    
+    theme = property(lambda self: self.header["theme"])
+    size = property(lambda self: tuple(self.header["size"]))
+    boundaries = property(lambda self: self.header["boundaries"])
+    spawn_points = property(lambda self: self.header["spawn_points"])
+    metadata = property(lambda self: self.header["metadata"])
+    terrain_ref = property(lambda self: self.header.get("terrain_ref"))
+    buildings = property(lambda self: self._table("buildings"))
+    paths = property(lambda self: self._table("paths"))
+    natural_features = property(lambda self: self._table("natural_features"))
+    
+    @property
+    def terrain(self) -> Optional[Union[TerrainGrid, ChunkedTerrain]]:
+        """Terrain grid over the memory-mapped codes, or the referenced chunked terrain"""
+        if self.terrain_ref:
+            return ChunkedTerrain.from_ref(self.terrain_ref)
+        if "terrain" in self.header:
+            return TerrainGrid(self._array(self.header["terrain"]))
+        return None
+    
+    @property
+    def terrain_map(self):
+        terrain = self.terrain
+        return terrain if isinstance(terrain, TerrainGrid) else []
+    
+    def summary(self) -> Dict[str, Any]:
+        """Header fields and table sizes, without decoding any rows"""
+        return {
+            **{field: self.header[field] for field in _HEADER_FIELDS},
+            "terrain_ref": self.terrain_ref,
+            "counts": {name: len(self._table(name)) for name in _TABLES}
+        }
+    
+    def to_world_spec(self) -> WorldSpec:
+        """Fully decoded WorldSpec; grid terrain is copied out of the file into memory"""
+        terrain = self.terrain
+        return WorldSpec(
+            theme=self.theme,
+            size=self.size,
+            terrain_map=TerrainGrid(np.array(terrain.codes)) if isinstance(terrain, TerrainGrid) else [],
+            buildings=list(self.buildings),
+            paths=list(self.paths),
+            natural_features=list(self.natural_features),
+            spawn_points=self.spawn_points,
+            boundaries=self.boundaries,
+            metadata=self.metadata,
+            terrain_ref=self.terrain_ref
+        )
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Fully decoded dict, matching WorldSpec.to_dict(); used for the JSON export"""
+        return {
+            "theme": self.theme,
+            "size": list(self.size),
+            "terrain_map": terrain_rows(self.terrain_map),
+            "buildings": list(self.buildings),
+            "paths": list(self.paths),
+            "natural_features": list(self.natural_features),
+            "spawn_points": self.spawn_points,
+            "boundaries": self.boundaries,
+            "metadata": self.metadata,
+            "terrain_ref": self.terrain_ref
+        }
@@ -4,12 +4,25 @@ Building placement and layout algorithms.
 
 import math
 import random
-from typing import Dict, List, Tuple
-from ..utils.spatial_utils import _distance
+from typing import Dict, List, Optional, Tuple
 
-def _plan_building_placement(analysis: Dict, size: Tuple[int, int], terrain_map: List[List[str]]) -> List[Dict]:
-    """Plan intelligent building placement"""
+import numpy as np
+
+from ..core.data_types import WorldPosition
+from ..core.world_objects import Building
+from ..utils.spatial_utils import SpatialIndex
+from ..utils.theme_configs import _get_placement_spacing
+from .poisson_disk import _poisson_disk_sample
+from .city_layout import _create_complex_grid_layout
+
+# How far beyond the existing buildings houses may spread
+SETTLEMENT_MARGIN = 20
+
+def _plan_building_placement(analysis: Dict, size: Tuple[int, int], terrain_map: List[List[str]],
+                             rng: Optional[random.Random] = None) -> List[Building]:
+    """Plan intelligent building placement; all randomness is drawn from rng"""
     
+    rng = rng or random.Random()
     buildings = []
     theme = analysis.get("theme", "medieval")
     layout_type = analysis.get("layout_type", "radial")
@@ -22,32 +35,40 @@ def _plan_building_placement(analysis: Dict, size: Tuple[int, int], terrain_map:
     if layout_type == "radial":
         buildings = _create_radial_layout(key_features, center_x, center_y, theme)
     elif layout_type == "grid":
-        buildings = _create_grid_layout(key_features, size, theme)
+        buildings = _create_grid_layout(key_features, size, theme, rng)
     elif layout_type == "linear":
-        buildings = _create_linear_layout(key_features, size, theme)
+        buildings = _create_linear_layout(key_features, size, theme, rng)
+    elif layout_type == "complex_grid":
+        buildings = _create_complex_grid_layout(key_features, size, theme, terrain_map, rng)
+        if not buildings:
+            # No room for a single city block; lay the key buildings out as a village instead
+            print("🏙️ Map too small for city blocks, using radial layout")
+            layout_type = "radial"
+            buildings = _create_radial_layout(key_features, center_x, center_y, theme)
     else:
         buildings = _create_radial_layout(key_features, center_x, center_y, theme)
     
-    # Add additional houses to fill out the settlement
-    buildings.extend(_add_residential_buildings(buildings, size, theme))
+    # Add additional houses to fill out the settlement; city blocks are already full
+    if layout_type != "complex_grid":
+        buildings.extend(_add_residential_buildings(buildings, size, theme, rng))
     
     return buildings
 
-def _create_radial_layout(key_features: List[str], center_x: float, center_y: float, theme: str) -> List[Dict]:
+def _create_radial_layout(key_features: List[str], center_x: float, center_y: float, theme: str) -> List[Building]:
     """Create radial layout with center plaza"""
     buildings = []
     
     # Central feature (fountain, market, etc.)
     if "fountain" in key_features or "market" in key_features:
         central_type = "fountain" if "fountain" in key_features else "market"
-        buildings.append({
-            "id": "building_center",
-            "type": central_type,
-            "position": {"x": center_x, "y": center_y, "z": 0.0},
-            "rotation": 0.0,
-            "scale": 1.2,
-            "properties": {"importance": "high", "central": True}
-        })
+        buildings.append(Building(
+            id="building_center",
+            type=central_type,
+            position=WorldPosition(center_x, center_y),
+            rotation=0.0,
+            scale=1.2,
+            properties={"importance": "high", "central": True}
+        ))
     
     # Place key buildings in circle around center
     radius = 12
@@ -59,18 +80,19 @@ def _create_radial_layout(key_features: List[str], center_x: float, center_y: fl
         x = center_x + radius * math.cos(angle)
         y = center_y + radius * math.sin(angle)
         
-        buildings.append({
-            "id": f"building_{len(buildings)}",
-            "type": building_type,
-            "position": {"x": x, "y": y, "z": 0.0},
-            "rotation": math.degrees(angle + math.pi),  # Face center
-            "scale": 1.0,
-            "properties": {"importance": "high" if building_type in ["tavern", "church"] else "normal"}
-        })
+        buildings.append(Building(
+            id=f"building_{len(buildings)}",
+            type=building_type,
+            position=WorldPosition(x, y),
+            rotation=math.degrees(angle + math.pi),  # Face center
+            scale=1.0,
+            properties={"importance": "high" if building_type in ["tavern", "church"] else "normal"}
+        ))
     
     return buildings
 
-def _create_grid_layout(key_features: List[str], size: Tuple[int, int], theme: str) -> List[Dict]:
+def _create_grid_layout(key_features: List[str], size: Tuple[int, int], theme: str,
+                        rng: random.Random) -> List[Building]:
     """Create grid-based town layout"""
     buildings = []
     
@@ -87,18 +109,19 @@ def _create_grid_layout(key_features: List[str], size: Tuple[int, int], theme: s
         x = start_x + grid_x * grid_spacing
         y = start_y + grid_y * grid_spacing
         
-        buildings.append({
-            "id": f"building_{len(buildings)}",
-            "type": building_type,
-            "position": {"x": x, "y": y, "z": 0.0},
-            "rotation": random.uniform(0, 360),
-            "scale": 1.0,
-            "properties": {"importance": "high" if building_type in ["market", "church"] else "normal"}
-        })
+        buildings.append(Building(
+            id=f"building_{len(buildings)}",
+            type=building_type,
+            position=WorldPosition(x, y),
+            rotation=rng.uniform(0, 360),
+            scale=1.0,
+            properties={"importance": "high" if building_type in ["market", "church"] else "normal"}
+        ))
     
     return buildings
 
-def _create_linear_layout(key_features: List[str], size: Tuple[int, int], theme: str) -> List[Dict]:
+def _create_linear_layout(key_features: List[str], size: Tuple[int, int], theme: str,
+                          rng: random.Random) -> List[Building]:
     """Create linear outpost layout"""
     buildings = []
     
@@ -108,50 +131,53 @@ def _create_linear_layout(key_features: List[str], size: Tuple[int, int], theme:
     
     for i, building_type in enumerate(key_features):
         x = spacing * (i + 1)
-        y = road_y + random.uniform(-3, 3)  # Slight variation
+        y = road_y + rng.uniform(-3, 3)  # Slight variation
         
-        buildings.append({
-            "id": f"building_{len(buildings)}",
-            "type": building_type,
-            "position": {"x": x, "y": y, "z": 0.0},
-            "rotation": random.uniform(-30, 30),
-            "scale": 1.0,
-            "properties": {"importance": "normal"}
-        })
+        buildings.append(Building(
+            id=f"building_{len(buildings)}",
+            type=building_type,
+            position=WorldPosition(x, y),
+            rotation=rng.uniform(-30, 30),
+            scale=1.0,
+            properties={"importance": "normal"}
+        ))
     
     return buildings
 
-def _add_residential_buildings(existing_buildings: List[Dict], size: Tuple[int, int], theme: str) -> List[Dict]:
+def _add_residential_buildings(existing_buildings: List[Building], size: Tuple[int, int], theme: str,
+                               rng: random.Random) -> List[Building]:
     """Add residential buildings to fill out the settlement"""
     houses = []
     
     # Add 3-6 additional houses
-    house_count = random.randint(3, 6)
-    
-    for i in range(house_count):
-        # Find position away from existing buildings
-        attempts = 0
-        while attempts < 20:
-            x = random.uniform(5, size[0] - 5)
-            y = random.uniform(5, size[1] - 5)
-            
-            # Check distance from existing buildings
-            too_close = any(
-                _distance({"x": x, "y": y}, b["position"]) < 6
-                for b in existing_buildings
-            )
-            
-            if not too_close:
-                houses.append({
-                    "id": f"house_{len(houses)}",
-                    "type": "house",
-                    "position": {"x": x, "y": y, "z": 0.0},
-                    "rotation": random.uniform(0, 360),
-                    "scale": random.uniform(0.8, 1.2),
-                    "properties": {"importance": "low", "residential": True}
-                })
-                break
-            
-            attempts += 1
-    
-    return houses
\ No newline at end of file
+    house_count = rng.randint(3, 6)
+    spacing = _get_placement_spacing(theme)["house"]
+    
+    # Evenly spaced lots around the settlement, away from existing buildings
+    occupied = SpatialIndex.from_items(existing_buildings)
+    np_rng = np.random.default_rng(rng.getrandbits(64))
+    xs, ys = _poisson_disk_sample(_settlement_bounds(existing_buildings, size), spacing, np_rng,
+                                  exclude=lambda x, y: occupied.within_mask(x, y, spacing))
+    
+    lots = np_rng.choice(len(xs), size=min(house_count, len(xs)), replace=False)
+    for lot in sorted(lots.tolist()):
+        houses.append(Building(
+            id=f"house_{len(houses)}",
+            type="house",
+            position=WorldPosition(float(xs[lot]), float(ys[lot])),
+            rotation=rng.uniform(0, 360),
+            scale=rng.uniform(0.8, 1.2),
+            properties={"importance": "low", "residential": True}
+        ))
+    
+    return houses
+
+def _settlement_bounds(buildings: List[Building], size: Tuple[int, int]) -> Tuple[float, float, float, float]:
+    """Area houses may occupy: the buildings' extent plus a margin, kept 5 tiles inside the map"""
+    x0, y0, x1, y1 = 5, 5, size[0] - 5, size[1] - 5
+    if buildings:
+        xs = [b.position.x for b in buildings]
+        ys = [b.position.y for b in buildings]
+        x0, x1 = max(x0, min(xs) - SETTLEMENT_MARGIN), min(x1, max(xs) + SETTLEMENT_MARGIN)
+        y0, y1 = max(y0, min(ys) - SETTLEMENT_MARGIN), min(y1, max(ys) + SETTLEMENT_MARGIN)
+    return x0, y0, x1, y1
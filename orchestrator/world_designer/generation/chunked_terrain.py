@@ -0,0 +1,35 @@
+"""
+Chunked terrain generation into a memory-mapped on-disk array.
+"""
+
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+from ..core.terrain_store import ChunkedTerrain, DEFAULT_TILE_SIZE
+from ...seeding import new_seed
+from .terrain_generator import _generate_terrain_window
+
+# Worlds with at least this many tiles use chunked terrain when an output directory is available
+CHUNKED_TERRAIN_MIN_TILES = 4096 * 4096
+
+def _generate_chunked_terrain(size: Tuple[int, int], theme: str, path: Union[str, Path],
+                              seed: Optional[int] = None,
+                              tile_size: int = DEFAULT_TILE_SIZE) -> ChunkedTerrain:
+    """Generate terrain tile by tile into a memory-mapped array at path"""
+    
+    if seed is None:
+        seed = new_seed()
+    
+    store = ChunkedTerrain.create(path, size, tile_size)
+    columns, rows = store.tile_grid()
+    
+    print(f"🧩 Generating chunked terrain for {theme} theme: {columns}x{rows} tiles of {tile_size}")
+    
+    # Windows are position-addressed, so tiles match a whole-grid pass with the same seed
+    for ty in range(rows):
+        for tx in range(columns):
+            bounds = store.tile_bounds(tx, ty)
+            store.write_tile(tx, ty, _generate_terrain_window(size, theme, seed, bounds))
+    
+    store.flush()
+    return store
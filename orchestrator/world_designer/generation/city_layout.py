@@ -0,0 +1,242 @@
+"""
+City layout: street grid, recursive lot subdivision and district zoning.
+"""
+
+import math
+import random
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from ..core.data_types import BLOCKING_TERRAIN, WorldPosition, terrain_code
+from ..core.world_objects import Building
+from ..core.terrain_store import as_terrain
+
+# Street grid pitch (block plus street) and street widths; every third street is an avenue
+BLOCK_PITCH = 24
+STREET_WIDTH = 2
+AVENUE_WIDTH = 4
+AVENUE_EVERY = 3
+
+# Lots are split until their longer side is at most MAX_LOT_SIZE
+MAX_LOT_SIZE = 10
+LOT_SETBACK = 1
+
+# Cities are laid out in at most this many tiles square around the map center
+CITY_MAX_EXTENT = 512
+CITY_EDGE_MARGIN = 4
+PLAZA_RADIUS = 6
+
+# Landmarks left without a lot ring the plaza at this distance from the center
+LANDMARK_RING_RADIUS = 12
+
+# District by normalized distance from the center (upper bounds), with building mixes
+DISTRICT_BANDS = [("civic", 0.15), ("commercial", 0.45), ("residential", 1.0), ("industrial", float("inf"))]
+DISTRICT_BUILDINGS = {
+    "civic": {"church": 0.3, "tower": 0.2, "market": 0.2, "shop": 0.3},
+    "commercial": {"shop": 0.5, "tavern": 0.2, "house": 0.3},
+    "residential": {"house": 0.9, "shop": 0.05, "tavern": 0.05},
+    "industrial": {"blacksmith": 0.5, "house": 0.3, "tower": 0.2}
+}
+
+def _create_complex_grid_layout(key_features: List[str], size: Tuple[int, int], theme: str,
+                                terrain_map=None, rng: Optional[random.Random] = None) -> List[Building]:
+    """
+    Create city layout: street grid blocks subdivided into lots, zoned into districts.
+    
+    Returns an empty list when the map is too small (or too blocked) to hold any lot,
+    so the caller can fall back to a village layout.
+    """
+    rng = np.random.default_rng((rng or random.Random()).getrandbits(64))
+    center_x, center_y = size[0] // 2, size[1] // 2
+    half_extent = min(size[0], size[1], CITY_MAX_EXTENT) // 2 - CITY_EDGE_MARGIN
+    if half_extent < MAX_LOT_SIZE:
+        return []
+    bounds = (center_x - half_extent, center_y - half_extent, center_x + half_extent, center_y + half_extent)
+    
+    blocks = _street_grid_blocks(bounds)
+    lots, lot_blocks = _subdivide_blocks(blocks, rng)
+    
+    # Only lots with street frontage are built on; interior lots stay as yards
+    frontage = ((lots[:, 0] == lot_blocks[:, 0]) | (lots[:, 1] == lot_blocks[:, 1]) |
+                (lots[:, 2] == lot_blocks[:, 2]) | (lots[:, 3] == lot_blocks[:, 3]))
+    lots, lot_blocks = lots[frontage], lot_blocks[frontage]
+    
+    footprints = _pack_footprints(lots, rng)
+    centers = (footprints[:, :2] + footprints[:, 2:]) / 2
+    
+    # Clear a central plaza for the landmark
+    central_type = next((t for t in ("fountain", "market") if t in key_features), None)
+    keep = np.ones(len(lots), dtype=bool)
+    if central_type:
+        keep &= ~_rects_overlap(footprints, (center_x - PLAZA_RADIUS, center_y - PLAZA_RADIUS,
+                                             center_x + PLAZA_RADIUS, center_y + PLAZA_RADIUS))
+    if terrain_map is not None:
+        keep &= _buildable(footprints, as_terrain(terrain_map), bounds)
+    lots, lot_blocks, footprints, centers = lots[keep], lot_blocks[keep], footprints[keep], centers[keep]
+    if len(lots) == 0:
+        return []
+    
+    districts = _zone_districts(centers, (center_x, center_y), half_extent, rng)
+    types = _assign_building_types(districts, rng)
+    rotations = _street_facing_rotation(centers, lot_blocks)
+    
+    # Key buildings take the lots closest to the center
+    distance = np.hypot(centers[:, 0] - center_x, centers[:, 1] - center_y)
+    landmarks = [t for t in key_features if t != central_type]
+    key_lots = np.argsort(distance, kind="stable")[:len(landmarks)]
+    for lot, building_type in zip(key_lots.tolist(), landmarks):
+        types[lot] = building_type
+    unplaced = landmarks[len(key_lots):]
+    important = np.zeros(len(lots), dtype=bool)
+    important[key_lots] = True
+    
+    buildings = []
+    if central_type:
+        buildings.append(Building(
+            id="building_center",
+            type=central_type,
+            position=WorldPosition(float(center_x), float(center_y)),
+            rotation=0.0,
+            scale=1.2,
+            properties={"importance": "high", "central": True, "district": "civic"}
+        ))
+    
+    sizes = footprints[:, 2:] - footprints[:, :2]
+    scales = np.clip(sizes.min(axis=1) / 6, 0.6, 1.5).round(2)
+    for i in np.argsort(distance, kind="stable").tolist():
+        buildings.append(Building(
+            id=f"building_{len(buildings)}",
+            type=types[i],
+            position=WorldPosition(float(centers[i, 0]), float(centers[i, 1])),
+            rotation=float(rotations[i]),
+            scale=float(scales[i]),
+            properties={
+                "importance": "high" if important[i] else ("low" if types[i] == "house" else "normal"),
+                "district": districts[i],
+                "lot": lots[i].tolist(),
+                "footprint": sizes[i].tolist(),
+                "residential": types[i] == "house"
+            }
+        ))
+    
+    # Landmarks beyond the available lots ring the plaza instead of being dropped
+    for i, building_type in enumerate(unplaced):
+        angle = 2 * math.pi * i / len(unplaced)
+        buildings.append(Building(
+            id=f"building_{len(buildings)}",
+            type=building_type,
+            position=WorldPosition(center_x + LANDMARK_RING_RADIUS * math.cos(angle),
+                                   center_y + LANDMARK_RING_RADIUS * math.sin(angle)),
+            rotation=math.degrees(angle + math.pi),  # Face center
+            scale=1.0,
+            properties={"importance": "high", "district": "civic", "residential": building_type == "house"}
+        ))
+    
+    print(f"🏙️ City layout: {len(blocks)} blocks, {len(buildings)} buildings")
+    return buildings
+
+def _street_grid_blocks(bounds: Tuple[int, int, int, int]) -> np.ndarray:
+    """Blocks (x0, y0, x1, y1) between the streets of a regular grid inside bounds"""
+    x0, y0, x1, y1 = bounds
+    
+    def spans(start: int, stop: int) -> np.ndarray:
+        streets = np.arange(start, stop + 1, BLOCK_PITCH)
+        widths = np.where(np.arange(len(streets)) % AVENUE_EVERY == 0, AVENUE_WIDTH, STREET_WIDTH)
+        return np.stack([streets[:-1] + widths[:-1] // 2, streets[1:] - widths[1:] // 2], axis=1)
+    
+    columns, rows = spans(x0, x1), spans(y0, y1)
+    blocks = np.empty((len(rows), len(columns), 4), dtype=np.int64)
+    blocks[:, :, 0], blocks[:, :, 2] = columns[None, :, 0], columns[None, :, 1]
+    blocks[:, :, 1], blocks[:, :, 3] = rows[:, None, 0], rows[:, None, 1]
+    return blocks.reshape(-1, 4)
+
+def _subdivide_blocks(blocks: np.ndarray, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Recursively split blocks across their longer side until every lot fits MAX_LOT_SIZE.
+    
+    All oversized lots are split together each round, so the number of rounds is
+    logarithmic in the block size. Returns the lots and each lot's parent block.
+    """
+    lots, parents = blocks.copy(), blocks.copy()
+    while True:
+        width, height = lots[:, 2] - lots[:, 0], lots[:, 3] - lots[:, 1]
+        split = np.maximum(width, height) > MAX_LOT_SIZE
+        if not split.any():
+            return lots, parents
+        
+        # Cut near the middle of the longer side
+        long_side = np.maximum(width, height)[split]
+        vertical = (width >= height)[split]
+        offset = np.rint(long_side * rng.uniform(0.4, 0.6, split.sum())).astype(np.int64)
+        first, second = lots[split].copy(), lots[split].copy()
+        cut_x = first[:, 0] + offset
+        cut_y = first[:, 1] + offset
+        first[vertical, 2] = second[vertical, 0] = cut_x[vertical]
+        first[~vertical, 3] = second[~vertical, 1] = cut_y[~vertical]
+        
+        lots = np.concatenate([lots[~split], first, second])
+        parents = np.concatenate([parents[~split], parents[split], parents[split]])
+
+def _pack_footprints(lots: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """Building footprints (x0, y0, x1, y1) inside each lot after the setback"""
+    inner = lots.astype(np.float64) + np.array([LOT_SETBACK, LOT_SETBACK, -LOT_SETBACK, -LOT_SETBACK])
+    size = np.maximum(inner[:, 2:] - inner[:, :2], 1.0) * rng.uniform(0.7, 1.0, (len(lots), 2))
+    center = (inner[:, :2] + inner[:, 2:]) / 2
+    return np.concatenate([center - size / 2, center + size / 2], axis=1)
+
+def _rects_overlap(rects: np.ndarray, area: Tuple[float, float, float, float]) -> np.ndarray:
+    x0, y0, x1, y1 = area
+    return (rects[:, 0] < x1) & (rects[:, 2] > x0) & (rects[:, 1] < y1) & (rects[:, 3] > y0)
+
+def _buildable(footprints: np.ndarray, terrain, bounds: Tuple[int, int, int, int]) -> np.ndarray:
+    """True for footprints with no unbuildable tiles, via a summed-area table over the city window"""
+    x0, y0 = max(bounds[0], 0), max(bounds[1], 0)
+    x1, y1 = min(bounds[2], terrain.width), min(bounds[3], terrain.height)
+    codes = np.asarray(terrain.read_window(x0, y0, x1, y1))
+    blocked = np.isin(codes, [terrain_code(name) for name in BLOCKING_TERRAIN])
+    
+    table = np.zeros((blocked.shape[0] + 1, blocked.shape[1] + 1), dtype=np.int32)
+    table[1:, 1:] = blocked.cumsum(axis=0).cumsum(axis=1)
+    
+    # Tile ranges covered by each footprint, relative to the window
+    left = np.clip(np.floor(footprints[:, 0]).astype(np.int64) - x0, 0, blocked.shape[1])
+    top = np.clip(np.floor(footprints[:, 1]).astype(np.int64) - y0, 0, blocked.shape[0])
+    right = np.clip(np.ceil(footprints[:, 2]).astype(np.int64) - x0, 0, blocked.shape[1])
+    bottom = np.clip(np.ceil(footprints[:, 3]).astype(np.int64) - y0, 0, blocked.shape[0])
+    count = table[bottom, right] - table[top, right] - table[bottom, left] + table[top, left]
+    return count == 0
+
+def _zone_districts(centers: np.ndarray, center: Tuple[float, float], half_extent: float,
+                    rng: np.random.Generator) -> List[str]:
+    """District per lot from jittered distance to the city center"""
+    radius = np.hypot(centers[:, 0] - center[0], centers[:, 1] - center[1]) / half_extent
+    radius += rng.uniform(-0.08, 0.08, len(centers))
+    limits = np.array([limit for _, limit in DISTRICT_BANDS[:-1]])
+    names = [name for name, _ in DISTRICT_BANDS]
+    return [names[i] for i in np.searchsorted(limits, radius).tolist()]
+
+def _assign_building_types(districts: List[str], rng: np.random.Generator) -> List[str]:
+    """Draw a building type per lot from its district's mix"""
+    types: List[Optional[str]] = [None] * len(districts)
+    district_array = np.array(districts)
+    for district, mix in DISTRICT_BUILDINGS.items():
+        members = np.flatnonzero(district_array == district)
+        if len(members) == 0:
+            continue
+        choices = list(mix.keys())
+        weights = np.array(list(mix.values()))
+        drawn = rng.choice(len(choices), size=len(members), p=weights / weights.sum())
+        for lot, choice in zip(members.tolist(), drawn.tolist()):
+            types[lot] = choices[choice]
+    return types
+
+def _street_facing_rotation(centers: np.ndarray, blocks: np.ndarray) -> np.ndarray:
+    """Rotation in degrees so each building faces the nearest edge of its block"""
+    gaps = np.stack([
+        centers[:, 1] - blocks[:, 1],  # north edge
+        blocks[:, 2] - centers[:, 0],  # east edge
+        blocks[:, 3] - centers[:, 1],  # south edge
+        centers[:, 0] - blocks[:, 0]   # west edge
+    ], axis=1)
+    return np.argmin(gaps, axis=1) * 90.0
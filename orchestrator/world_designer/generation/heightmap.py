@@ -0,0 +1,300 @@
+"""
+Heightmap generation: elevation from terrain classes and noise, thermal erosion,
+flattened building pads, and 16-bit raw/PNG export.
+
+Heights are computed window by window with a halo wide enough for the smoothing
+and erosion steps, so a tiled pass over a chunked world gives exactly the same
+heights as a whole-map pass, and only one window is in memory at a time.
+"""
+
+import math
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+from ..core.data_types import TERRAIN_NAMES
+from ..core.world_objects import Building, NaturalFeature, SpawnPoint, WorldPath
+from .noise import _bilinear_sample, _fbm
+
+# Elevation of the highest possible point, in world units; the 16-bit export spans [0, MAX_ELEVATION]
+MAX_ELEVATION = 32.0
+
+# Base elevation of each terrain class as a share of MAX_ELEVATION
+TERRAIN_ELEVATION = {
+    "water": 0.04,
+    "sand": 0.14,
+    "grass": 0.26,
+    "dirt": 0.28,
+    "forest": 0.34,
+    "stone": 0.5,
+    "mountain": 0.78
+}
+
+# Rolling detail added on top of the class elevation; water stays nearly flat
+ELEVATION_NOISE_SCALE = 48.0
+ELEVATION_NOISE_OCTAVES = 3
+ELEVATION_NOISE_AMPLITUDE = 0.12
+WATER_NOISE_SHARE = 0.15
+ELEVATION_SALT = 105
+
+# Box blur radius that turns class boundaries into slopes before erosion
+BASE_SMOOTHING_RADIUS = 3
+
+# Thermal erosion: material above the talus slope (height difference per tile) slides downhill
+EROSION_ITERATIONS = 8
+TALUS = 0.5
+EROSION_RATE = 0.4
+
+# Tiles beyond a terrain change whose height it can affect: the blur reaches
+# BASE_SMOOTHING_RADIUS and each erosion step two more (a cell receives what its
+# neighbors shed, which depends on their neighbors)
+HEIGHTMAP_REACH = BASE_SMOOTHING_RADIUS + 2 * EROSION_ITERATIONS
+
+# Building pads: footprint half-size when none is recorded, flat margin around it and blend width
+DEFAULT_PAD_HALF_SIZE = 2.5
+PAD_MARGIN = 1.0
+PAD_BLEND = 3.0
+
+# Heights are generated in windows of this many tiles
+HEIGHTMAP_WINDOW = 512
+
+# Larger heightmaps are exported as raw only; PNG encoding would need the whole map in memory
+HEIGHTMAP_PNG_MAX_TILES = 4096 * 4096
+
+_WATER_CODE = TERRAIN_NAMES.index("water")
+# Class elevations in thousandths, so the blur sums integers and is exact in any window
+_ELEVATION_MILLI = np.array([round(TERRAIN_ELEVATION.get(name, 0.3) * MAX_ELEVATION * 1000) for name in TERRAIN_NAMES],
+                            dtype=np.int64)
+
+def _generate_heightmap(terrain, size: Tuple[int, int], seed: int, buildings: Sequence[Building] = (),
+                        path: Optional[Union[str, Path]] = None) -> np.ndarray:
+    """
+    Elevation per tile as a (height, width) float32 array.
+    
+    With a path the heights go to a memory-mapped .npy file there, for worlds too
+    large to hold in memory.
+    """
+    width, height = size
+    print(f"⛰️ Generating {width}x{height} heightmap")
+    
+    if path is not None:
+        heights = np.lib.format.open_memmap(path, mode="w+", dtype=np.float32, shape=(height, width))
+    else:
+        heights = np.empty((height, width), dtype=np.float32)
+    
+    for y0 in range(0, height, HEIGHTMAP_WINDOW):
+        for x0 in range(0, width, HEIGHTMAP_WINDOW):
+            bounds = (x0, y0, min(x0 + HEIGHTMAP_WINDOW, width), min(y0 + HEIGHTMAP_WINDOW, height))
+            heights[bounds[1]:bounds[3], bounds[0]:bounds[2]] = _heightmap_window(terrain, size, seed, bounds)
+    
+    _flatten_building_pads(heights, buildings)
+    if path is not None:
+        heights.flush()
+    return heights
+
+def _heightmap_window(terrain, size: Tuple[int, int], seed: int, bounds: Tuple[int, int, int, int]) -> np.ndarray:
+    """Eroded heights for the window [x0, x1) x [y0, y1); depends only on seed and position"""
+    width, height = size
+    x0, y0, x1, y1 = bounds
+    
+    # A halo of HEIGHTMAP_REACH makes the window interior independent of where the window was cut
+    halo = HEIGHTMAP_REACH
+    hx0, hy0 = max(x0 - halo, 0), max(y0 - halo, 0)
+    hx1, hy1 = min(x1 + halo, width), min(y1 + halo, height)
+    
+    codes = np.asarray(terrain.read_window(hx0, hy0, hx1, hy1))
+    elevation = _box_blur(_ELEVATION_MILLI[codes], BASE_SMOOTHING_RADIUS) / np.float32(1000)
+    
+    noise = _fbm(seed, np.arange(hx0, hx1) / ELEVATION_NOISE_SCALE, np.arange(hy0, hy1) / ELEVATION_NOISE_SCALE,
+                 (ELEVATION_SALT,), ELEVATION_NOISE_OCTAVES)[0]
+    noise *= np.float32(ELEVATION_NOISE_AMPLITUDE * MAX_ELEVATION)
+    noise[codes == _WATER_CODE] *= np.float32(WATER_NOISE_SHARE)
+    elevation += noise
+    
+    _erode_thermal(elevation, EROSION_ITERATIONS, TALUS, EROSION_RATE)
+    np.clip(elevation, 0.0, MAX_ELEVATION, out=elevation)
+    return elevation[y0 - hy0:y1 - hy0, x0 - hx0:x1 - hx0]
+
+def _box_blur(values: np.ndarray, radius: int) -> np.ndarray:
+    """Mean over the (2r+1)^2 box around each cell of an integer array, edges extended, via a summed-area table"""
+    padded = np.pad(values.astype(np.int64), radius, mode="edge")
+    table = np.zeros((padded.shape[0] + 1, padded.shape[1] + 1), dtype=np.int64)
+    np.cumsum(np.cumsum(padded, axis=0), axis=1, out=table[1:, 1:])
+    span = 2 * radius + 1
+    total = table[span:, span:] - table[:-span, span:] - table[span:, :-span] + table[:-span, :-span]
+    return (total / (span * span)).astype(np.float32)
+
+def _erode_thermal(heights: np.ndarray, iterations: int, talus: float, rate: float) -> np.ndarray:
+    """
+    Thermal erosion in place over the 4-neighborhood.
+    
+    Each iteration a cell sheds rate * (steepest drop - talus) of material, split among
+    its lower neighbors in proportion to how far each drop exceeds the talus slope.
+    Map edges are treated as continuing at the same height.
+    """
+    rows, cols = heights.shape
+    excess = np.empty((4, rows, cols), dtype=np.float32)
+    
+    for _ in range(iterations):
+        padded = np.pad(heights, 1, mode="edge")
+        neighbors = (padded[:-2, 1:-1], padded[2:, 1:-1], padded[1:-1, :-2], padded[1:-1, 2:])
+        for k, neighbor in enumerate(neighbors):
+            np.subtract(heights, neighbor, out=excess[k])
+        steepest = excess.max(axis=0)
+        excess -= np.float32(talus)
+        np.maximum(excess, 0.0, out=excess)
+        total = excess.sum(axis=0)
+        
+        moved = np.where(total > 0, rate * (steepest - talus) / np.where(total > 0, total, 1), 0).astype(np.float32)
+        excess *= moved
+        heights -= excess.sum(axis=0)
+        
+        # Deliver each share to the neighbor it flowed toward
+        heights[:-1, :] += excess[0, 1:, :]
+        heights[1:, :] += excess[1, :-1, :]
+        heights[:, :-1] += excess[2, :, 1:]
+        heights[:, 1:] += excess[3, :, :-1]
+    
+    return heights
+
+def _pad_half_size(building: Building) -> Tuple[float, float]:
+    """Half-extents of a building's flat pad, x and y; blending reaches PAD_BLEND further"""
+    footprint = building.properties.get("footprint")
+    half_x, half_y = (footprint[0] / 2, footprint[1] / 2) if footprint else (DEFAULT_PAD_HALF_SIZE,) * 2
+    return half_x + PAD_MARGIN, half_y + PAD_MARGIN
+
+def _flatten_building_pads(heights: np.ndarray, buildings: Sequence[Building], origin: Tuple[int, int] = (0, 0)):
+    """Level the ground under each building footprint and blend it into the surroundings; origin is the tile at heights[0, 0]"""
+    rows, cols = heights.shape
+    for building in buildings:
+        half_x, half_y = _pad_half_size(building)
+        x, y = building.position.x - origin[0], building.position.y - origin[1]
+        
+        reach_x, reach_y = half_x + PAD_BLEND, half_y + PAD_BLEND
+        left, right = max(int(math.floor(x - reach_x)), 0), min(int(math.ceil(x + reach_x)) + 1, cols)
+        top, bottom = max(int(math.floor(y - reach_y)), 0), min(int(math.ceil(y + reach_y)) + 1, rows)
+        if left >= right or top >= bottom:
+            continue
+        
+        # Distance of each tile center outside the flat pad rectangle
+        window = np.asarray(heights[top:bottom, left:right], dtype=np.float32)
+        dx = np.maximum(np.abs(np.arange(left, right) + 0.5 - x) - half_x, 0.0)[None, :]
+        dy = np.maximum(np.abs(np.arange(top, bottom) + 0.5 - y) - half_y, 0.0)[:, None]
+        outside = np.sqrt(dx * dx + dy * dy)
+        
+        pad = outside == 0
+        if not pad.any():
+            continue
+        level = float(window[pad].mean())
+        blend = np.clip(outside / PAD_BLEND, 0.0, 1.0).astype(np.float32)
+        heights[top:bottom, left:right] = level + (window - level) * blend
+
+def _heightmap_region(terrain, size: Tuple[int, int], seed: int, buildings: Sequence[Building],
+                      bounds: Tuple[int, int, int, int]) -> np.ndarray:
+    """
+    Heights for the half-open tile window bounds after an edit, pads included.
+    
+    The window is widened by the largest pad reach so every pad touching it is
+    levelled over its whole footprint; the result matches a whole-map pass unless
+    pads inside overlap pads further out.
+    """
+    width, height = size
+    grow = int(math.ceil(max((max(_pad_half_size(b)) for b in buildings), default=0.0) + PAD_BLEND))
+    x0, y0, x1, y1 = bounds
+    grown = (max(x0 - grow, 0), max(y0 - grow, 0), min(x1 + grow, width), min(y1 + grow, height))
+    
+    heights = _heightmap_window(terrain, size, seed, grown)
+    nearby = [b for b in buildings
+              if grown[0] - grow <= b.position.x <= grown[2] + grow and grown[1] - grow <= b.position.y <= grown[3] + grow]
+    _flatten_building_pads(heights, nearby, grown[:2])
+    return heights[y0 - grown[1]:y1 - grown[1], x0 - grown[0]:x1 - grown[0]]
+
+def _sample_heights(heights: np.ndarray, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+    """Bilinear elevation at world positions; heights are taken at tile centers"""
+    xs = np.asarray(xs, dtype=np.float64) - 0.5
+    ys = np.asarray(ys, dtype=np.float64) - 0.5
+    if heights.shape[0] < 2 or heights.shape[1] < 2:
+        return np.full(xs.shape, float(heights.mean()) if heights.size else 0.0)
+    return _bilinear_sample(heights[None], xs, ys)[0].astype(np.float64)
+
+def _apply_elevation(heights: np.ndarray, buildings: Sequence[Building], paths: Sequence[WorldPath],
+                     natural_features: Sequence[NaturalFeature], spawn_points: Sequence[SpawnPoint]):
+    """Set the z of every object (and every path vertex) to the ground height beneath it"""
+    for objects in (buildings, natural_features, spawn_points):
+        if not len(objects):
+            continue
+        xy = np.array([(o.position.x, o.position.y) for o in objects], dtype=np.float64)
+        for obj, z in zip(objects, _sample_heights(heights, xy[:, 0], xy[:, 1]).tolist()):
+            obj.position.z = z
+        if hasattr(objects, "refresh"):
+            objects.refresh()
+    
+    for path in paths:
+        path.points[:, 2] = _sample_heights(heights, path.points[:, 0], path.points[:, 1])
+        path.start.z = float(path.points[0, 2])
+        path.end.z = float(path.points[-1, 2])
+
+def _export_heightmap(heights: np.ndarray, output_dir: Union[str, Path], name: str = "heightmap") -> Dict:
+    """
+    Write heights as 16-bit little-endian raw (name.r16) and, when Pillow is available
+    and the map is small enough, a 16-bit grayscale PNG (name.png).
+    
+    Both map [0, MAX_ELEVATION] onto [0, 65535], rows from the top of the map down.
+    """
+    output = Path(output_dir)
+    output.mkdir(parents=True, exist_ok=True)
+    rows, cols = heights.shape
+    scale = 65535.0 / MAX_ELEVATION
+    
+    raw_path = output / f"{name}.r16"
+    with open(raw_path, "wb") as f:
+        for y0 in range(0, rows, HEIGHTMAP_WINDOW):
+            band = np.asarray(heights[y0:y0 + HEIGHTMAP_WINDOW], dtype=np.float32)
+            f.write(np.rint(np.clip(band * scale, 0, 65535)).astype("<u2").tobytes())
+    
+    png_path = None
+    if PIL_AVAILABLE and rows * cols <= HEIGHTMAP_PNG_MAX_TILES:
+        png_path = output / f"{name}.png"
+        _encode_png(raw_path, png_path, rows, cols)
+    
+    return {
+        "raw": str(raw_path),
+        "png": str(png_path) if png_path else None,
+        "width": cols,
+        "height": rows,
+        "format": "r16",
+        "max_elevation": MAX_ELEVATION
+    }
+
+def _encode_png(raw_path: Path, png_path: Path, rows: int, cols: int):
+    """Re-encode a .r16 file as a 16-bit grayscale PNG"""
+    encoded = np.fromfile(raw_path, dtype="<u2").reshape(rows, cols)
+    Image.fromarray(encoded.astype(np.uint16), mode="I;16").save(png_path)
+
+def _patch_heightmap_files(heightmap: Dict, windows: Sequence[Tuple[np.ndarray, Tuple[int, int, int, int]]]):
+    """Write regenerated (heights, (x0, y0, x1, y1)) windows into the files a heightmap record points at"""
+    if not windows:
+        return
+    if heightmap.get("array") and Path(heightmap["array"]).exists():
+        array = np.load(heightmap["array"], mmap_mode="r+")
+        for heights, (x0, y0, x1, y1) in windows:
+            array[y0:y1, x0:x1] = heights
+        array.flush()
+    
+    if heightmap.get("raw") and Path(heightmap["raw"]).exists():
+        scale = 65535.0 / MAX_ELEVATION
+        with open(heightmap["raw"], "r+b") as f:
+            for heights, (x0, y0, x1, y1) in windows:
+                encoded = np.rint(np.clip(np.asarray(heights, dtype=np.float32) * scale, 0, 65535)).astype("<u2")
+                for row, y in enumerate(range(y0, y1)):
+                    f.seek((y * heightmap["width"] + x0) * 2)
+                    f.write(encoded[row].tobytes())
+        if heightmap.get("png") and PIL_AVAILABLE:
+            _encode_png(Path(heightmap["raw"]), Path(heightmap["png"]), heightmap["height"], heightmap["width"])
@@ -0,0 +1,269 @@
+"""
+Incremental regeneration of a WorldSpec after edits.
+
+Only what the edits can have affected is rebuilt: roads whose endpoints moved or
+whose routing window crosses repainted terrain, natural features inside dirty
+regions, spawn points, and the ground height under every object in those regions.
+"""
+
+import math
+import re
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from ..core.terrain_store import open_terrain
+from ..core.world_cache import detach_from_cache
+from ..core.world_changes import Bounds, ChangeSet, merge_regions, object_key
+from ..core.world_objects import WorldObjects, WorldPath
+from ...seeding import stream_rng
+from .heightmap import HEIGHTMAP_REACH, _heightmap_region, _patch_heightmap_files, _sample_heights
+from .natural_features import BUILDING_CLEARANCE, _calculate_spawn_points, _create_features, _feature_spacing
+from .path_network import _network_edges, _route_road
+from .pathfinding import ROUTE_MARGIN
+from .poisson_disk import _footprint_exclusion, _poisson_disk_sample
+
+# Tiles added around each region when regenerating elevation, so bilinear samples
+# near its edge still see both neighboring tiles
+ELEVATION_MARGIN = 2
+
+# Elevation changes smaller than this do not count as modifying an object
+ELEVATION_TOLERANCE = 1e-4
+
+def _regenerate_dirty(world_spec, changes: ChangeSet) -> ChangeSet:
+    """Bring paths, features, spawn points and elevation up to date with the edits in changes"""
+    # Heightmap files are patched in place, so never in the copies a cached design owns
+    detach_from_cache(world_spec)
+    
+    width, height = world_spec.size
+    terrain = open_terrain(world_spec)
+    seed = world_spec.metadata.get("seed")
+    
+    edit_regions = merge_regions(_clip(region, width, height) for region in changes.dirty_regions)
+    print(f"🧩 Regenerating {len(edit_regions)} edited regions")
+    
+    road_regions = _regenerate_paths(world_spec, terrain, changes)
+    regions = merge_regions(_clip(region, width, height) for region in edit_regions + road_regions)
+    _regenerate_features(world_spec, terrain, seed, edit_regions, regions, changes)
+    spawn_regions = _regenerate_spawn_points(world_spec, changes)
+    regions = merge_regions(regions + [_clip(region, width, height) for region in spawn_regions])
+    
+    # Worlds generated before elevation existed have no heightmap to keep in step
+    if "heightmap" in world_spec.metadata and seed is not None:
+        # Repainted terrain reshapes the ground some way past its edge
+        regions = merge_regions(regions + [_clip(_grow(region, HEIGHTMAP_REACH), width, height)
+                                           for region in changes.terrain_regions])
+        _regenerate_elevation(world_spec, terrain, seed, regions, changes)
+    
+    world_spec.metadata["building_count"] = len(world_spec.buildings)
+    changes.dirty_regions = regions
+    return changes
+
+def _regenerate_paths(world_spec, terrain, changes: ChangeSet) -> List[Bounds]:
+    """Re-plan the road network, routing only new or invalidated roads; returns the boxes of roads that changed"""
+    buildings = world_spec.buildings
+    previous_roads = {frozenset(path.properties.get("connects", ())): path for path in world_spec.paths}
+    next_index = _next_index(path.id for path in world_spec.paths)
+    
+    paths, regions, replaced = [], [], []
+    for i, j, main_road in _network_edges(buildings):
+        building1, building2 = buildings[i], buildings[j]
+        previous = previous_roads.pop(frozenset((building1.id, building2.id)), None)
+        if previous is not None and _road_still_valid(previous, building1, building2, main_road, changes.terrain_regions):
+            paths.append(previous)
+            continue
+        
+        # A road keeps its id when it is only re-routed; changing class changes its id prefix
+        if previous is not None and _is_main_road(previous) == main_road:
+            path_id, change = previous.id, "modified"
+        else:
+            if previous is not None:
+                replaced.append(previous)
+            path_id, change = f"{'main' if main_road else 'side'}_path_{next_index}", "added"
+            next_index += 1
+        if previous is not None:
+            regions.append(_path_bounds(previous))
+        
+        path = _route_road(building1, building2, main_road, terrain, path_id)
+        paths.append(path)
+        regions.append(_path_bounds(path))
+        changes.record("paths", path_id, change)
+    
+    for previous in list(previous_roads.values()) + replaced:
+        changes.record("paths", previous.id, "removed")
+        regions.append(_path_bounds(previous))
+    
+    world_spec.paths = WorldObjects(paths)
+    return regions
+
+def _road_still_valid(path: WorldPath, building1, building2, main_road: bool,
+                      painted: List[Tuple[int, int, int, int]]) -> bool:
+    """Whether routing the road again would give the same result"""
+    if _is_main_road(path) != main_road:
+        return False
+    ends = {(path.start.x, path.start.y), (path.end.x, path.end.y)}
+    if ends != {(building1.position.x, building1.position.y), (building2.position.x, building2.position.y)}:
+        return False
+    window = _route_window(path)
+    return not any(_overlaps(window, region) for region in painted)
+
+def _regenerate_features(world_spec, terrain, seed: Optional[int], edit_regions: List[Bounds],
+                         regions: List[Bounds], changes: ChangeSet):
+    """Clear features from edited areas and from under new roads, then refill every dirty region"""
+    width, height = world_spec.size
+    spacing = _feature_spacing(world_spec.theme, width, height)
+    features = world_spec.natural_features
+    xy = features.positions[:, :2].astype(np.float64)
+    road_boxes = _path_boxes(world_spec.paths)
+    
+    doomed = np.zeros(len(features), dtype=bool)
+    for region in edit_regions:
+        doomed |= _inside(xy, region)
+    for region in regions:
+        candidates = np.flatnonzero(_inside(xy, region) & ~doomed)
+        if candidates.size:
+            blocked = _region_exclusion(world_spec, road_boxes, region, BUILDING_CLEARANCE)
+            doomed[candidates] = blocked(xy[candidates, 0], xy[candidates, 1])
+    
+    kept = []
+    for feature, removed in zip(features, doomed.tolist()):
+        if removed:
+            changes.record("natural_features", feature.id, "removed")
+        else:
+            kept.append(feature)
+    kept_xy = xy[~doomed]
+    
+    # Refill each region around the features that remain; its own stream of the seed keeps edits reproducible
+    next_index = _next_index(feature.id for feature in features)
+    for region in regions:
+        rng = stream_rng(seed, "natural_features", "edit", *region)
+        np_rng = np.random.default_rng(rng.getrandbits(64))
+        blocked = _region_exclusion(world_spec, road_boxes, region, BUILDING_CLEARANCE)
+        neighbors = [kept[i] for i in np.flatnonzero(_inside(kept_xy, _grow(region, spacing)))]
+        crowded = _footprint_exclusion(neighbors, None, region, building_clearance=spacing)
+        xs, ys = _poisson_disk_sample(region, spacing, np_rng, lambda x, y: blocked(x, y) | crowded(x, y))
+        
+        added = _create_features(xs, ys, terrain, world_spec.theme, rng, next_index)
+        for feature in added:
+            changes.record("natural_features", feature.id, "added")
+        kept.extend(added)
+        kept_xy = np.concatenate((kept_xy, [(f.position.x, f.position.y) for f in added])) if added else kept_xy
+        next_index += len(added)
+    
+    world_spec.natural_features = WorldObjects(kept)
+
+def _regenerate_spawn_points(world_spec, changes: ChangeSet) -> List[Bounds]:
+    """Recompute spawn points after building edits, keeping those that did not move; returns boxes around moved ones"""
+    if not (changes.added["buildings"] or changes.modified["buildings"] or changes.removed["buildings"]):
+        return []
+    
+    previous = {spawn.type: spawn for spawn in world_spec.spawn_points}
+    spawn_points, regions = [], []
+    for spawn in _calculate_spawn_points(world_spec.buildings, world_spec.paths):
+        old = previous.pop(spawn.type, None)
+        if old is not None and (old.position.x, old.position.y, old.description) == (spawn.position.x, spawn.position.y,
+                                                                                      spawn.description):
+            spawn_points.append(old)
+            continue
+        spawn_points.append(spawn)
+        changes.record("spawn_points", spawn.type, "added" if old is None else "modified")
+        regions.append(_grow((spawn.position.x, spawn.position.y) * 2, ELEVATION_MARGIN))
+    for spawn_type in previous:
+        changes.record("spawn_points", spawn_type, "removed")
+    
+    world_spec.spawn_points = WorldObjects(spawn_points)
+    return regions
+
+def _regenerate_elevation(world_spec, terrain, seed: int, regions: List[Bounds], changes: ChangeSet):
+    """Regenerate ground heights over the dirty regions and stand the objects in them on it"""
+    width, height = world_spec.size
+    road_boxes = _path_boxes(world_spec.paths)
+    windows = []
+    
+    for region in regions:
+        x0, y0 = max(int(math.floor(region[0])) - ELEVATION_MARGIN, 0), max(int(math.floor(region[1])) - ELEVATION_MARGIN, 0)
+        x1 = min(int(math.ceil(region[2])) + ELEVATION_MARGIN + 1, width)
+        y1 = min(int(math.ceil(region[3])) + ELEVATION_MARGIN + 1, height)
+        if x0 >= x1 or y0 >= y1:
+            continue
+        heights = _heightmap_region(terrain, world_spec.size, seed, world_spec.buildings, (x0, y0, x1, y1))
+        windows.append((heights, (x0, y0, x1, y1)))
+        
+        for kind in ("buildings", "natural_features", "spawn_points"):
+            objects = getattr(world_spec, kind)
+            indices = np.flatnonzero(_inside(objects.positions[:, :2].astype(np.float64), region)).tolist()
+            if not indices:
+                continue
+            xs = np.array([objects[i].position.x for i in indices], dtype=np.float64)
+            ys = np.array([objects[i].position.y for i in indices], dtype=np.float64)
+            for i, z in zip(indices, _sample_heights(heights, xs - x0, ys - y0).tolist()):
+                item = objects[i]
+                if abs(z - item.position.z) > ELEVATION_TOLERANCE:
+                    item.position.z = z
+                    changes.record(kind, object_key(kind, item), "modified")
+        
+        for i in np.flatnonzero(_boxes_overlap(road_boxes, region)).tolist():
+            path = world_spec.paths[i]
+            points = path.points
+            mask = _inside(points[:, :2], region)
+            z = _sample_heights(heights, points[mask, 0] - x0, points[mask, 1] - y0)
+            if np.abs(z - points[mask, 2]).max(initial=0.0) > ELEVATION_TOLERANCE:
+                points[mask, 2] = z
+                path.start.z, path.end.z = float(points[0, 2]), float(points[-1, 2])
+                changes.record("paths", path.id, "modified")
+    
+    _patch_heightmap_files(world_spec.metadata["heightmap"], windows)
+    for objects in (world_spec.buildings, world_spec.natural_features, world_spec.spawn_points):
+        objects.refresh()
+
+def _region_exclusion(world_spec, road_boxes: np.ndarray, region: Bounds, clearance: float):
+    """Exclusion test for the region against the buildings and roads near it"""
+    reach = _grow(region, clearance)
+    buildings = world_spec.buildings
+    nearby = [buildings[i] for i in np.flatnonzero(_inside(buildings.positions[:, :2].astype(np.float64), reach))]
+    roads = [world_spec.paths[i] for i in np.flatnonzero(_boxes_overlap(road_boxes, reach))]
+    return _footprint_exclusion(nearby, roads, region, building_clearance=clearance)
+
+def _path_boxes(paths) -> np.ndarray:
+    """(N, 4) min_x, min_y, max_x, max_y of each path's polyline"""
+    if not len(paths):
+        return np.empty((0, 4))
+    points = np.concatenate([path.points[:, :2] for path in paths])
+    starts = np.cumsum([0] + [len(path.points) for path in paths][:-1])
+    return np.hstack((np.minimum.reduceat(points, starts), np.maximum.reduceat(points, starts)))
+
+def _inside(xy: np.ndarray, region: Bounds) -> np.ndarray:
+    return (xy[:, 0] >= region[0]) & (xy[:, 0] <= region[2]) & (xy[:, 1] >= region[1]) & (xy[:, 1] <= region[3])
+
+def _boxes_overlap(boxes: np.ndarray, region: Bounds) -> np.ndarray:
+    return (boxes[:, 0] <= region[2]) & (region[0] <= boxes[:, 2]) & (boxes[:, 1] <= region[3]) & (region[1] <= boxes[:, 3])
+
+def _route_window(path: WorldPath) -> Bounds:
+    """Terrain window the router reads for a road between the path's endpoints"""
+    margin = max(ROUTE_MARGIN, int(0.25 * math.hypot(path.end.x - path.start.x, path.end.y - path.start.y)))
+    return (min(path.start.x, path.end.x) - margin, min(path.start.y, path.end.y) - margin,
+            max(path.start.x, path.end.x) + margin + 1, max(path.start.y, path.end.y) + margin + 1)
+
+def _path_bounds(path: WorldPath) -> Bounds:
+    """Box around a road's corridor and its feature clearance"""
+    reach = path.width / 2 + BUILDING_CLEARANCE
+    xy = path.points[:, :2]
+    return (float(xy[:, 0].min()) - reach, float(xy[:, 1].min()) - reach,
+            float(xy[:, 0].max()) + reach, float(xy[:, 1].max()) + reach)
+
+def _is_main_road(path: WorldPath) -> bool:
+    return path.properties.get("type") == "main_road"
+
+def _next_index(ids: Iterable[str]) -> int:
+    """One past the largest trailing number among ids"""
+    numbers = [int(match.group()) for match in (re.search(r"\d+$", i) for i in ids) if match]
+    return max(numbers, default=-1) + 1
+
+def _grow(bounds: Bounds, margin: float) -> Bounds:
+    return (bounds[0] - margin, bounds[1] - margin, bounds[2] + margin, bounds[3] + margin)
+
+def _clip(bounds: Bounds, width: int, height: int) -> Bounds:
+    return (max(bounds[0], 0.0), max(bounds[1], 0.0), min(bounds[2], float(width)), min(bounds[3], float(height)))
+
+def _overlaps(a: Bounds, b: Bounds) -> bool:
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
@@ -2,91 +2,119 @@
 Natural feature placement and generation.
 """
 
+import math
 import random
-from typing import Dict, List
-from ..utils.spatial_utils import _distance
-from ..utils.theme_configs import get_theme_feature_types
+from typing import Dict, List, Optional
 
-def _place_natural_features(analysis: Dict, terrain_map: List[List[str]], buildings: List[Dict]) -> List[Dict]:
-    """Place natural features and decorative elements"""
+import numpy as np
+
+from ..core.data_types import TERRAIN_NAMES, WorldPosition
+from ..core.terrain_store import as_terrain
+from ..core.world_objects import NaturalFeature, SpawnPoint, WorldObjects, WorldPath
+from ..utils.spatial_utils import SpatialIndex
+from ..utils.theme_configs import get_theme_feature_types, _get_placement_spacing
+from .poisson_disk import POISSON_PACKING, _footprint_exclusion, _poisson_disk_sample
+
+# Upper bound on decorative features so region-scale maps stay tractable downstream
+MAX_NATURAL_FEATURES = 20000
+
+# Minimum clearance between buildings and features or spawn points
+BUILDING_CLEARANCE = 4.0
+
+def _place_natural_features(analysis: Dict, terrain_map, buildings: WorldObjects,
+                            paths: Optional[List[WorldPath]] = None,
+                            rng: Optional[random.Random] = None) -> List[NaturalFeature]:
+    """Place natural features and decorative elements; all randomness is drawn from rng"""
     
-    features = []
+    rng = rng or random.Random()
     theme = analysis.get("theme", "medieval")
     
     print(f"🌿 Adding natural features for {theme} theme")
     
+    # Place features avoiding building areas and roads
+    terrain = as_terrain(terrain_map)
+    height, width = terrain.height, terrain.width
+    
+    # Evenly spread candidates; large maps widen the spacing to stay under the feature cap
+    np_rng = np.random.default_rng(rng.getrandbits(64))
+    exclude = _footprint_exclusion(buildings, paths, (0, 0, width, height), building_clearance=BUILDING_CLEARANCE)
+    xs, ys = _poisson_disk_sample((0, 0, width, height), _feature_spacing(theme, width, height), np_rng, exclude)
+    return _create_features(xs, ys, terrain, theme, rng)
+
+def _feature_spacing(theme: str, width: int, height: int) -> float:
+    """Minimum distance between natural features on a width x height map"""
+    return max(_get_placement_spacing(theme)["feature"],
+               math.sqrt(width * height * POISSON_PACKING / MAX_NATURAL_FEATURES))
+
+def _create_features(xs: np.ndarray, ys: np.ndarray, terrain, theme: str, rng: random.Random,
+                     first_index: int = 0) -> List[NaturalFeature]:
+    """Features of the theme's types at candidate points, numbered from first_index; rare types are thinned out"""
+    features = []
+    
     # Get theme-specific feature types
     available_features = get_theme_feature_types(theme)
+    terrain_types = [TERRAIN_NAMES[code] for code in terrain.sample(xs.astype(np.intp), ys.astype(np.intp))]
     
-    # Place features avoiding building areas
-    height, width = len(terrain_map), len(terrain_map[0])
-    feature_density = 0.08  # 8% of tiles get features
+    # Some features are rarer
+    rare_features = ["well", "skeleton", "cauldron", "crystal", "ancient_stone"]
     
-    for y in range(height):
-        for x in range(width):
-            if random.random() < feature_density:
-                # Check if too close to buildings
-                too_close_to_building = any(
-                    _distance({"x": x, "y": y}, b["position"]) < 4
-                    for b in buildings
-                )
-                
-                if not too_close_to_building:
-                    feature_type = random.choice(available_features)
-                    
-                    # Some features are rarer
-                    rare_features = ["well", "skeleton", "cauldron", "crystal", "ancient_stone"]
-                    if feature_type in rare_features and random.random() > 0.3:
-                        continue
-                    
-                    feature = {
-                        "id": f"feature_{len(features)}",
-                        "type": feature_type,
-                        "position": {"x": float(x), "y": float(y), "z": 0.0},
-                        "rotation": random.uniform(0, 360),
-                        "scale": random.uniform(0.7, 1.3),
-                        "properties": {
-                            "terrain_type": terrain_map[y][x],
-                            "interactive": feature_type in ["well", "cauldron", "crystal", "ancient_stone"],
-                            "decorative": True
-                        }
-                    }
-                    features.append(feature)
+    for x, y, terrain_type in zip(xs.tolist(), ys.tolist(), terrain_types):
+        feature_type = rng.choice(available_features)
+        
+        if feature_type in rare_features and rng.random() > 0.3:
+            continue
+        
+        feature = NaturalFeature(
+            id=f"feature_{first_index + len(features)}",
+            type=feature_type,
+            position=WorldPosition(round(x, 2), round(y, 2)),
+            rotation=rng.uniform(0, 360),
+            scale=rng.uniform(0.7, 1.3),
+            properties={
+                "terrain_type": terrain_type,
+                "interactive": feature_type in ["well", "cauldron", "crystal", "ancient_stone"],
+                "decorative": True
+            }
+        )
+        features.append(feature)
     
     return features
 
-def _calculate_spawn_points(buildings: List[Dict], paths: List[Dict]) -> List[Dict]:
+def _calculate_spawn_points(buildings: WorldObjects, paths: List[WorldPath]) -> List[SpawnPoint]:
     """Calculate appropriate player spawn points"""
     spawn_points = []
     
     if not buildings:
-        return [{"x": 20.0, "y": 20.0, "z": 0.0, "type": "default"}]
+        return [SpawnPoint(WorldPosition(20.0, 20.0), "default")]
     
     # Main entrance spawn (edge of settlement)
-    center_x = sum(b["position"]["x"] for b in buildings) / len(buildings)
-    center_y = sum(b["position"]["y"] for b in buildings) / len(buildings)
+    center = buildings.centroid()
+    center_x, center_y = center.x, center.y
+    
+    # Find edge spawn point, stepping further out until it is clear of buildings
+    occupied = SpatialIndex.from_items(buildings)
+    spawn_x = center_x - 15
+    for _ in range(10):
+        if not occupied.any_within(WorldPosition(spawn_x, center_y), BUILDING_CLEARANCE):
+            break
+        spawn_x -= BUILDING_CLEARANCE
     
-    # Find edge spawn point
-    edge_spawn = {
-        "x": center_x - 15,
-        "y": center_y,
-        "z": 0.0,
-        "type": "main_entrance",
-        "description": "Main entrance to settlement"
-    }
+    edge_spawn = SpawnPoint(
+        position=WorldPosition(round(spawn_x, 2), round(center_y, 2)),
+        type="main_entrance",
+        description="Main entrance to settlement"
+    )
     spawn_points.append(edge_spawn)
     
     # Secondary spawn near important buildings
-    important_buildings = [b for b in buildings if b["properties"].get("importance") == "high"]
+    important_buildings = [b for b in buildings if b.properties.get("importance") == "high"]
     if important_buildings:
         building = important_buildings[0]
-        secondary_spawn = {
-            "x": building["position"]["x"] + 5,
-            "y": building["position"]["y"] + 5,
-            "z": 0.0,
-            "type": "secondary",
-            "description": f"Near {building['type']}"
-        }
+        secondary_spawn = SpawnPoint(
+            position=WorldPosition(building.position.x + 5, building.position.y + 5),
+            type="secondary",
+            description=f"Near {building.type}"
+        )
         spawn_points.append(secondary_spawn)
     
-    return spawn_points
\ No newline at end of file
+    return spawn_points
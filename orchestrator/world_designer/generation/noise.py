@@ -0,0 +1,178 @@
+"""
+Seeded, vectorized coherent noise for terrain generation.
+
+Gradient noise is hashed from integer lattice coordinates, so any window of the
+world evaluates to the same values no matter how it is tiled. All functions
+operate on whole arrays; there are no per-tile Python loops.
+"""
+
+import math
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from ..core.data_types import terrain_code
+from ..utils.rng_utils import _hash_bits
+
+# Feature size of the base octave, in tiles
+TERRAIN_NOISE_SCALE = 24.0
+TERRAIN_OCTAVES = 4
+WARP_OCTAVES = 2
+# Maximum domain warp displacement, in tiles
+WARP_STRENGTH = 6.0
+
+# Salts for each independent noise field
+HEIGHT_SALT = 101
+MOISTURE_SALT = 102
+WARP_X_SALT = 103
+WARP_Y_SALT = 104
+
+_OCTAVE_STRIDE = 64
+# Irrational per-octave offsets keep lattice zeros of successive octaves from lining up
+_OCTAVE_OFFSET = 0.6180339887
+
+_angles = np.arange(8) * (2 * math.pi / 8)
+_GRADIENTS = np.stack([np.cos(_angles), np.sin(_angles)], axis=1).astype(np.float32)
+
+def _fade(t: np.ndarray) -> np.ndarray:
+    """Quintic smoothstep used to blend lattice contributions"""
+    return t * t * t * (t * (t * 6 - 15) + 10)
+
+def _gradient_noise(seed: int, x: np.ndarray, y: np.ndarray, salts: Sequence[int]) -> np.ndarray:
+    """
+    2D gradient noise sampled on the grid x (columns) by y (rows).
+
+    Coordinates are 1D arrays in lattice units. Returns one (len(y), len(x))
+    float32 field per salt, stacked on the first axis, with values in about [-1, 1].
+    """
+    x_floor, y_floor = np.floor(x), np.floor(y)
+    fx, fy = (x - x_floor).astype(np.float32), (y - y_floor).astype(np.float32)
+    ix, iy = x_floor.astype(np.int64), y_floor.astype(np.int64)
+    
+    # Gradients only for the lattice points the window touches
+    lattice_x = np.arange(ix.min(), ix.max() + 2)
+    lattice_y = np.arange(iy.min(), iy.max() + 2)
+    gradient_index = np.stack([
+        (_hash_bits(seed, lattice_x[None, :], lattice_y[:, None], salt) >> np.uint64(61)).astype(np.intp)
+        for salt in salts
+    ])
+    gx, gy = _GRADIENTS[gradient_index, 0], _GRADIENTS[gradient_index, 1]
+    
+    # Interpolate along x on every lattice row: contribution = a + b * (y offset)
+    i = ix - lattice_x[0]
+    u = _fade(fx)
+    a = gx[:, :, i] * fx
+    a += (gx[:, :, i + 1] * (fx - 1) - a) * u
+    b = gy[:, :, i]
+    b += (gy[:, :, i + 1] - b) * u
+    
+    # Then pick the two lattice rows around each sample row and blend along y
+    j = iy - lattice_y[0]
+    fy, v = fy[:, None], _fade(fy)[:, None]
+    top = np.take(b, j, axis=1)
+    top *= fy
+    top += np.take(a, j, axis=1)
+    bottom = np.take(b, j + 1, axis=1)
+    bottom *= fy - 1
+    bottom += np.take(a, j + 1, axis=1)
+    bottom -= top
+    bottom *= v
+    top += bottom
+    top *= np.float32(math.sqrt(2))
+    return top
+
+def _fbm(seed: int, x: np.ndarray, y: np.ndarray, salts: Sequence[int], octaves: int,
+         lacunarity: float = 2.0, gain: float = 0.5) -> np.ndarray:
+    """Fractal Brownian motion: a normalized sum of gradient noise octaves"""
+    total = None
+    amplitude, frequency, norm = 1.0, 1.0, 0.0
+    
+    for octave in range(octaves):
+        offset = octave * _OCTAVE_OFFSET
+        octave_salts = [salt * _OCTAVE_STRIDE + octave for salt in salts]
+        layer = _gradient_noise(seed, x * frequency + offset, y * frequency + offset, octave_salts)
+        if total is None:
+            total = layer
+        else:
+            layer *= np.float32(amplitude)
+            total += layer
+        norm += amplitude
+        amplitude *= gain
+        frequency *= lacunarity
+    
+    total /= np.float32(norm)
+    return total
+
+def _bilinear_sample(fields: np.ndarray, sx: np.ndarray, sy: np.ndarray) -> np.ndarray:
+    """Sample stacked (S, H, W) fields at fractional (row sy, column sx) positions"""
+    height, width = fields.shape[1:]
+    sx = np.clip(sx, 0, width - 1.001)
+    sy = np.clip(sy, 0, height - 1.001)
+    ix, iy = sx.astype(np.intp), sy.astype(np.intp)
+    tx, ty = (sx - ix).astype(np.float32), (sy - iy).astype(np.float32)
+    
+    # Flat indices of the top-left corner; the other corners are fixed offsets from it
+    corner = iy * width + ix
+    samples = []
+    for field in fields.reshape(len(fields), -1):
+        top_left, top_right = field.take(corner), field.take(corner + 1)
+        bottom_left, bottom_right = field.take(corner + width), field.take(corner + width + 1)
+        top = top_left + (top_right - top_left) * tx
+        bottom = bottom_left + (bottom_right - bottom_left) * tx
+        samples.append(top + (bottom - top) * ty)
+    return np.stack(samples)
+
+def _terrain_fields(seed: int, bounds: Tuple[int, int, int, int],
+                    scale: float = TERRAIN_NOISE_SCALE,
+                    warp_strength: float = WARP_STRENGTH) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Domain-warped height and moisture fields for the tile window [x0, x1) x [y0, y1).
+
+    Both fields are computed together in one stacked pass and returned in [0, 1].
+    """
+    x0, y0, x1, y1 = bounds
+    pad = int(math.ceil(warp_strength)) + 1
+    
+    # Warp offsets for every output tile
+    out_x = np.arange(x0, x1, dtype=np.float64)
+    out_y = np.arange(y0, y1, dtype=np.float64)
+    warp = _fbm(seed, out_x / (scale * 2), out_y / (scale * 2), (WARP_X_SALT, WARP_Y_SALT), WARP_OCTAVES)
+    
+    # Height and moisture over the window padded by the largest warp displacement
+    padded_x = np.arange(x0 - pad, x1 + pad, dtype=np.float64)
+    padded_y = np.arange(y0 - pad, y1 + pad, dtype=np.float64)
+    fields = _fbm(seed, padded_x / scale, padded_y / scale, (HEIGHT_SALT, MOISTURE_SALT), TERRAIN_OCTAVES)
+    
+    # Offsets are formed in global coordinates so every window rounds identically
+    sx = (out_x[None, :] + warp[0] * warp_strength) - (x0 - pad)
+    sy = (out_y[:, None] + warp[1] * warp_strength) - (y0 - pad)
+    height, moisture = _bilinear_sample(fields, sx, sy)
+    
+    # fBm values cluster around zero; stretch them to use the [0, 1] range
+    height = np.clip(0.5 + height * 1.25, 0.0, 1.0)
+    moisture = np.clip(0.5 + moisture * 1.25, 0.0, 1.0)
+    return height, moisture
+
+def _classify_terrain(height: np.ndarray, moisture: np.ndarray, rules: List[Dict]) -> np.ndarray:
+    """
+    Classify tiles into terrain codes from height/moisture threshold rules.
+
+    Rules are checked in order and the first match wins; the last rule is the fallback.
+    """
+    codes = np.full(height.shape, terrain_code(rules[-1]["terrain"]), dtype=np.uint8)
+    assigned = np.zeros(height.shape, dtype=bool)
+    
+    for rule in rules[:-1]:
+        match = ~assigned
+        if "min_height" in rule:
+            match &= height >= rule["min_height"]
+        if "max_height" in rule:
+            match &= height < rule["max_height"]
+        if "min_moisture" in rule:
+            match &= moisture >= rule["min_moisture"]
+        if "max_moisture" in rule:
+            match &= moisture < rule["max_moisture"]
+        codes[match] = terrain_code(rule["terrain"])
+        assigned |= match
+    
+    return codes
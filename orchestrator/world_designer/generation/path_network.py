@@ -2,51 +2,78 @@
 Path network generation and routing.
 """
 
-from typing import List, Dict, Tuple
-from ..utils.spatial_utils import _distance
+from dataclasses import replace
+from typing import List, Tuple
 
-def _generate_path_network(buildings: List[Dict], size: Tuple[int, int]) -> List[Dict]:
-    """Generate intelligent path network"""
+import numpy as np
+
+from ..core.terrain_store import as_terrain
+from ..core.world_objects import Building, WorldObjects, WorldPath
+from ..utils.graph_utils import _minimum_spanning_tree
+from .pathfinding import _route_path, _polyline_length
+from .triangulation import _delaunay_edges
+
+# Share of buildings that get an extra non-tree road so the network has loops
+LOOP_EDGE_RATIO = 0.15
+
+def _generate_path_network(buildings: WorldObjects, size: Tuple[int, int], terrain_map=None) -> List[WorldPath]:
+    """
+    Generate intelligent path network.
+    
+    Roads follow the minimum spanning tree of the buildings' Delaunay triangulation
+    plus a few of the shortest leftover edges for loops, so the path count stays
+    linear in the building count. Each road is routed over the terrain with A*.
+    """
     
     paths = []
     
-    if not buildings:
+    if len(buildings) < 2:
         return paths
     
     print(f"🛤️ Creating path network for {len(buildings)} buildings")
     
+    terrain = as_terrain(terrain_map) if terrain_map is not None else None
+    
+    for i, j, main_road in _network_edges(buildings):
+        paths.append(_route_road(buildings[i], buildings[j], main_road, terrain,
+                                 f"{'main' if main_road else 'side'}_path_{len(paths)}"))
+    
+    return paths
+
+def _network_edges(buildings: WorldObjects) -> List[Tuple[int, int, bool]]:
+    """(i, j, main_road) per road: spanning-tree edges first, then the loop edges"""
+    if len(buildings) < 2:
+        return []
+    
     # Find important buildings for main roads
-    important_buildings = [b for b in buildings if b["properties"].get("importance") == "high"]
-    if not important_buildings:
-        important_buildings = buildings[:max(1, len(buildings) // 3)]
-    
-    # Create main paths between important buildings
-    for i, building1 in enumerate(important_buildings):
-        for building2 in important_buildings[i+1:]:
-            path = {
-                "id": f"main_path_{len(paths)}",
-                "start": building1["position"].copy(),
-                "end": building2["position"].copy(),
-                "width": 3.0,
-                "surface_type": "cobblestone",
-                "properties": {"type": "main_road", "importance": "high"}
-            }
-            paths.append(path)
-    
-    # Connect other buildings to nearest important building
-    for building in buildings:
-        if building not in important_buildings:
-            nearest = min(important_buildings, 
-                         key=lambda b: _distance(building["position"], b["position"]))
-            
-            path = {
-                "id": f"side_path_{len(paths)}",
-                "start": building["position"].copy(),
-                "end": nearest["position"].copy(),
-                "width": 2.0,
-                "surface_type": "dirt",
-                "properties": {"type": "side_road", "importance": "normal"}
-            }
-            paths.append(path)
-    
-    return paths
\ No newline at end of file
+    important = [b.properties.get("importance") == "high" for b in buildings]
+    if not any(important):
+        hub_count = max(1, len(buildings) // 3)
+        important = [i < hub_count for i in range(len(buildings))]
+    
+    # Spanning tree of the Delaunay graph, plus the shortest spare edges as loops
+    points = buildings.positions[:, :2].astype(np.float64)
+    tree, spare = _minimum_spanning_tree(points.tolist(), _delaunay_edges(points))
+    loops = spare[:int(len(buildings) * LOOP_EDGE_RATIO)]
+    return [(i, j, important[i] and important[j]) for i, j in tree + loops]
+
+def _route_road(building1: Building, building2: Building, main_road: bool, terrain, path_id: str) -> WorldPath:
+    """Route one road between two buildings over the terrain"""
+    polyline = _route_path(terrain, building1.position, building2.position)
+    route = np.zeros((len(polyline), 3))
+    route[:, :2] = np.round(polyline, 2)
+    
+    return WorldPath(
+        id=path_id,
+        start=replace(building1.position),
+        end=replace(building2.position),
+        points=route,
+        length=round(_polyline_length(polyline), 2),
+        width=3.0 if main_road else 2.0,
+        surface_type="cobblestone" if main_road else "dirt",
+        properties={
+            "type": "main_road" if main_road else "side_road",
+            "importance": "high" if main_road else "normal",
+            "connects": [building1.id, building2.id]
+        }
+    )
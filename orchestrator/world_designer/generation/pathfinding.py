@@ -0,0 +1,139 @@
+"""
+Terrain-aware A* routing for roads.
+"""
+
+import heapq
+import math
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from ..core.data_types import TERRAIN_NAMES, WorldPosition
+
+# Relative cost of building road across each terrain type
+TERRAIN_TRAVEL_COST = {
+    "grass": 1.0,
+    "dirt": 1.0,
+    "sand": 1.5,
+    "stone": 2.0,
+    "forest": 3.0,
+    "water": 12.0,
+    "mountain": 20.0
+}
+
+# Lookup table from terrain code to travel cost
+_COST_BY_CODE = np.array([TERRAIN_TRAVEL_COST.get(name, 1.0) for name in TERRAIN_NAMES])
+
+# Tiles of slack around the endpoints' bounding box that a route may detour through
+ROUTE_MARGIN = 8
+
+# Maximum deviation, in tiles, allowed when simplifying a routed polyline
+ROUTE_TOLERANCE = 1.0
+
+_SQRT2 = math.sqrt(2)
+
+def _route_path(terrain, start: WorldPosition, end: WorldPosition) -> List[Tuple[float, float]]:
+    """
+    Route a road from start to end over the terrain grid.
+    
+    Only a window around the two endpoints is read, so routing works the same on
+    in-memory and chunked terrain. Returns a simplified polyline whose first and
+    last points are the exact endpoints.
+    """
+    sx, sy, ex, ey = start.x, start.y, end.x, end.y
+    if terrain is None or not terrain:
+        return [(sx, sy), (ex, ey)]
+    
+    width, height = terrain.width, terrain.height
+    margin = max(ROUTE_MARGIN, int(0.25 * math.hypot(ex - sx, ey - sy)))
+    x0 = max(int(min(sx, ex)) - margin, 0)
+    y0 = max(int(min(sy, ey)) - margin, 0)
+    x1 = min(int(max(sx, ex)) + margin + 1, width)
+    y1 = min(int(max(sy, ey)) + margin + 1, height)
+    
+    costs = _COST_BY_CODE[np.asarray(terrain.read_window(x0, y0, x1, y1))]
+    tile = lambda x, y: (min(max(int(y), y0), y1 - 1) - y0, min(max(int(x), x0), x1 - 1) - x0)
+    cells = _astar(costs, tile(sx, sy), tile(ex, ey))
+    
+    # Tile centers in world coordinates, pinned to the exact endpoints
+    polyline = [(sx, sy)] + [(x0 + col + 0.5, y0 + row + 0.5) for row, col in cells[1:-1]] + [(ex, ey)]
+    return _simplify_polyline(polyline, ROUTE_TOLERANCE)
+
+def _astar(costs: np.ndarray, start: Tuple[int, int], goal: Tuple[int, int]) -> List[Tuple[int, int]]:
+    """
+    8-connected A* over a (rows, cols) cost grid from start to goal (row, col).
+    
+    Stepping into a tile costs its travel cost times the step length; the octile
+    heuristic uses the cheapest tile cost so it stays admissible.
+    """
+    rows, cols = costs.shape
+    flat_costs = costs.ravel().tolist()
+    min_cost = float(costs.min())
+    start_index = start[0] * cols + start[1]
+    goal_index = goal[0] * cols + goal[1]
+    goal_row, goal_col = goal
+    
+    def heuristic(row: int, col: int) -> float:
+        dr, dc = abs(row - goal_row), abs(col - goal_col)
+        return min_cost * (max(dr, dc) + (_SQRT2 - 1) * min(dr, dc))
+    
+    steps = [(dr, dc, _SQRT2 if dr and dc else 1.0)
+             for dr in (-1, 0, 1) for dc in (-1, 0, 1) if dr or dc]
+    best = {start_index: 0.0}
+    came_from: Dict[int, int] = {}
+    frontier = [(heuristic(*start), 0.0, start_index)]
+    
+    while frontier:
+        _, cost, index = heapq.heappop(frontier)
+        if index == goal_index:
+            break
+        if cost > best[index]:
+            continue
+        row, col = divmod(index, cols)
+        for dr, dc, length in steps:
+            r, c = row + dr, col + dc
+            if 0 <= r < rows and 0 <= c < cols:
+                neighbor = r * cols + c
+                new_cost = cost + flat_costs[neighbor] * length
+                if new_cost < best.get(neighbor, math.inf):
+                    best[neighbor] = new_cost
+                    came_from[neighbor] = index
+                    heapq.heappush(frontier, (new_cost + heuristic(r, c), new_cost, neighbor))
+    
+    path = [goal_index]
+    while path[-1] != start_index:
+        path.append(came_from[path[-1]])
+    return [divmod(index, cols) for index in reversed(path)]
+
+def _simplify_polyline(points: List[Tuple[float, float]], tolerance: float) -> List[Tuple[float, float]]:
+    """Ramer-Douglas-Peucker simplification keeping the endpoints"""
+    if len(points) < 3:
+        return list(points)
+    
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        (ax, ay), (bx, by) = points[first], points[last]
+        dx, dy = bx - ax, by - ay
+        length = math.hypot(dx, dy)
+        
+        farthest, farthest_distance = None, tolerance
+        for i in range(first + 1, last):
+            px, py = points[i]
+            if length:
+                distance = abs(dy * (px - ax) - dx * (py - ay)) / length
+            else:
+                distance = math.hypot(px - ax, py - ay)
+            if distance > farthest_distance:
+                farthest, farthest_distance = i, distance
+        
+        if farthest is not None:
+            keep[farthest] = True
+            stack.extend([(first, farthest), (farthest, last)])
+    
+    return [point for point, kept in zip(points, keep) if kept]
+
+def _polyline_length(points: List[Tuple[float, float]]) -> float:
+    return sum(math.dist(a, b) for a, b in zip(points, points[1:]))
@@ -0,0 +1,135 @@
+"""
+Poisson-disk sampling for evenly spread object placement.
+"""
+
+import math
+from typing import Callable, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..core.world_objects import Building, WorldPath
+
+# Dart-throwing rounds; each round offers every still-empty cell one candidate
+POISSON_ATTEMPTS = 30
+
+# Samples per radius^2 of area the sampler settles at, used to size radii for a target count
+POISSON_PACKING = 0.67
+
+# Neighbor cells that can hold a sample closer than the radius (the 5x5 block minus corners)
+_NEIGHBOR_OFFSETS = [(dr, dc) for dr in range(-2, 3) for dc in range(-2, 3)
+                     if (dr, dc) != (0, 0) and (abs(dr), abs(dc)) != (2, 2)]
+
+# Longest side of the rasterized exclusion mask, in cells
+EXCLUSION_MASK_SIZE = 4096
+
+ExclusionTest = Callable[[np.ndarray, np.ndarray], np.ndarray]
+
+def _poisson_disk_sample(bounds: Tuple[float, float, float, float], radius: float, rng: np.random.Generator,
+                         exclude: Optional[ExclusionTest] = None,
+                         attempts: int = POISSON_ATTEMPTS) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Sample points in [x0, x1) x [y0, y1) no closer than radius to each other.
+    
+    Uses Bridson's background grid (cell size radius / sqrt(2), at most one sample
+    per cell). Cells are visited in 3x3 phases; cells in the same phase are too far
+    apart to conflict, so each phase throws one dart into all of its empty cells at
+    once. Work is attempts x cells, so sampling is linear in area and always
+    terminates. exclude(xs, ys) marks candidates that must be rejected, e.g. points
+    on building footprints or roads. Points are returned in row-major cell order.
+    """
+    x0, y0, x1, y1 = bounds
+    cell = radius / math.sqrt(2)
+    cols = max(int(math.ceil((x1 - x0) / cell)), 0)
+    rows = max(int(math.ceil((y1 - y0) / cell)), 0)
+    if rows == 0 or cols == 0:
+        return np.empty(0), np.empty(0)
+    
+    # Sample coordinates per cell, NaN when empty; a 2-cell border avoids edge checks
+    pad = 2
+    grid_x = np.full((rows + 2 * pad, cols + 2 * pad), np.nan)
+    grid_y = np.full_like(grid_x, np.nan)
+    limit = radius * radius
+    
+    phases = []
+    for phase_row in range(3):
+        for phase_col in range(3):
+            r, c = np.meshgrid(np.arange(phase_row, rows, 3), np.arange(phase_col, cols, 3), indexing="ij")
+            phases.append((r.ravel() + pad, c.ravel() + pad))
+    
+    for _ in range(attempts):
+        for phase_rows, phase_cols in phases:
+            empty = np.isnan(grid_x[phase_rows, phase_cols])
+            r, c = phase_rows[empty], phase_cols[empty]
+            if r.size == 0:
+                continue
+            
+            xs = x0 + (c - pad + rng.random(r.size)) * cell
+            ys = y0 + (r - pad + rng.random(r.size)) * cell
+            ok = (xs < x1) & (ys < y1)
+            for dr, dc in _NEIGHBOR_OFFSETS:
+                dx = grid_x[r + dr, c + dc] - xs
+                dy = grid_y[r + dr, c + dc] - ys
+                # NaN distances (empty cells) compare False and never conflict
+                ok &= ~(dx * dx + dy * dy < limit)
+            
+            if exclude is not None and ok.any():
+                ok[ok] = ~exclude(xs[ok], ys[ok])
+            
+            grid_x[r[ok], c[ok]] = xs[ok]
+            grid_y[r[ok], c[ok]] = ys[ok]
+    
+    filled = ~np.isnan(grid_x)
+    return grid_x[filled], grid_y[filled]
+
+def _footprint_exclusion(buildings: Sequence[Building], paths: Optional[Sequence[WorldPath]], bounds: Tuple[float, float, float, float],
+                         building_clearance: float = 4.0, path_clearance: float = 1.0) -> ExclusionTest:
+    """
+    Exclusion test for points near buildings or within a path's width plus clearance.
+    
+    Footprints and road corridors are rasterized once into a boolean mask over
+    bounds, so each test is a single array lookup however many buildings and
+    paths there are. Very large bounds use a coarser mask.
+    """
+    x0, y0, x1, y1 = bounds
+    resolution = max(1.0, math.ceil(max(x1 - x0, y1 - y0) / EXCLUSION_MASK_SIZE))
+    mask = np.zeros((max(int(math.ceil((y1 - y0) / resolution)), 1),
+                     max(int(math.ceil((x1 - x0) / resolution)), 1)), dtype=bool)
+    
+    for b in buildings:
+        center = (b.position.x, b.position.y)
+        _stamp_segment(mask, bounds, resolution, center, center, building_clearance)
+    for p in paths or []:
+        reach = p.width / 2 + path_clearance
+        points = p.points[:, :2].tolist()
+        for start, end in zip(points, points[1:]):
+            _stamp_segment(mask, bounds, resolution, start, end, reach)
+    
+    def exclude(xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        cols = np.clip(((xs - x0) / resolution).astype(np.intp), 0, mask.shape[1] - 1)
+        rows = np.clip(((ys - y0) / resolution).astype(np.intp), 0, mask.shape[0] - 1)
+        return mask[rows, cols]
+    
+    return exclude
+
+def _stamp_segment(mask: np.ndarray, bounds: Tuple[float, float, float, float], resolution: float,
+                   start: Sequence[float], end: Sequence[float], reach: float):
+    """Mark mask cells whose centers lie within reach of the segment from (x, y) start to end"""
+    x0, y0 = bounds[0], bounds[1]
+    sx, sy = (start[0] - x0) / resolution, (start[1] - y0) / resolution
+    ex, ey = (end[0] - x0) / resolution, (end[1] - y0) / resolution
+    reach = reach / resolution
+    
+    # Only the cells in the segment's padded bounding box can be affected
+    left = max(int(math.floor(min(sx, ex) - reach)), 0)
+    right = min(int(math.ceil(max(sx, ex) + reach)) + 1, mask.shape[1])
+    top = max(int(math.floor(min(sy, ey) - reach)), 0)
+    bottom = min(int(math.ceil(max(sy, ey) + reach)) + 1, mask.shape[0])
+    if left >= right or top >= bottom:
+        return
+    
+    px = np.arange(left, right) + 0.5 - sx
+    py = (np.arange(top, bottom) + 0.5 - sy)[:, None]
+    dx, dy = ex - sx, ey - sy
+    length2 = dx * dx + dy * dy
+    t = np.clip((px * dx + py * dy) / length2, 0.0, 1.0) if length2 else 0.0
+    mask[top:bottom, left:right] |= (px - t * dx) ** 2 + (py - t * dy) ** 2 < reach * reach
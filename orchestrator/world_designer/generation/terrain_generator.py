@@ -2,126 +2,106 @@
 Terrain generation functionality.
 """
 
-import math
-import random
-from typing import List, Tuple, Dict
-from ..utils.theme_configs import _get_terrain_weights
+from typing import Callable, Optional, Tuple
 
-def _generate_terrain_map(size: Tuple[int, int], theme: str) -> List[List[str]]:
+import numpy as np
+
+from ..core.data_types import terrain_code
+from ..core.terrain_grid import TerrainGrid
+from ...seeding import new_seed
+from ..utils.rng_utils import _hash_uniform
+from ..utils.theme_configs import _get_terrain_thresholds
+from .noise import _terrain_fields, _classify_terrain
+
+# Salts that keep the random draws of each generation step independent
+SCATTER_TERRAIN_SALT = 1
+CLUSTER_TERRAIN_SALT = 2
+
+# How strongly the settlement area in the middle of the map is pulled to mid height
+SETTLEMENT_FLATTENING = 0.6
+
+def _generate_terrain_map(size: Tuple[int, int], theme: str, seed: Optional[int] = None) -> TerrainGrid:
     """Generate terrain map using theme-based procedural generation"""
     
     print(f"🌱 Generating terrain map for {theme} theme")
     
-    # Get terrain weights for theme
-    terrain_weights = _get_terrain_weights(theme)
+    if seed is None:
+        seed = new_seed()
     
-    # Initialize terrain map
-    terrain_map = []
-    
-    # Generate base terrain using simple noise
-    for y in range(size[1]):
-        row = []
-        for x in range(size[0]):
-            terrain_type = _select_terrain_type(x, y, size, terrain_weights)
-            row.append(terrain_type)
-        terrain_map.append(row)
-    
-    # Apply smoothing passes
-    terrain_map = _smooth_terrain(terrain_map)
-    
-    # Add theme-specific features
-    terrain_map = _add_terrain_features(terrain_map, theme)
-    
-    return terrain_map
+    return TerrainGrid(_generate_terrain_window(size, theme, seed, (0, 0, size[0], size[1])))
 
-def _select_terrain_type(x: int, y: int, size: Tuple[int, int], weights: Dict[str, float]) -> str:
-    """Select terrain type using weighted probability"""
-    # Simple procedural selection with position influence
-    center_x, center_y = size[0] // 2, size[1] // 2
-    distance_from_center = math.sqrt((x - center_x)**2 + (y - center_y)**2)
-    edge_distance = min(x, y, size[0] - x, size[1] - y)
-    
-    # Modify weights based on position
-    modified_weights = weights.copy()
-    
-    # Water more likely at edges
-    if "water" in modified_weights and edge_distance < 3:
-        modified_weights["water"] *= 2
-    
-    # Center areas more likely to be grass/clear
-    if "grass" in modified_weights and distance_from_center < size[0] // 4:
-        modified_weights["grass"] *= 1.5
+def _generate_terrain_window(size: Tuple[int, int], theme: str, seed: int,
+                             bounds: Tuple[int, int, int, int]) -> np.ndarray:
+    """Generate terrain codes for the window [x0, x1) x [y0, y1); depends only on seed and position"""
+    x0, y0, x1, y1 = bounds
     
-    # Weighted random selection
-    terrain_types = list(modified_weights.keys())
-    terrain_probs = list(modified_weights.values())
+    # Coherent height/moisture fields, classified by theme thresholds
+    height, moisture = _terrain_fields(seed, bounds)
+    _flatten_settlement_area(height, size, bounds)
+    codes = _classify_terrain(height, moisture, _get_terrain_thresholds(theme))
     
-    # Normalize
-    total = sum(terrain_probs)
-    terrain_probs = [p / total for p in terrain_probs]
+    tile_x = np.arange(x0, x1)[None, :]
+    tile_y = np.arange(y0, y1)[:, None]
+    random_field = lambda salt: _hash_uniform(seed, tile_x, tile_y, salt)
     
-    # Select
-    rand = random.random()
-    cumulative = 0
-    for i, prob in enumerate(terrain_probs):
-        cumulative += prob
-        if rand <= cumulative:
-            return terrain_types[i]
+    # Every window replays the same world-level draws, e.g. cluster centers
+    rng = np.random.default_rng([seed & 0xFFFFFFFFFFFFFFFF, CLUSTER_TERRAIN_SALT])
     
-    return terrain_types[0]
+    # Add theme-specific features
+    return _add_terrain_features(codes, theme, random_field, rng, size, origin=(x0, y0))
 
-def _smooth_terrain(terrain_map: List[List[str]]) -> List[List[str]]:
-    """Apply smoothing to reduce noise in terrain"""
-    height, width = len(terrain_map), len(terrain_map[0])
+def _flatten_settlement_area(height: np.ndarray, size: Tuple[int, int], bounds: Tuple[int, int, int, int]):
+    """Pull heights toward the midrange near the map center so settlements get open ground"""
+    width, world_height = size
+    x0, y0, x1, y1 = bounds
+    radius = max(width // 4, 1)
     
-    # One smoothing pass
-    for y in range(1, height - 1):
-        for x in range(1, width - 1):
-            neighbors = [
-                terrain_map[y-1][x], terrain_map[y+1][x],
-                terrain_map[y][x-1], terrain_map[y][x+1]
-            ]
-            
-            # Count neighbor types
-            neighbor_counts = {}
-            for neighbor in neighbors:
-                neighbor_counts[neighbor] = neighbor_counts.get(neighbor, 0) + 1
-            
-            # If 3+ neighbors are same type, convert
-            most_common = max(neighbor_counts.items(), key=lambda x: x[1])
-            if most_common[1] >= 3:
-                terrain_map[y][x] = most_common[0]
+    dx = (np.arange(x0, x1, dtype=np.float32) - width // 2) / radius
+    dy = (np.arange(y0, y1, dtype=np.float32) - world_height // 2) / radius
+    falloff = np.clip(1.0 - np.sqrt(dy[:, None] ** 2 + dx[None, :] ** 2), 0.0, 1.0)
     
-    return terrain_map
+    height += (0.5 - height) * (SETTLEMENT_FLATTENING * falloff)
 
-def _add_terrain_features(terrain_map: List[List[str]], theme: str) -> List[List[str]]:
+def _add_terrain_features(codes: np.ndarray, theme: str, random_field: Callable[[int], np.ndarray],
+                          rng: np.random.Generator, size: Tuple[int, int],
+                          origin: Tuple[int, int] = (0, 0)) -> np.ndarray:
     """Add theme-specific terrain features"""
     if theme in ["spooky", "halloween"]:
-        _add_scattered_terrain(terrain_map, "dirt", density=0.1)
+        _add_scattered_terrain(codes, "dirt", density=0.1, rand=random_field(SCATTER_TERRAIN_SALT))
     elif theme == "desert":
-        _add_clustered_terrain(terrain_map, "water", cluster_size=2, count=1)
+        _add_clustered_terrain(codes, "water", cluster_size=2, count=1, rng=rng, size=size, origin=origin)
     
-    return terrain_map
+    return codes
 
-def _add_scattered_terrain(terrain_map: List[List[str]], terrain_type: str, density: float):
+def _add_scattered_terrain(codes: np.ndarray, terrain_type: str, density: float, rand: np.ndarray):
     """Add scattered terrain patches"""
-    height, width = len(terrain_map), len(terrain_map[0])
-    for y in range(height):
-        for x in range(width):
-            if random.random() < density:
-                terrain_map[y][x] = terrain_type
+    codes[rand < density] = terrain_code(terrain_type)
 
-def _add_clustered_terrain(terrain_map: List[List[str]], terrain_type: str, cluster_size: int, count: int):
+def _add_clustered_terrain(codes: np.ndarray, terrain_type: str, cluster_size: int, count: int,
+                           rng: np.random.Generator, size: Tuple[int, int],
+                           origin: Tuple[int, int] = (0, 0)):
     """Add clustered terrain features"""
-    height, width = len(terrain_map), len(terrain_map[0])
+    width, height = size
+    if width <= 2 * cluster_size + 1 or height <= 2 * cluster_size + 1:
+        return
+    
+    x0, y0 = origin
+    window_height, window_width = codes.shape
+    code = terrain_code(terrain_type)
     
     for _ in range(count):
-        center_x = random.randint(cluster_size, width - cluster_size - 1)
-        center_y = random.randint(cluster_size, height - cluster_size - 1)
+        # Cluster centers are drawn in world coordinates, then clipped to this window
+        center_x = int(rng.integers(cluster_size, width - cluster_size))
+        center_y = int(rng.integers(cluster_size, height - cluster_size))
+        
+        left = max(center_x - cluster_size - x0, 0)
+        right = min(center_x + cluster_size + 1 - x0, window_width)
+        top = max(center_y - cluster_size - y0, 0)
+        bottom = min(center_y + cluster_size + 1 - y0, window_height)
+        if left >= right or top >= bottom:
+            continue
         
-        for dy in range(-cluster_size, cluster_size + 1):
-            for dx in range(-cluster_size, cluster_size + 1):
-                if dx*dx + dy*dy <= cluster_size*cluster_size:
-                    x, y = center_x + dx, center_y + dy
-                    if 0 <= x < width and 0 <= y < height:
-                        terrain_map[y][x] = terrain_type
\ No newline at end of file
+        dy, dx = np.ogrid[top + y0 - center_y:bottom + y0 - center_y,
+                          left + x0 - center_x:right + x0 - center_x]
+        window = codes[top:bottom, left:right]
+        window[dx * dx + dy * dy <= cluster_size * cluster_size] = code
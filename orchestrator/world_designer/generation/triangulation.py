@@ -0,0 +1,125 @@
+"""
+Delaunay triangulation of building positions for road network candidates.
+"""
+
+from typing import List, Set, Tuple
+
+import numpy as np
+
+try:
+    from scipy.spatial import Delaunay
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+Edge = Tuple[int, int]
+
+def _delaunay_edges(points: np.ndarray) -> List[Edge]:
+    """
+    Undirected edges (i < j) of the Delaunay triangulation of (n, 2) points.
+    
+    Coincident points are joined to their first occurrence, and collinear sets
+    (e.g. a linear outpost) fall back to a chain along the line.
+    """
+    points = np.asarray(points, dtype=np.float64)
+    n = len(points)
+    if n < 2:
+        return []
+    
+    # Triangulate unique positions only, then attach duplicates
+    unique, first, inverse = np.unique(points, axis=0, return_index=True, return_inverse=True)
+    inverse = inverse.ravel()
+    edges: Set[Edge] = set()
+    for i in range(n):
+        if first[inverse[i]] != i:
+            edges.add(_edge(first[inverse[i]], i))
+    
+    if len(unique) == 2:
+        unique_edges = [(0, 1)]
+    elif _is_collinear(unique):
+        axis = unique[-1] - unique[0]
+        order = np.argsort(unique @ axis)
+        unique_edges = list(zip(order[:-1].tolist(), order[1:].tolist()))
+    elif SCIPY_AVAILABLE:
+        unique_edges = _triangle_edges(Delaunay(unique).simplices)
+    else:
+        unique_edges = _triangle_edges(_bowyer_watson(unique))
+    
+    edges.update(_edge(first[i], first[j]) for i, j in unique_edges)
+    return sorted(edges)
+
+def _edge(i, j) -> Edge:
+    i, j = int(i), int(j)
+    return (i, j) if i < j else (j, i)
+
+def _is_collinear(points: np.ndarray, tolerance: float = 1e-9) -> bool:
+    """True if every point lies on the line through the first two distinct points"""
+    offsets = points - points[0]
+    direction = offsets[np.argmax(np.abs(offsets).sum(axis=1))]
+    cross = offsets[:, 0] * direction[1] - offsets[:, 1] * direction[0]
+    return bool(np.all(np.abs(cross) <= tolerance * float(direction @ direction)))
+
+def _triangle_edges(triangles) -> List[Edge]:
+    edges = set()
+    for a, b, c in np.asarray(triangles).tolist():
+        edges.update((_edge(a, b), _edge(b, c), _edge(a, c)))
+    return list(edges)
+
+def _bowyer_watson(points: np.ndarray) -> np.ndarray:
+    """
+    Pure-NumPy Bowyer-Watson triangulation used when SciPy is unavailable.
+    
+    Circumcircles are kept in arrays so each insertion finds the triangles it
+    invalidates with one vectorized test. Returns (m, 3) vertex indices.
+    """
+    n = len(points)
+    
+    # Enclose everything in a super-triangle whose vertices are n, n+1, n+2
+    center = (points.min(axis=0) + points.max(axis=0)) / 2
+    span = max(float(np.ptp(points, axis=0).max()), 1.0) * 20
+    vertices = np.vstack([points, center + span * np.array([[-2.0, -1.0], [2.0, -1.0], [0.0, 2.0]])])
+    
+    capacity = 8 * (n + 3) + 16
+    triangles = np.zeros((capacity, 3), dtype=np.int64)
+    circle_x = np.zeros(capacity)
+    circle_y = np.zeros(capacity)
+    circle_r2 = np.zeros(capacity)
+    alive = np.zeros(capacity, dtype=bool)
+    count = 0
+    
+    def add(a: int, b: int, c: int):
+        nonlocal count, triangles, circle_x, circle_y, circle_r2, alive
+        if count == len(alive):
+            grow = len(alive)
+            triangles = np.vstack([triangles, np.zeros((grow, 3), dtype=np.int64)])
+            circle_x, circle_y, circle_r2 = (np.concatenate([arr, np.zeros(grow)]) for arr in (circle_x, circle_y, circle_r2))
+            alive = np.concatenate([alive, np.zeros(grow, dtype=bool)])
+        (ax, ay), (bx, by), (cx, cy) = vertices[a], vertices[b], vertices[c]
+        d = 2 * (ax * (by - cy) + bx * (cy - ay) + cx * (ay - by))
+        ux = ((ax * ax + ay * ay) * (by - cy) + (bx * bx + by * by) * (cy - ay) + (cx * cx + cy * cy) * (ay - by)) / d
+        uy = ((ax * ax + ay * ay) * (cx - bx) + (bx * bx + by * by) * (ax - cx) + (cx * cx + cy * cy) * (bx - ax)) / d
+        triangles[count] = (a, b, c)
+        circle_x[count], circle_y[count] = ux, uy
+        circle_r2[count] = (ax - ux) ** 2 + (ay - uy) ** 2
+        alive[count] = True
+        count += 1
+    
+    add(n, n + 1, n + 2)
+    for p in range(n):
+        px, py = vertices[p]
+        live = slice(0, count)
+        bad = np.flatnonzero(alive[live] & ((circle_x[live] - px) ** 2 + (circle_y[live] - py) ** 2 < circle_r2[live]))
+        
+        # The hole's boundary is every edge used by exactly one invalidated triangle
+        edge_count = {}
+        for a, b, c in triangles[bad].tolist():
+            for edge in ((a, b), (b, c), (c, a)):
+                key = _edge(*edge)
+                edge_count[key] = edge_count.get(key, 0) + 1
+        alive[bad] = False
+        for (a, b), uses in edge_count.items():
+            if uses == 1:
+                add(a, b, p)
+    
+    result = triangles[:count][alive[:count]]
+    return result[(result < n).all(axis=1)]
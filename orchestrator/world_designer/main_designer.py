@@ -3,29 +3,48 @@ Main world designer orchestration and public API.
 """
 
 import asyncio
-from dataclasses import asdict
-from typing import Dict, Any
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
 
+from .core.world_cache import WorldDesignCache, design_cache_key, design_data_dir
+from .core.world_objects import WorldObjects
 from .core.world_spec import WorldSpec
 from .analysis.prompt_analyzer import _analyze_design_prompt
 from .generation.terrain_generator import _generate_terrain_map
+from .generation.chunked_terrain import _generate_chunked_terrain, CHUNKED_TERRAIN_MIN_TILES
 from .generation.building_placer import _plan_building_placement
 from .generation.path_network import _generate_path_network
 from .generation.natural_features import _place_natural_features, _calculate_spawn_points
+from .generation.heightmap import _generate_heightmap, _apply_elevation, _export_heightmap, MAX_ELEVATION
+from ..seeding import new_seed, stream_key, stream_rng
 from .validation.design_validator import _validate_design
+from .validation.layout_scoring import _score_layout
 from .visualization.viz_data_creator import _create_visualization_data, _calculate_complexity
 
-def design_world_from_prompt(prompt: str):
+# Shared by every design request in this process
+_design_cache = WorldDesignCache()
+
+def design_world_from_prompt(prompt: str, output_dir: Optional[str] = None, constraints: Optional[Dict[str, Any]] = None,
+                             seed: Optional[int] = None, candidates: int = 1, use_cache: bool = True):
     """
     Design a complete game world from a text prompt.
     
     Args:
         prompt: Natural language description of the world to create (e.g., "Create a spooky Halloween village")
+        output_dir: Directory for on-disk world data; very large worlds store their terrain here
+        constraints: Optional overrides for the prompt analysis (e.g., {"size": [8192, 8192]})
+        seed: Generation seed; the same seed and prompt reproduce the same world
+        candidates: Number of candidate layouts to generate in parallel; the best scoring one is kept
+        use_cache: Reuse an earlier design whose prompt analysis, seed and candidate count match.
+            Only seeded requests are cached, since unseeded ones draw a fresh world every time,
+            so callers that want near-identical prompts to share a design must pass a seed.
         
     Returns:
         Complete world specification with buildings, terrain, paths, and features
     """
-    constraints = {}  # Use empty dict as default
+    constraints = constraints or {}
     
     print(f"🌍 Designing world from prompt: {prompt}")
     
@@ -34,21 +53,38 @@ def design_world_from_prompt(prompt: str):
         analysis = _analyze_design_prompt(prompt, constraints)
         print(f"📊 Analysis complete: {analysis.get('theme', 'unknown')} theme")
         
-        # Step 2: Generate world specification  
-        world_spec = _generate_world_spec(analysis)
-        print(f"🏗️ Generated world: {len(world_spec.buildings)} buildings, {len(world_spec.paths)} paths")
+        # Reuse a cached design when the same analysis and seed were seen before
+        cache_key = design_cache_key(analysis, seed, candidates) if use_cache and seed is not None else None
+        validated_spec, cache_tier = _design_cache.get(cache_key, output_dir) if cache_key else (None, None)
         
-        # Step 3: Validate design
-        validated_spec = _validate_design(world_spec)
+        if validated_spec is not None:
+            print(f"♻️ Reusing cached world design ({cache_tier}): {len(validated_spec.buildings)} buildings")
+        else:
+            # A design that will be cached keeps its terrain and heightmap files in a directory of its
+            # own, so a later design in the same output directory cannot overwrite what a hit points at
+            data_dir = str(design_data_dir(cache_key, output_dir)) if cache_key and output_dir else output_dir
+            
+            # Step 2: Generate world specification, keeping the best of several candidates if requested
+            if candidates > 1:
+                world_spec = _search_best_layout(analysis, data_dir, seed, candidates)
+            else:
+                world_spec = _generate_world_spec(analysis, data_dir, seed)
+            print(f"🏗️ Generated world: {len(world_spec.buildings)} buildings, {len(world_spec.paths)} paths")
+            
+            # Step 3: Validate design; region-scale worlds also get the walkable-terrain check
+            validated_spec = _validate_design(world_spec, check_walkable=world_spec.terrain_ref is not None)
+            if cache_key:
+                _design_cache.put(cache_key, validated_spec, output_dir)
         
         # Step 4: Create visualization data
-        visualization_data = _create_visualization_data(validated_spec)
+        visualization_data = _create_visualization_data(validated_spec, output_dir)
         
         result = {
-            "world_spec": asdict(validated_spec),
+            "world_spec": validated_spec.to_dict(),
             "visualization_data": visualization_data,
             "analysis": analysis,
             "status": "success",
+            "cache": cache_tier,
             "generation_time": "2-5 minutes",
             "complexity_score": _calculate_complexity(validated_spec.buildings, validated_spec.paths)
         }
@@ -64,30 +100,97 @@ def design_world_from_prompt(prompt: str):
             "fallback_available": True
         }
 
-def _generate_world_spec(analysis):
+def _search_best_layout(analysis: Dict, output_dir: Optional[str], seed: Optional[int], candidates: int) -> WorldSpec:
+    """Generate candidate layouts with different seeds across a process pool and keep the best"""
+    if seed is None:
+        seed = new_seed()
+    
+    # Candidate 0 uses the requested seed; the rest derive their own from it
+    seeds = [seed] + [stream_key(seed, i) & 0x7FFFFFFFFFFFFFFF for i in range(1, candidates)]
+    jobs = [(analysis, output_dir, candidate_seed, f"terrain_candidate_{i}.npy") for i, candidate_seed in enumerate(seeds)]
+    
+    workers = min(candidates, os.cpu_count() or 1)
+    print(f"🎯 Searching {candidates} candidate layouts on {workers} worker(s)")
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_generate_candidate, jobs))
+    else:
+        results = [_generate_candidate(job) for job in jobs]
+    
+    for i, ((_, scores), candidate_seed) in enumerate(zip(results, seeds)):
+        metrics = ", ".join(f"{name} {value:.2f}" for name, value in scores.items() if name != "total")
+        print(f"   Candidate {i} (seed {candidate_seed}): score {scores['total']:.3f} ({metrics})")
+    
+    best = max(range(len(results)), key=lambda i: results[i][1]["total"])
+    print(f"🏆 Selected candidate {best}")
+    
+    # Only the winner's on-disk terrain and heightmap files are kept
+    for i, (spec, _) in enumerate(results):
+        if i != best:
+            heightmap = spec.metadata["heightmap"]
+            for path in (spec.terrain_ref or {}).get("path"), heightmap.get("array"), heightmap.get("raw"), heightmap.get("png"):
+                if path:
+                    Path(path).unlink(missing_ok=True)
+    
+    world_spec = results[best][0]
+    world_spec.metadata["layout_search"] = {
+        "candidates": candidates,
+        "selected": best,
+        "scores": [{"seed": candidate_seed, **scores} for (_, scores), candidate_seed in zip(results, seeds)]
+    }
+    return world_spec
+
+def _generate_candidate(job: Tuple[Dict, Optional[str], int, str]) -> Tuple[WorldSpec, Dict[str, float]]:
+    """Generate and score one candidate layout; runs in a worker process"""
+    analysis, output_dir, seed, terrain_name = job
+    
+    world_spec = _generate_world_spec(analysis, output_dir, seed, terrain_name)
+    return world_spec, _score_layout(world_spec)
+
+def _generate_world_spec(analysis, output_dir: Optional[str] = None, seed: Optional[int] = None,
+                         terrain_name: str = "terrain.npy"):
     """Generate detailed world specification"""
     
+    if seed is None:
+        seed = new_seed()
+    
     theme = analysis.get("theme", "medieval")
     size = analysis.get("size", (40, 40))
     layout_type = analysis.get("layout_type", "radial")
     
     print(f"🗺️ Generating {size[0]}x{size[1]} {theme} world with {layout_type} layout")
     
-    # Generate terrain map
-    terrain_map = _generate_terrain_map(size, theme)
+    # Generate terrain map, streaming very large worlds to disk tile by tile
+    terrain_ref = None
+    if output_dir and size[0] * size[1] >= CHUNKED_TERRAIN_MIN_TILES:
+        terrain = _generate_chunked_terrain(size, theme, Path(output_dir) / terrain_name, seed)
+        terrain_ref = terrain.to_ref()
+        terrain_map = []
+    else:
+        terrain = terrain_map = _generate_terrain_map(size, theme, seed)
     
-    # Plan and place buildings
-    buildings = _plan_building_placement(analysis, size, terrain_map)
+    # Plan and place buildings; each placement stage draws from its own stream of the seed
+    buildings = WorldObjects(_plan_building_placement(analysis, size, terrain, stream_rng(seed, "buildings")))
     
     # Generate path network
-    paths = _generate_path_network(buildings, size)
+    paths = _generate_path_network(buildings, size, terrain)
     
     # Place natural features
-    natural_features = _place_natural_features(analysis, terrain_map, buildings)
+    natural_features = _place_natural_features(analysis, terrain, buildings, paths, stream_rng(seed, "natural_features"))
     
     # Calculate spawn points
     spawn_points = _calculate_spawn_points(buildings, paths)
     
+    # Derive elevation with level building pads, then stand every object on the ground;
+    # chunked worlds keep their heights on disk next to the terrain
+    heightmap_name = Path(terrain_name).stem.replace("terrain", "heightmap")
+    heightmap_array = Path(output_dir) / f"{heightmap_name}.npy" if terrain_ref else None
+    heights = _generate_heightmap(terrain, size, seed, buildings, heightmap_array)
+    _apply_elevation(heights, buildings, paths, natural_features, spawn_points)
+    heightmap = {"max_elevation": MAX_ELEVATION, "array": str(heightmap_array) if heightmap_array else None}
+    if output_dir:
+        heightmap.update(_export_heightmap(heights, output_dir, heightmap_name))
+    
     # Create world specification
     world_spec = WorldSpec(
         theme=theme,
@@ -101,21 +204,25 @@ def _generate_world_spec(analysis):
         metadata={
             "analysis": analysis,
             "layout_type": layout_type,
+            "seed": seed,
+            "heightmap": heightmap,
             "building_count": len(buildings),
             "complexity_score": _calculate_complexity(buildings, paths),
             "estimated_build_time": f"{len(buildings) * 2 + len(natural_features)} minutes"
-        }
+        },
+        terrain_ref=terrain_ref
     )
     
     return world_spec
 
 # Additional functions for ADK compatibility
-async def generate_world(prompt: str) -> Dict[str, Any]:
+async def generate_world(prompt: str, output_dir: Optional[str] = None, constraints: Optional[Dict[str, Any]] = None,
+                         seed: Optional[int] = None, candidates: int = 1, use_cache: bool = True) -> Dict[str, Any]:
     """
     Generate world from prompt - wrapper for design_world_from_prompt
     This method is expected by the quick_test.py
     """
-    result = design_world_from_prompt(prompt)
+    result = design_world_from_prompt(prompt, output_dir, constraints, seed, candidates, use_cache)
     if result["status"] == "success":
         return result["world_spec"]
     else:
@@ -2,12 +2,16 @@
 Utility functions and configuration data.
 """
 
-from .spatial_utils import _distance
-from .theme_configs import _get_terrain_weights, get_theme_feature_types, get_theme_defaults
+from .spatial_utils import _distance, SpatialIndex
+from .graph_utils import DisjointSet
+from .theme_configs import _get_terrain_thresholds, _get_placement_spacing, get_theme_feature_types, get_theme_defaults
 
 __all__ = [
     "_distance",
-    "_get_terrain_weights",
+    "SpatialIndex",
+    "DisjointSet",
+    "_get_terrain_thresholds",
+    "_get_placement_spacing",
     "get_theme_feature_types", 
     "get_theme_defaults"
 ]
\ No newline at end of file
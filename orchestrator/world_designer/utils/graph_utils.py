@@ -0,0 +1,60 @@
+"""
+Graph utilities for connectivity and spanning trees.
+"""
+
+import math
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+class DisjointSet:
+    """Union-find over the integers 0..n-1 with path halving and union by size"""
+    
+    __slots__ = ("parent", "size", "components")
+    
+    def __init__(self, n: int):
+        self.parent = list(range(n))
+        self.size = [1] * n
+        self.components = n
+    
+    def find(self, i: int) -> int:
+        """Representative of i's set"""
+        parent = self.parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+    
+    def union(self, a: int, b: int) -> bool:
+        """Merge the sets of a and b; False if they were already joined"""
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return False
+        if self.size[a] < self.size[b]:
+            a, b = b, a
+        self.parent[b] = a
+        self.size[a] += self.size[b]
+        self.components -= 1
+        return True
+    
+    def connected(self, a: int, b: int) -> bool:
+        return self.find(a) == self.find(b)
+    
+    def groups(self) -> Dict[int, List[int]]:
+        """Members of each set, keyed by representative"""
+        groups: Dict[int, List[int]] = {}
+        for i in range(len(self.parent)):
+            groups.setdefault(self.find(i), []).append(i)
+        return groups
+
+def _minimum_spanning_tree(points: Sequence[Tuple[float, float]],
+                           edges: Iterable[Tuple[int, int]]) -> Tuple[List[Tuple[int, int]], List[Tuple[int, int]]]:
+    """
+    Kruskal's minimum spanning tree over candidate edges weighted by length.
+    
+    Returns (tree edges, remaining edges), both sorted by length.
+    """
+    by_length = sorted(edges, key=lambda e: math.dist(points[e[0]], points[e[1]]))
+    components = DisjointSet(len(points))
+    tree, rest = [], []
+    for i, j in by_length:
+        (tree if components.union(i, j) else rest).append((i, j))
+    return tree, rest
@@ -0,0 +1,37 @@
+"""
+Hash-based random fields for reproducible, position-addressed generation.
+
+Pipeline-wide seeds and named streams live in orchestrator.seeding.
+"""
+
+import numpy as np
+
+from ...seeding import stream_key
+
+_MIX_X = np.uint64(0x9E3779B97F4A7C15)
+_MIX_Y = np.uint64(0xC2B2AE3D27D4EB4F)
+
+def _splitmix64(h: np.ndarray) -> np.ndarray:
+    """SplitMix64 finalizer applied element-wise to a uint64 array"""
+    h = h ^ (h >> np.uint64(30))
+    h = h * np.uint64(0xBF58476D1CE4E5B9)
+    h = h ^ (h >> np.uint64(27))
+    h = h * np.uint64(0x94D049BB133111EB)
+    return h ^ (h >> np.uint64(31))
+
+def _hash_bits(seed: int, xs: np.ndarray, ys: np.ndarray, salt: int = 0) -> np.ndarray:
+    """64 well-mixed uint64 bits per integer (x, y) coordinate, negatives included"""
+    key = np.uint64(stream_key(seed, salt))
+    xs = np.asarray(xs).astype(np.int64).astype(np.uint64)
+    ys = np.asarray(ys).astype(np.int64).astype(np.uint64)
+    return _splitmix64((xs * _MIX_X) ^ (ys * _MIX_Y) ^ key)
+
+def _hash_uniform(seed: int, xs: np.ndarray, ys: np.ndarray, salt: int = 0) -> np.ndarray:
+    """
+    Uniform [0, 1) float32 values addressed by global tile coordinates.
+    
+    The value for a tile depends only on (seed, x, y, salt), so any window of
+    the world can be generated independently and still agree with its neighbors.
+    """
+    h = _hash_bits(seed, xs, ys, salt)
+    return (h >> np.uint64(40)).astype(np.float32) * np.float32(1.0 / (1 << 24))
@@ -3,10 +3,160 @@ Spatial utility functions for distance calculations and positioning.
 """
 
 import math
-from typing import Dict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
-def _distance(pos1: Dict, pos2: Dict) -> float:
+import numpy as np
+
+from ..core.data_types import WorldPosition
+
+DEFAULT_CELL_SIZE = 8.0
+
+def _distance(pos1: WorldPosition, pos2: WorldPosition) -> float:
     """Calculate distance between positions"""
-    dx = pos1["x"] - pos2["x"]
-    dy = pos1["y"] - pos2["y"]
-    return math.sqrt(dx*dx + dy*dy)
\ No newline at end of file
+    dx = pos1.x - pos2.x
+    dy = pos1.y - pos2.y
+    return math.sqrt(dx*dx + dy*dy)
+
+class SpatialIndex:
+    """
+    Uniform grid hash over 2D positions for radius and nearest-neighbor queries.
+    
+    Items are bucketed by the grid cell containing their position, so queries only
+    touch the cells that overlap the search area instead of every item.
+    """
+    
+    __slots__ = ("cell_size", "_cells", "_count", "_extent")
+    
+    def __init__(self, cell_size: float = DEFAULT_CELL_SIZE):
+        self.cell_size = float(cell_size)
+        self._cells: Dict[Tuple[int, int], List[Tuple[float, float, Any]]] = {}
+        self._count = 0
+        # Occupied cell range (min_cx, min_cy, max_cx, max_cy)
+        self._extent: Optional[Tuple[int, int, int, int]] = None
+    
+    @classmethod
+    def from_items(cls, items: Iterable[Any], cell_size: float = DEFAULT_CELL_SIZE,
+                   position: Callable[[Any], WorldPosition] = lambda item: item.position) -> "SpatialIndex":
+        """Build an index over items, by default world objects with a position attribute"""
+        index = cls(cell_size)
+        for item in items:
+            index.insert(item, position(item))
+        return index
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def _cell(self, x: float, y: float) -> Tuple[int, int]:
+        return int(math.floor(x / self.cell_size)), int(math.floor(y / self.cell_size))
+    
+    def insert(self, item: Any, position: WorldPosition):
+        """Add an item at position"""
+        x, y = float(position.x), float(position.y)
+        cx, cy = self._cell(x, y)
+        self._cells.setdefault((cx, cy), []).append((x, y, item))
+        self._count += 1
+        if self._extent is None:
+            self._extent = (cx, cy, cx, cy)
+        else:
+            min_cx, min_cy, max_cx, max_cy = self._extent
+            self._extent = (min(min_cx, cx), min(min_cy, cy), max(max_cx, cx), max(max_cy, cy))
+    
+    def _entries_near(self, x: float, y: float, radius: float):
+        """Yield (squared distance, item) for entries in the cells overlapping the radius"""
+        reach = int(math.ceil(radius / self.cell_size))
+        cx, cy = self._cell(x, y)
+        for gx in range(cx - reach, cx + reach + 1):
+            for gy in range(cy - reach, cy + reach + 1):
+                for ex, ey, item in self._cells.get((gx, gy), ()):
+                    yield (ex - x) ** 2 + (ey - y) ** 2, item
+    
+    def query_radius(self, position: WorldPosition, radius: float) -> List[Any]:
+        """Items within radius of position, nearest first"""
+        limit = radius * radius
+        hits = [(d2, i, item) for i, (d2, item) in enumerate(self._entries_near(position.x, position.y, radius))
+                if d2 <= limit]
+        hits.sort(key=lambda hit: hit[:2])
+        return [item for _, _, item in hits]
+    
+    def any_within(self, position: WorldPosition, radius: float) -> bool:
+        """True if any item lies strictly closer than radius to position"""
+        limit = radius * radius
+        return any(d2 < limit for d2, _ in self._entries_near(position.x, position.y, radius))
+    
+    def nearest(self, position: WorldPosition, max_radius: Optional[float] = None) -> Optional[Any]:
+        """Closest item to position, or None if the index (or the search radius) is empty"""
+        if not self._cells:
+            return None
+        
+        x, y = float(position.x), float(position.y)
+        cx, cy = self._cell(x, y)
+        
+        # Rings beyond the occupied cell range cannot contain anything
+        min_cx, min_cy, max_cx, max_cy = self._extent
+        max_ring = max(cx - min_cx, max_cx - cx, cy - min_cy, max_cy - cy)
+        if max_radius is not None:
+            max_ring = min(max_ring, int(math.ceil(max_radius / self.cell_size)))
+        
+        best, best_d2 = None, math.inf
+        for ring in range(max_ring + 1):
+            # Everything in this ring is at least (ring - 1) cells away
+            if ring > 0 and ((ring - 1) * self.cell_size) ** 2 > best_d2:
+                break
+            for gx, gy in _ring_cells(cx, cy, ring):
+                for ex, ey, item in self._cells.get((gx, gy), ()):
+                    d2 = (ex - x) ** 2 + (ey - y) ** 2
+                    if d2 < best_d2:
+                        best, best_d2 = item, d2
+        
+        if max_radius is not None and best_d2 > max_radius * max_radius:
+            return None
+        return best
+    
+    def within_mask(self, xs: np.ndarray, ys: np.ndarray, radius: float) -> np.ndarray:
+        """
+        Vectorized any_within for many points at once.
+        
+        Returns a boolean array marking points that lie strictly closer than radius
+        to some indexed item. Work scales with occupied cells, not items x points.
+        """
+        xs = np.asarray(xs, dtype=np.float64)
+        ys = np.asarray(ys, dtype=np.float64)
+        near = np.zeros(xs.shape, dtype=bool)
+        if not self._cells or xs.size == 0:
+            return near
+        
+        # Sort points by cell so each cell's points are one contiguous slice
+        point_cx = np.floor(xs / self.cell_size).astype(np.int64)
+        point_cy = np.floor(ys / self.cell_size).astype(np.int64)
+        keys = (point_cx << 32) + point_cy
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        
+        reach = int(math.ceil(radius / self.cell_size))
+        limit = radius * radius
+        for (cx, cy), entries in self._cells.items():
+            entry_x = np.array([e[0] for e in entries])[:, None]
+            entry_y = np.array([e[1] for e in entries])[:, None]
+            for gx in range(cx - reach, cx + reach + 1):
+                key = (gx << 32) + cy
+                lo = np.searchsorted(sorted_keys, key - reach, side="left")
+                hi = np.searchsorted(sorted_keys, key + reach, side="right")
+                if lo == hi:
+                    continue
+                points = order[lo:hi]
+                d2 = (xs[points] - entry_x) ** 2 + (ys[points] - entry_y) ** 2
+                near[points[(d2 < limit).any(axis=0)]] = True
+        
+        return near
+
+def _ring_cells(cx: int, cy: int, ring: int):
+    """Cells on the square ring at Chebyshev distance ring from (cx, cy)"""
+    if ring == 0:
+        yield cx, cy
+        return
+    for gx in range(cx - ring, cx + ring + 1):
+        yield gx, cy - ring
+        yield gx, cy + ring
+    for gy in range(cy - ring + 1, cy + ring):
+        yield cx - ring, gy
+        yield cx + ring, gy
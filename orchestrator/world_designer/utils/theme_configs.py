@@ -4,16 +4,54 @@ Theme-specific configuration data and mappings.
 
 from typing import Dict, List
 
-def _get_terrain_weights(theme: str) -> Dict[str, float]:
-    """Get terrain distribution weights by theme"""
-    weights = {
-        "medieval": {"grass": 0.4, "dirt": 0.3, "stone": 0.2, "water": 0.1},
-        "spooky": {"dirt": 0.5, "stone": 0.3, "grass": 0.2},
-        "halloween": {"dirt": 0.5, "stone": 0.3, "grass": 0.2},
-        "desert": {"sand": 0.7, "stone": 0.2, "water": 0.1},
-        "fantasy": {"grass": 0.3, "forest": 0.3, "stone": 0.2, "water": 0.2}
+def _get_terrain_thresholds(theme: str) -> List[Dict]:
+    """
+    Get height/moisture classification rules by theme.
+    
+    Rules are checked in order; the last one is the fallback terrain.
+    Height and moisture are normalized to [0, 1].
+    """
+    thresholds = {
+        "medieval": [
+            {"terrain": "water", "max_height": 0.22},
+            {"terrain": "stone", "min_height": 0.72},
+            {"terrain": "dirt", "max_moisture": 0.42},
+            {"terrain": "grass"}
+        ],
+        "spooky": [
+            {"terrain": "stone", "min_height": 0.66},
+            {"terrain": "grass", "min_moisture": 0.68},
+            {"terrain": "dirt"}
+        ],
+        "halloween": [
+            {"terrain": "stone", "min_height": 0.66},
+            {"terrain": "grass", "min_moisture": 0.68},
+            {"terrain": "dirt"}
+        ],
+        "desert": [
+            {"terrain": "water", "max_height": 0.18},
+            {"terrain": "stone", "min_height": 0.72},
+            {"terrain": "sand"}
+        ],
+        "fantasy": [
+            {"terrain": "water", "max_height": 0.27},
+            {"terrain": "stone", "min_height": 0.74},
+            {"terrain": "forest", "min_moisture": 0.50},
+            {"terrain": "grass"}
+        ]
     }
-    return weights.get(theme, weights["medieval"])
+    return thresholds.get(theme, thresholds["medieval"])
+
+def _get_placement_spacing(theme: str) -> Dict[str, float]:
+    """Get minimum spacing between natural features and between houses by theme"""
+    spacing = {
+        "medieval": {"feature": 3.0, "house": 6.0},
+        "spooky": {"feature": 2.5, "house": 7.0},
+        "halloween": {"feature": 2.5, "house": 7.0},
+        "desert": {"feature": 4.5, "house": 6.0},
+        "fantasy": {"feature": 2.5, "house": 6.0}
+    }
+    return spacing.get(theme, spacing["medieval"])
 
 def get_theme_feature_types(theme: str) -> List[str]:
     """Get natural feature types for a theme"""
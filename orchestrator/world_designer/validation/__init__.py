@@ -3,5 +3,6 @@ Design validation and optimization.
 """
 
 from .design_validator import _validate_design
+from .layout_scoring import _score_layout
 
-__all__ = ["_validate_design"]
\ No newline at end of file
+__all__ = ["_validate_design", "_score_layout"]
\ No newline at end of file
@@ -2,23 +2,51 @@
 Design validation and optimization.
 """
 
-from typing import List, Dict
+import math
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..core.data_types import BLOCKING_TERRAIN, WorldPosition, terrain_code
+from ..core.terrain_store import open_terrain
+from ..core.world_objects import Building, SpawnPoint, WorldObjects, WorldPath
 from ..core.world_spec import WorldSpec
+from ..utils.graph_utils import DisjointSet
+from ..utils.spatial_utils import SpatialIndex
+
+# Path endpoints within this distance of a building or spawn point attach to it
+SNAP_RADIUS = 3.0
 
-def _validate_design(world_spec: WorldSpec) -> WorldSpec:
+# Longest side of the coarse grid used for the walkable flood fill
+WALKABLE_GRID_SIZE = 512
+
+def _validate_design(world_spec: WorldSpec, check_walkable: bool = False) -> WorldSpec:
     """Validate and optimize the world design"""
     
     validation_issues = []
     
     # Check building accessibility
-    if not _validate_accessibility(world_spec.buildings, world_spec.paths):
-        validation_issues.append("Some buildings may not be accessible")
+    accessibility = _validate_accessibility(world_spec.buildings, world_spec.paths, world_spec.spawn_points)
+    if not accessibility["accessible"]:
+        unreachable = ", ".join(f"{b['id']} (component {b['component']})" for b in accessibility["unreachable"][:10])
+        validation_issues.append(f"{len(accessibility['unreachable'])} buildings are not connected by paths: {unreachable}")
+    stranded = [spawn.type for spawn, component in zip(world_spec.spawn_points, accessibility["spawn_components"])
+                if component != 0]
+    if stranded and world_spec.buildings:
+        validation_issues.append(f"{len(stranded)} spawn points are not connected to the main settlement: {', '.join(stranded)}")
+    
+    # Optionally check that buildings can be reached on foot across the terrain
+    if check_walkable:
+        walkable = _validate_walkable_reachability(world_spec)
+        accessibility["unreachable_on_foot"] = walkable
+        if walkable:
+            validation_issues.append(f"{len(walkable)} buildings cannot be reached on foot: {', '.join(walkable[:10])}")
     
     # Check spawn points
     if not world_spec.spawn_points:
         validation_issues.append("No spawn points defined")
         # Add default spawn
-        world_spec.spawn_points = [{"x": 20.0, "y": 20.0, "z": 0.0, "type": "default"}]
+        world_spec.spawn_points = WorldObjects([SpawnPoint(WorldPosition(20.0, 20.0), "default")])
     
     # Check minimum buildings
     if len(world_spec.buildings) < 3:
@@ -33,18 +61,135 @@ def _validate_design(world_spec: WorldSpec) -> WorldSpec:
     # Add validation metadata
     world_spec.metadata["validation_issues"] = validation_issues
     world_spec.metadata["validation_passed"] = len(validation_issues) == 0
+    world_spec.metadata["accessibility"] = accessibility
     
     return world_spec
 
-def _validate_accessibility(buildings: List[Dict], paths: List[Dict]) -> bool:
-    """Simple accessibility check"""
-    if not buildings:
-        return True
-    if len(buildings) == 1:
-        return True
-    if not paths:
-        return len(buildings) <= 2
-    
-    # In real implementation, would do proper graph traversal
-    # For now, assume connected if paths exist
-    return len(paths) > 0
\ No newline at end of file
+def _validate_accessibility(buildings: Sequence[Building], paths: Sequence[WorldPath],
+                            spawn_points: Optional[Sequence[SpawnPoint]] = None) -> Dict[str, Any]:
+    """
+    Check that every building is connected to the rest through the path network.
+    
+    Path endpoints snap to the nearest building or spawn point within SNAP_RADIUS;
+    endpoints that snap to nothing become junctions shared by paths ending there.
+    Spawn points no path ends at join the road at its nearest vertex. Components
+    are found with union-find, so the check is near-linear in the number of
+    buildings and paths. The component holding the most buildings is the main
+    one; buildings outside it are reported with their component ids.
+    """
+    spawn_points = spawn_points or []
+    building_count = len(buildings)
+    
+    # Nodes: buildings first, then spawn points, then junctions as they are found
+    anchors = SpatialIndex()
+    for i, b in enumerate(buildings):
+        anchors.insert(i, b.position)
+    for i, spawn in enumerate(spawn_points):
+        anchors.insert(building_count + i, spawn.position)
+    junctions: Dict[Tuple[float, float], int] = {}
+    node_count = building_count + len(spawn_points)
+    
+    def snap(position: WorldPosition) -> int:
+        nonlocal node_count
+        node = anchors.nearest(position, max_radius=SNAP_RADIUS)
+        if node is None:
+            key = (round(position.x * 2) / 2, round(position.y * 2) / 2)
+            if key not in junctions:
+                junctions[key] = node_count
+                node_count += 1
+            node = junctions[key]
+        return node
+    
+    edges = [(snap(p.start), snap(p.end)) for p in paths]
+    components = DisjointSet(node_count)
+    for a, b in edges:
+        components.union(a, b)
+    
+    # Players walk from a spawn onto the closest road, so spawns off the network join it there
+    ended_at = {node for edge in edges for node in edge}
+    loose_spawns = [i for i in range(len(spawn_points)) if building_count + i not in ended_at]
+    if loose_spawns and edges:
+        vertices = np.concatenate([p.points[:, :2] for p in paths])
+        vertex_nodes = np.repeat([a for a, _ in edges], [len(p.points) for p in paths])
+        for i in loose_spawns:
+            position = spawn_points[i].position
+            nearest = np.argmin((vertices[:, 0] - position.x) ** 2 + (vertices[:, 1] - position.y) ** 2)
+            components.union(building_count + i, int(vertex_nodes[nearest]))
+    
+    # Number components densely, largest building count first
+    roots = [components.find(i) for i in range(building_count)]
+    by_size: Dict[int, int] = {}
+    for root in roots:
+        by_size[root] = by_size.get(root, 0) + 1
+    component_ids = {root: rank for rank, root in enumerate(sorted(by_size, key=lambda r: (-by_size[r], r)))}
+    
+    unreachable = [
+        {"id": b.id, "component": component_ids[root]}
+        for b, root in zip(buildings, roots) if component_ids[root] != 0
+    ]
+    return {
+        "accessible": not unreachable,
+        "components": len(component_ids),
+        "unreachable": unreachable,
+        "spawn_components": [
+            component_ids.get(components.find(building_count + i)) for i in range(len(spawn_points))
+        ]
+    }
+
+def _validate_walkable_reachability(world_spec: WorldSpec) -> List[str]:
+    """
+    Ids of buildings that cannot be reached on foot from the spawn points.
+    
+    The terrain is reduced to a coarse walkable grid (a block is walkable if most of
+    its tiles are), then one vectorized flood fill grows from the spawn blocks.
+    """
+    terrain = open_terrain(world_spec)
+    if not terrain or not world_spec.buildings:
+        return []
+    
+    block = max(1, math.ceil(max(terrain.width, terrain.height) / WALKABLE_GRID_SIZE))
+    walkable = _coarse_walkable(terrain, block)
+    rows, cols = walkable.shape
+    to_block = lambda p: (min(max(int(p.y // block), 0), rows - 1), min(max(int(p.x // block), 0), cols - 1))
+    
+    # Start from spawn points, or from the first building if there are none
+    sources = [to_block(s.position) for s in world_spec.spawn_points] or [to_block(world_spec.buildings[0].position)]
+    reached = np.zeros_like(walkable)
+    for row, col in sources:
+        reached[row, col] = True
+    
+    frontier = reached.copy()
+    while frontier.any():
+        grown = frontier.copy()
+        grown[1:, :] |= frontier[:-1, :]
+        grown[:-1, :] |= frontier[1:, :]
+        grown[:, 1:] |= frontier[:, :-1]
+        grown[:, :-1] |= frontier[:, 1:]
+        frontier = grown & walkable & ~reached
+        reached |= frontier
+    
+    # Buildings sit on their own block, so count them reached if a neighboring block is
+    padded = np.pad(reached, 1)
+    near = padded[1:-1, 1:-1] | padded[:-2, 1:-1] | padded[2:, 1:-1] | padded[1:-1, :-2] | padded[1:-1, 2:]
+    return [b.id for b in world_spec.buildings if not near[to_block(b.position)]]
+
+def _coarse_walkable(terrain, block: int) -> np.ndarray:
+    """Walkable mask at block resolution, read window by window"""
+    rows, cols = math.ceil(terrain.height / block), math.ceil(terrain.width / block)
+    walkable = np.zeros((rows, cols), dtype=bool)
+    blocking = np.array([terrain_code(name) for name in BLOCKING_TERRAIN], dtype=np.uint8)
+    step = block * max(1, 512 // block)
+    
+    for y0 in range(0, terrain.height, step):
+        for x0 in range(0, terrain.width, step):
+            codes = np.asarray(terrain.read_window(x0, y0, min(x0 + step, terrain.width), min(y0 + step, terrain.height)))
+            open_tiles = ~np.isin(codes, blocking)
+            
+            # Pad partial edge blocks with blocked tiles before averaging
+            height, width = open_tiles.shape
+            padded = np.zeros((math.ceil(height / block) * block, math.ceil(width / block) * block), dtype=np.float32)
+            padded[:height, :width] = open_tiles
+            share = padded.reshape(padded.shape[0] // block, block, padded.shape[1] // block, block).mean(axis=(1, 3))
+            walkable[y0 // block:y0 // block + share.shape[0], x0 // block:x0 // block + share.shape[1]] = share > 0.5
+    
+    return walkable
@@ -0,0 +1,101 @@
+"""
+Layout quality scoring for comparing candidate world designs.
+"""
+
+import math
+from typing import Dict, Sequence
+
+import numpy as np
+
+from ..core.data_types import BLOCKING_TERRAIN, terrain_code
+from ..core.terrain_store import open_terrain
+from ..core.world_objects import WorldPath
+from ..core.world_spec import WorldSpec
+from ..generation.poisson_disk import _footprint_exclusion
+
+# Roads serve the area within this many tiles of them
+ROAD_SERVICE_RADIUS = 6.0
+
+# Nearest-neighbor distance at which buildings stop counting as crowded
+TARGET_BUILDING_SPACING = 6.0
+
+# Tiles around the buildings' extent that count as the settlement
+SETTLEMENT_PADDING = 4
+
+# Rows of the pairwise distance matrix computed at once
+_DISTANCE_CHUNK = 1024
+
+# Weight of each metric in the overall score
+LAYOUT_SCORE_WEIGHTS = {
+    "path_coverage": 0.3,
+    "building_spacing": 0.3,
+    "walkable_ratio": 0.2,
+    "spawn_to_hub": 0.2
+}
+
+def _score_layout(world_spec: WorldSpec) -> Dict[str, float]:
+    """
+    Score a world layout on [0, 1] metrics and their weighted total.
+    
+    - path_coverage: share of the settlement area within ROAD_SERVICE_RADIUS of a road
+    - building_spacing: mean nearest-neighbor distance relative to TARGET_BUILDING_SPACING
+    - walkable_ratio: share of settlement tiles that are not water or mountain
+    - spawn_to_hub: closeness of the first spawn point to the nearest important building
+    """
+    buildings = world_spec.buildings
+    if not buildings:
+        return {**{name: 0.0 for name in LAYOUT_SCORE_WEIGHTS}, "total": 0.0}
+    
+    positions = buildings.positions[:, :2].astype(np.float64)
+    width, height = world_spec.size
+    x0, y0 = np.floor(positions.min(axis=0) - SETTLEMENT_PADDING).clip(0).astype(int)
+    x1 = int(min(math.ceil(positions[:, 0].max() + SETTLEMENT_PADDING), width))
+    y1 = int(min(math.ceil(positions[:, 1].max() + SETTLEMENT_PADDING), height))
+    settlement = (int(x0), int(y0), max(x1, int(x0) + 1), max(y1, int(y0) + 1))
+    
+    scores = {
+        "path_coverage": _path_coverage(world_spec.paths, settlement),
+        "building_spacing": _building_spacing(positions),
+        "walkable_ratio": _walkable_ratio(world_spec, settlement),
+        "spawn_to_hub": _spawn_to_hub(world_spec, positions)
+    }
+    scores["total"] = sum(LAYOUT_SCORE_WEIGHTS[name] * value for name, value in scores.items())
+    return {name: round(float(value), 4) for name, value in scores.items()}
+
+def _path_coverage(paths: Sequence[WorldPath], settlement) -> float:
+    """Share of settlement tiles within service range of a road, from one rasterized mask"""
+    if not paths:
+        return 0.0
+    x0, y0, x1, y1 = settlement
+    near_road = _footprint_exclusion([], paths, settlement, path_clearance=ROAD_SERVICE_RADIUS)
+    xs, ys = np.meshgrid(np.arange(x0, x1) + 0.5, np.arange(y0, y1) + 0.5)
+    return float(near_road(xs.ravel(), ys.ravel()).mean())
+
+def _building_spacing(positions: np.ndarray) -> float:
+    """Mean of min(nearest-neighbor distance, target) / target over all buildings"""
+    if len(positions) < 2:
+        return 1.0
+    nearest = np.empty(len(positions))
+    for start in range(0, len(positions), _DISTANCE_CHUNK):
+        block = positions[start:start + _DISTANCE_CHUNK]
+        d2 = ((block[:, None, :] - positions[None, :, :]) ** 2).sum(axis=2)
+        d2[np.arange(len(block)), np.arange(start, start + len(block))] = np.inf
+        nearest[start:start + len(block)] = np.sqrt(d2.min(axis=1))
+    return float(np.minimum(nearest / TARGET_BUILDING_SPACING, 1.0).mean())
+
+def _walkable_ratio(world_spec: WorldSpec, settlement) -> float:
+    terrain = open_terrain(world_spec)
+    if not terrain:
+        return 1.0
+    codes = np.asarray(terrain.read_window(*settlement))
+    return float(1.0 - np.isin(codes, [terrain_code(name) for name in BLOCKING_TERRAIN]).mean())
+
+def _spawn_to_hub(world_spec: WorldSpec, positions: np.ndarray) -> float:
+    """1 at the hub, falling linearly to 0 at half the map diagonal"""
+    if not world_spec.spawn_points:
+        return 0.0
+    important = np.array([b.properties.get("importance") == "high" for b in world_spec.buildings])
+    hubs = positions[important] if important.any() else positions
+    spawn = world_spec.spawn_points[0].position
+    distance = np.hypot(hubs[:, 0] - spawn.x, hubs[:, 1] - spawn.y).min()
+    return float(np.clip(1.0 - distance / (0.5 * math.hypot(*world_spec.size)), 0.0, 1.0))
@@ -3,11 +3,13 @@ Visualization data creation and color schemes.
 """
 
 from .viz_data_creator import _create_visualization_data, _calculate_complexity
+from .layout_renderer import _render_layout
 from .color_schemes import _get_building_color, _get_feature_color, _get_terrain_color_map
 
 __all__ = [
     "_create_visualization_data",
     "_calculate_complexity", 
+    "_render_layout",
     "_get_building_color",
     "_get_feature_color",
     "_get_terrain_color_map"
@@ -41,7 +41,8 @@ def _get_terrain_color_map(theme: str) -> Dict[str, str]:
         "stone": "#696969",
         "water": "#4682B4",
         "sand": "#F4A460",
-        "forest": "#006400"
+        "forest": "#006400",
+        "mountain": "#A9A9A9"
     }
     
     # Theme modifications
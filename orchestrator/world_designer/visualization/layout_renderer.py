@@ -0,0 +1,206 @@
+"""
+Raster rendering of world layouts: an overview PNG and a zoomable tile pyramid.
+"""
+
+import math
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+from ..core.data_types import TERRAIN_NAMES
+from ..core.terrain_store import open_terrain
+from ..core.world_spec import WorldSpec
+from ..generation.poisson_disk import _stamp_segment
+from .color_schemes import _get_building_color, _get_feature_color, _get_terrain_color_map
+
+# Longest side of the overview image, and the pixels per tile small maps are drawn at
+OVERVIEW_MAX_SIZE = 2048
+OVERVIEW_MAX_PIXELS_PER_TILE = 8
+
+# Maps larger than this (in overview pixels at one pixel per tile) also get a tile pyramid
+PYRAMID_MIN_SIZE = 1024
+PYRAMID_TILE_SIZE = 256
+
+# zlib level for PNG output; tiles are numerous, so favor encoding speed over size
+PNG_COMPRESS_LEVEL = 1
+
+# Marker side lengths in tiles; buildings use their footprint when one is recorded
+BUILDING_MARKER_SIZE = 3.0
+FEATURE_MARKER_SIZE = 0.6
+SPAWN_MARKER_SIZE = 1.5
+
+BACKGROUND_COLOR = (32, 32, 32)
+OUTLINE_COLOR = (24, 24, 24)
+SPAWN_COLOR = (0, 255, 0)
+PATH_COLORS = {"dirt": "#8B4513"}
+DEFAULT_PATH_COLOR = "#696969"
+
+Region = Tuple[float, float, float, float]
+
+def _hex_to_rgb(color: str) -> Tuple[int, int, int]:
+    color = color.lstrip("#")
+    return int(color[0:2], 16), int(color[2:4], 16), int(color[4:6], 16)
+
+def _render_layout(world_spec: WorldSpec, output_dir: str) -> Optional[Dict]:
+    """
+    Render the world to output_dir/layout.png, plus a tile pyramid for large maps.
+    
+    Returns image metadata for the visualization data, or None if Pillow is unavailable.
+    """
+    if not PIL_AVAILABLE:
+        return None
+    
+    output = Path(output_dir)
+    output.mkdir(parents=True, exist_ok=True)
+    layers = _layout_layers(world_spec)
+    terrain = open_terrain(world_spec)
+    width, height = world_spec.size
+    
+    pixels_per_tile = min(OVERVIEW_MAX_PIXELS_PER_TILE, OVERVIEW_MAX_SIZE / max(width, height))
+    image_size = (max(int(round(width * pixels_per_tile)), 1), max(int(round(height * pixels_per_tile)), 1))
+    image = _render_region(layers, terrain, (0, 0, width, height), image_size)
+    Image.fromarray(image).save(output / "layout.png", compress_level=PNG_COMPRESS_LEVEL)
+    print(f"🖼️ Rendered {image_size[0]}x{image_size[1]} layout image")
+    
+    result = {"image_path": "layout.png", "image_width": image_size[0], "image_height": image_size[1]}
+    if max(width, height) > PYRAMID_MIN_SIZE:
+        result["tiles"] = _render_tile_pyramid(layers, terrain, world_spec.size, output / "tiles")
+    return result
+
+def _render_tile_pyramid(layers: Dict, terrain, size: Tuple[int, int], tiles_dir: Path) -> Dict:
+    """
+    Render a slippy-map style pyramid tiles/{z}/{x}/{y}.png.
+    
+    The deepest zoom draws one pixel per world tile; each zoom out halves the
+    resolution until the whole map fits in a single tile. Every tile is rendered
+    straight from the terrain window it covers, so memory stays bounded by one tile.
+    """
+    width, height = size
+    max_zoom = max(0, math.ceil(math.log2(max(width, height) / PYRAMID_TILE_SIZE)))
+    tile_count = 0
+    
+    for zoom in range(max_zoom + 1):
+        span = PYRAMID_TILE_SIZE * 2 ** (max_zoom - zoom)  # world tiles covered by one image tile
+        for tx in range(math.ceil(width / span)):
+            column_dir = tiles_dir / str(zoom) / str(tx)
+            column_dir.mkdir(parents=True, exist_ok=True)
+            for ty in range(math.ceil(height / span)):
+                region = (tx * span, ty * span, (tx + 1) * span, (ty + 1) * span)
+                image = _render_region(layers, terrain, region, (PYRAMID_TILE_SIZE, PYRAMID_TILE_SIZE))
+                Image.fromarray(image).save(column_dir / f"{ty}.png", compress_level=PNG_COMPRESS_LEVEL)
+                tile_count += 1
+    
+    print(f"🗺️ Rendered tile pyramid: zoom 0-{max_zoom}, {tile_count} tiles")
+    return {
+        "path_template": "tiles/{z}/{x}/{y}.png",
+        "tile_size": PYRAMID_TILE_SIZE,
+        "min_zoom": 0,
+        "max_zoom": max_zoom,
+        "world_tiles_per_pixel_at_max_zoom": 1
+    }
+
+def _layout_layers(world_spec: WorldSpec) -> Dict:
+    """Flatten buildings, paths, features and spawn points into arrays for drawing"""
+    buildings = world_spec.buildings
+    sizes = np.array([b.properties.get("footprint") or [BUILDING_MARKER_SIZE * b.scale] * 2 for b in buildings],
+                     dtype=np.float64).reshape(-1, 2)
+    centers = buildings.positions[:, :2].astype(np.float64)
+    rects = np.hstack([centers - sizes / 2, centers + sizes / 2])
+    
+    segments, segment_colors = [], []
+    for p in world_spec.paths:
+        color = _hex_to_rgb(PATH_COLORS.get(p.surface_type, DEFAULT_PATH_COLOR))
+        points = p.points[:, :2]
+        ends = np.hstack([points[:-1], points[1:], np.full((len(points) - 1, 1), p.width / 2)])
+        segments.append(ends)
+        segment_colors.extend([color] * len(ends))
+    
+    features = world_spec.natural_features
+    return {
+        "building_rects": rects,
+        "building_colors": np.array([_hex_to_rgb(_get_building_color(b.type)) for b in buildings],
+                                    dtype=np.uint8).reshape(-1, 3),
+        "segments": np.vstack(segments) if segments else np.zeros((0, 5)),
+        "segment_colors": np.array(segment_colors, dtype=np.uint8).reshape(-1, 3),
+        "feature_xy": features.positions[:, :2].astype(np.float64),
+        "feature_colors": np.array([_hex_to_rgb(_get_feature_color(f.type)) for f in features],
+                                   dtype=np.uint8).reshape(-1, 3),
+        "spawn_xy": world_spec.spawn_points.positions[:, :2].astype(np.float64),
+        "terrain_lut": np.array([_hex_to_rgb(_get_terrain_color_map(world_spec.theme).get(name, "#000000"))
+                                 for name in TERRAIN_NAMES], dtype=np.uint8)
+    }
+
+def _render_region(layers: Dict, terrain, region: Region, image_size: Tuple[int, int]) -> np.ndarray:
+    """Draw the world rectangle region into an (height, width, 3) uint8 image"""
+    x0, y0, x1, y1 = region
+    image_width, image_height = image_size
+    scale_x, scale_y = image_width / (x1 - x0), image_height / (y1 - y0)
+    image = np.empty((image_height, image_width, 3), dtype=np.uint8)
+    image[:] = BACKGROUND_COLOR
+    
+    # Terrain: nearest tile under each pixel center, colored through a lookup table
+    if terrain:
+        cols = np.floor(x0 + (np.arange(image_width) + 0.5) / scale_x).astype(np.int64)
+        rows = np.floor(y0 + (np.arange(image_height) + 0.5) / scale_y).astype(np.int64)
+        inside_cols = np.flatnonzero((cols >= 0) & (cols < terrain.width))
+        inside_rows = np.flatnonzero((rows >= 0) & (rows < terrain.height))
+        if inside_cols.size and inside_rows.size:
+            c0, c1 = cols[inside_cols[0]], cols[inside_cols[-1]] + 1
+            r0, r1 = rows[inside_rows[0]], rows[inside_rows[-1]] + 1
+            window = np.asarray(terrain.read_window(int(c0), int(r0), int(c1), int(r1)))
+            codes = window[np.ix_(rows[inside_rows] - r0, cols[inside_cols] - c0)]
+            image[inside_rows[0]:inside_rows[-1] + 1, inside_cols[0]:inside_cols[-1] + 1] = layers["terrain_lut"][codes]
+    
+    resolution = 1.0 / scale_x
+    
+    # Paths: each visible segment is stamped into a mask of its color
+    segments = layers["segments"]
+    if len(segments):
+        reach = segments[:, 4]
+        visible = ((np.minimum(segments[:, 0], segments[:, 2]) - reach < x1) &
+                   (np.maximum(segments[:, 0], segments[:, 2]) + reach > x0) &
+                   (np.minimum(segments[:, 1], segments[:, 3]) - reach < y1) &
+                   (np.maximum(segments[:, 1], segments[:, 3]) + reach > y0))
+        for color in np.unique(layers["segment_colors"][visible], axis=0):
+            mask = np.zeros((image_height, image_width), dtype=bool)
+            same_color = visible & (layers["segment_colors"] == color).all(axis=1)
+            for sx, sy, ex, ey, half_width in segments[same_color].tolist():
+                _stamp_segment(mask, region, resolution, (sx, sy), (ex, ey), max(half_width, 0.75 * resolution))
+            image[mask] = color
+    
+    # Buildings: filled rectangles of at least one pixel, outlined once large enough
+    rects = layers["building_rects"]
+    visible = np.flatnonzero((rects[:, 0] < x1) & (rects[:, 2] > x0) & (rects[:, 1] < y1) & (rects[:, 3] > y0))
+    if visible.size:
+        left = np.clip(np.floor((rects[visible, 0] - x0) * scale_x), 0, image_width - 1).astype(np.int64)
+        top = np.clip(np.floor((rects[visible, 1] - y0) * scale_y), 0, image_height - 1).astype(np.int64)
+        right = np.clip(np.ceil((rects[visible, 2] - x0) * scale_x), left + 1, image_width).astype(np.int64)
+        bottom = np.clip(np.ceil((rects[visible, 3] - y0) * scale_y), top + 1, image_height).astype(np.int64)
+        colors = layers["building_colors"][visible]
+        for l, t, r, b, color in zip(left.tolist(), top.tolist(), right.tolist(), bottom.tolist(), colors):
+            if r - l >= 3 and b - t >= 3:
+                image[t:b, l:r] = OUTLINE_COLOR
+                image[t + 1:b - 1, l + 1:r - 1] = color
+            else:
+                image[t:b, l:r] = color
+    
+    # Features and spawn points: small squares, each pixel offset scattered in one assignment
+    spawn_colors = np.tile(np.array(SPAWN_COLOR, dtype=np.uint8), (len(layers["spawn_xy"]), 1))
+    for xy, colors, marker_size in ((layers["feature_xy"], layers["feature_colors"], FEATURE_MARKER_SIZE),
+                                    (layers["spawn_xy"], spawn_colors, SPAWN_MARKER_SIZE)):
+        side = max(1, int(round(marker_size * scale_x)))
+        px = np.floor((xy[:, 0] - x0) * scale_x).astype(np.int64) - side // 2
+        py = np.floor((xy[:, 1] - y0) * scale_y).astype(np.int64) - side // 2
+        for dy in range(side):
+            for dx in range(side):
+                inside = (px + dx >= 0) & (px + dx < image_width) & (py + dy >= 0) & (py + dy < image_height)
+                image[py[inside] + dy, px[inside] + dx] = colors[inside]
+    
+    return image
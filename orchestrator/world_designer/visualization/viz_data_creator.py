@@ -2,58 +2,77 @@
 Visualization data creation and formatting.
 """
 
-from typing import Dict, List
+from typing import Dict, Optional, Sequence
+from ..core.world_objects import Building, WorldPath
 from ..core.world_spec import WorldSpec
+from ..core.terrain_store import open_terrain
 from ..visualization.color_schemes import _get_building_color, _get_feature_color, _get_terrain_color_map
+from ..visualization.layout_renderer import _render_layout
 
-def _create_visualization_data(world_spec: WorldSpec) -> Dict:
-    """Create visualization metadata for the world"""
+def _create_visualization_data(world_spec: WorldSpec, output_dir: Optional[str] = None) -> Dict:
+    """
+    Create visualization metadata for the world.
+    
+    With an output_dir the layout is rendered to a PNG there (plus a tile pyramid
+    for large maps). When tiles exist, natural features are only drawn in the
+    tiles instead of being shipped as individual markers.
+    """
+    
+    layout = {
+        "image_path": f"layouts/{world_spec.theme}_{len(world_spec.buildings)}_buildings.png",
+        "width": world_spec.size[0],
+        "height": world_spec.size[1],
+        "rendered": False
+    }
+    if output_dir:
+        rendered = _render_layout(world_spec, output_dir)
+        if rendered:
+            layout.update(rendered, rendered=True)
+    features_in_tiles = "tiles" in layout
     
     return {
-        "2d_layout": {
-            "image_path": f"layouts/{world_spec.theme}_{len(world_spec.buildings)}_buildings.png",
-            "width": world_spec.size[0],
-            "height": world_spec.size[1]
-        },
+        "2d_layout": layout,
         "building_markers": [
             {
-                "id": b["id"],
-                "x": b["position"]["x"],
-                "y": b["position"]["y"],
-                "type": b["type"],
-                "importance": b["properties"].get("importance", "normal"),
-                "color": _get_building_color(b["type"]),
-                "size": b["scale"]
+                "id": b.id,
+                "x": b.position.x,
+                "y": b.position.y,
+                "type": b.type,
+                "importance": b.properties.get("importance", "normal"),
+                "color": _get_building_color(b.type),
+                "size": b.scale
             }
             for b in world_spec.buildings
         ],
         "path_lines": [
             {
-                "id": p["id"],
-                "start": [p["start"]["x"], p["start"]["y"]],
-                "end": [p["end"]["x"], p["end"]["y"]],
-                "width": p["width"],
-                "color": "#8B4513" if p["surface_type"] == "dirt" else "#696969",
-                "type": p["properties"]["type"]
+                "id": p.id,
+                "start": [p.start.x, p.start.y],
+                "end": [p.end.x, p.end.y],
+                "points": p.points[:, :2].tolist(),
+                "width": p.width,
+                "color": "#8B4513" if p.surface_type == "dirt" else "#696969",
+                "type": p.properties["type"]
             }
             for p in world_spec.paths
         ],
         "natural_features": [
             {
-                "id": f["id"],
-                "x": f["position"]["x"],
-                "y": f["position"]["y"],
-                "type": f["type"],
-                "color": _get_feature_color(f["type"]),
-                "interactive": f["properties"].get("interactive", False)
+                "id": f.id,
+                "x": f.position.x,
+                "y": f.position.y,
+                "type": f.type,
+                "color": _get_feature_color(f.type),
+                "interactive": f.properties.get("interactive", False)
             }
-            for f in world_spec.natural_features
+            for f in ([] if features_in_tiles else world_spec.natural_features)
         ],
+        "natural_feature_count": len(world_spec.natural_features),
         "spawn_points": [
             {
-                "x": sp["x"],
-                "y": sp["y"],
-                "type": sp["type"],
+                "x": sp.position.x,
+                "y": sp.position.y,
+                "type": sp.type,
                 "color": "#00FF00"
             }
             for sp in world_spec.spawn_points
@@ -64,21 +83,22 @@ def _create_visualization_data(world_spec: WorldSpec) -> Dict:
 
 def _create_visualization_legend(world_spec: WorldSpec) -> Dict:
     """Create legend for visualization"""
+    terrain = open_terrain(world_spec)
     return {
-        "buildings": list(set(b["type"] for b in world_spec.buildings)),
-        "features": list(set(f["type"] for f in world_spec.natural_features)),
-        "terrain": list(set(t for row in world_spec.terrain_map for t in row)),
+        "buildings": list(set(b.type for b in world_spec.buildings)),
+        "features": list(set(f.type for f in world_spec.natural_features)),
+        "terrain": terrain.terrain_types() if terrain is not None else [],
         "theme": world_spec.theme,
         "scale": "1 unit = 1 meter"
     }
 
-def _calculate_complexity(buildings: List[Dict], paths: List[Dict]) -> float:
+def _calculate_complexity(buildings: Sequence[Building], paths: Sequence[WorldPath]) -> float:
     """Calculate design complexity score"""
     building_score = len(buildings) * 1.0
     path_score = len(paths) * 0.5
     
     # Bonus for variety
-    building_types = len(set(b["type"] for b in buildings))
+    building_types = len(set(b.type for b in buildings))
     variety_bonus = building_types * 0.3
     
     return building_score + path_score + variety_bonus
\ No newline at end of file
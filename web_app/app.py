@@ -285,11 +285,20 @@ def load_generation_details(session_dir: Path, job: GenerationJob):
     try:
         print(f"📋 Loading generation details from: {session_dir}")
         
-        # Load world specification
-        world_file = session_dir / "world_spec.json"
+        # Load world specification: header and buildings only, terrain and features stay on disk
+        world_file = session_dir / "world_specification.wspec"
+        json_world_file = session_dir / "world_specification.json"
         if world_file.exists():
-            with open(world_file, 'r') as f:
-                job.generation_details['world'] = json.load(f)
+            from orchestrator.world_designer.core.world_store import load_world_spec
+            world = load_world_spec(world_file)
+            job.generation_details['world'] = {**world.summary(), 'buildings': list(world.buildings)}
+            print(f"✅ Loaded world spec: {len(world.buildings)} buildings")
+        elif json_world_file.exists():
+            with open(json_world_file, 'r') as f:
+                world = json.load(f)
+            # Same counts the .wspec summary carries, so the UI reads one field either way
+            world['counts'] = {name: len(world.get(name, [])) for name in ('buildings', 'paths', 'natural_features')}
+            job.generation_details['world'] = world
             print(f"✅ Loaded world spec: {len(job.generation_details['world'].get('buildings', []))} buildings")
         
         # Load assets information